@@ -0,0 +1,84 @@
+"""
+Microbenchmark: decoding of IFD field values.
+
+Compares the legacy per-element path (format string built for each integer)
+with the precompiled whole-array decoders from jparse.decoder.
+The legacy decoder is the reference of tests/test_decoder.py.
+
+    python -m benchmarks.decode_values
+"""
+import struct
+import timeit
+from fractions import Fraction
+
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+from jparse.IfdField import parse_value
+
+
+def legacy_convert(data: bytes, byte_order: ByteOrder, data_type: chr):
+    byte_order = '<' if byte_order == ByteOrder.LITTLE_ENDIAN else '>'
+    return struct.unpack(f'{byte_order}{data_type}', data)[0]
+
+
+def legacy_unpack_value(data: bytes, field_type: FieldType, byte_order: ByteOrder):
+    if field_type.is_rational:
+        numerator = legacy_convert(data[:4], byte_order=byte_order, data_type=field_type.type_chr)
+        denominator = legacy_convert(data[4:], byte_order=byte_order, data_type=field_type.type_chr)
+        return Fraction(numerator=numerator, denominator=denominator)
+
+    value = legacy_convert(data, byte_order=byte_order, data_type=field_type.type_chr)
+
+    if field_type == FieldType.ASCII:
+        value = value.decode('ascii') if value[0] != 0 else ''
+
+    return value
+
+
+def legacy_parse_value(data: bytes, count: int, field_type: FieldType, byte_order: ByteOrder):
+    value = []
+    for i in range(count):
+        value_data = data[field_type.byte_count*i : field_type.byte_count*(i+1)]
+        value.append(legacy_unpack_value(value_data, field_type=field_type, byte_order=byte_order))
+
+    if field_type == FieldType.ASCII:
+        return ''.join(value)
+
+    if len(value) == 1:
+        return value[0]
+
+    return tuple(value)
+
+
+def make_data(field_type: FieldType, count: int, byte_order: ByteOrder) -> bytes:
+    if field_type.is_rational:
+        items = [i + 1 for i in range(2*count)]
+        return struct.pack(f'{byte_order.value}{2*count}{field_type.type_chr}', *items)
+
+    return struct.pack(f'{byte_order.value}{count}{field_type.type_chr}', *range(count))
+
+
+def bench(function, repeat: int=5, number: int=200) -> float:
+    """
+    Best time of one call in microseconds.
+    """
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    byte_order = ByteOrder.LITTLE_ENDIAN
+
+    print(f'{"type":<10s} {"count":>6s} {"legacy, us":>12s} {"new, us":>10s} {"speedup":>8s}')
+    for field_type in (FieldType.Short, FieldType.Long, FieldType.Rational):
+        for count in (1, 16, 256, 4096):
+            data = make_data(field_type, count, byte_order)
+
+            number = max(10, 20000 // count)
+            t_legacy = bench(lambda: legacy_parse_value(data, count, field_type, byte_order), number=number)
+            t_new = bench(lambda: parse_value(data, count, field_type, byte_order), number=number)
+
+            print(f'{field_type.name:<10s} {count:>6d} {t_legacy:>12.2f} {t_new:>10.2f} {t_legacy/t_new:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
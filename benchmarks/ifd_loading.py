@@ -0,0 +1,58 @@
+"""
+Benchmark: lazy (field by field) vs. eager (whole directory at once) IFD loading.
+Unbuffered files show the cost of one read syscall per field (e.g. network file systems).
+
+    python -m benchmarks.ifd_loading
+"""
+import os
+import tempfile
+import timeit
+
+from jparse.endianess import ByteOrder
+from jparse.TiffHeader import TiffHeader
+from jparse.IFD import IFD
+
+from benchmarks import synthetic
+
+
+def load_fields(stream, eager: bool) -> int:
+    tiff_header = TiffHeader.parse(stream, offset=0)
+    ifd = IFD.parse(stream, tiff_header=tiff_header, index=0, offset=tiff_header.ifd0_offset, eager=eager)
+
+    count = 0
+    for _ in ifd:
+        count += 1
+
+    return count
+
+
+def bench(function, repeat: int=5, number: int=20) -> float:
+    """
+    Best time of one call in microseconds.
+    """
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    print(f'{"file":<10s} {"fields":>6s} {"lazy, us":>10s} {"eager, us":>10s} {"speedup":>8s}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for buffering in (-1, 0):
+            for field_count in (10, 100, 1000):
+                path = os.path.join(directory, f'ifd_{field_count}.tif')
+                with open(path, 'wb') as f:
+                    f.write(synthetic.encode_tiff([synthetic.numeric_entries(field_count)], ByteOrder.LITTLE_ENDIAN))
+
+                with open(path, 'rb', buffering=buffering) as f:
+                    assert load_fields(f, eager=False) == load_fields(f, eager=True) == field_count
+
+                    number = max(5, 10000 // field_count)
+                    t_lazy = bench(lambda: load_fields(f, eager=False), number=number)
+                    t_eager = bench(lambda: load_fields(f, eager=True), number=number)
+
+                file_type = 'buffered' if buffering else 'unbuffered'
+                print(f'{file_type:<10s} {field_count:>6d} {t_lazy:>10.1f} {t_eager:>10.1f} {t_lazy/t_eager:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: memory held by parsed metadata kept alive, e.g. an in-memory catalog of many images.
+Measured with tracemalloc for IFD (cached IfdField objects) and ColumnarIFD (array columns).
+
+    python -m benchmarks.memory
+"""
+import tracemalloc
+
+from jparse.endianess import ByteOrder
+from jparse.BufferStream import BufferStream
+from jparse.JpegMetaParser import JpegMetaParser
+
+from benchmarks import synthetic
+
+
+def parse_catalog(data: bytes, image_count: int, load_values: bool, columnar: bool) -> list:
+    """
+    Parse the same image `image_count` times and load all field headers (and values).
+    """
+    catalog = []
+
+    for _ in range(image_count):
+        parser = JpegMetaParser(BufferStream(data), columnar=columnar)
+        for segment in parser:
+            for ifd in segment:
+                ifd.load_all()
+                if load_values:
+                    for field in ifd:
+                        field.value
+        catalog.append(parser)
+
+    return catalog
+
+
+def measure(data: bytes, image_count: int, load_values: bool=False, columnar: bool=False) -> int:
+    """
+    Bytes allocated by the parsed catalog.
+    """
+    tracemalloc.start()
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        catalog = parse_catalog(data, image_count, load_values=load_values, columnar=columnar)
+        size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename'))
+    finally:
+        tracemalloc.stop()
+
+    assert len(catalog) == image_count
+    return size
+
+
+def main():
+    print('bytes per field')
+    print(f'{"fields":>6s} {"images":>6s} {"IFD + values":>13s} {"IFD":>8s} {"ColumnarIFD":>12s}')
+
+    for field_count in (10, 100, 500):
+        image_count = 20000 // field_count
+        tiff = synthetic.encode_tiff([synthetic.numeric_entries(field_count), synthetic.numeric_entries(field_count)],
+                                     ByteOrder.LITTLE_ENDIAN)
+        data = synthetic.encode_jpeg(tiff)
+
+        total_fields = image_count*2*field_count
+        with_values = measure(data, image_count, load_values=True) / total_fields
+        headers = measure(data, image_count) / total_fields
+        columnar = measure(data, image_count, columnar=True) / total_fields
+
+        print(f'{2*field_count:>6d} {image_count:>6d} {with_values:>13.1f} {headers:>8.1f} {columnar:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
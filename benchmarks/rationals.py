@@ -0,0 +1,75 @@
+"""
+Benchmark: decoding of Rational-heavy IFDs with each rational_mode.
+'decode' decodes the values of all fields, 'float' also converts every element to float (e.g. for display or JSON).
+
+    python -m benchmarks.rationals
+"""
+import timeit
+
+from jparse.endianess import ByteOrder
+from jparse.TiffHeader import TiffHeader
+from jparse.IFD import IFD
+from jparse.IfdField import parse_value
+from jparse.BufferStream import BufferStream
+from jparse.decoder import RATIONAL_MODES
+
+from benchmarks import synthetic
+
+
+def read_fields(tiff: bytes) -> list:
+    """
+    (data, count, field_type, byte_order) of all fields: only the value decoding is measured.
+    """
+    stream = BufferStream(tiff)
+    tiff_header = TiffHeader.parse(stream, offset=0)
+    ifd = IFD.parse(stream, tiff_header=tiff_header, index=0, offset=tiff_header.ifd0_offset, eager=True)
+
+    return [ (field.raw_value, field.count, field.field_type, tiff_header.byte_order) for field in ifd ]
+
+
+def decode_values(fields: list, rational_mode: str, to_float: bool) -> int:
+    count = 0
+    for data, field_count, field_type, byte_order in fields:
+        value = parse_value(data, field_count, field_type, byte_order, rational_mode=rational_mode)
+        if field_count == 1:
+            value = (value,)
+
+        if to_float:
+            if rational_mode == 'tuple':
+                value = [ numerator / denominator for numerator, denominator in value ]
+            else:
+                value = [ float(item) for item in value ]
+
+        count += len(value)
+
+    return count
+
+
+def bench(function, repeat: int=7, number: int=20) -> float:
+    """
+    Best time of one call in microseconds.
+    """
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    print(f'{"fields":>6s} {"elements":>8s} {"mode":<9s} {"decode, us":>11s} {"speedup":>8s} {"float, us":>10s} {"speedup":>8s}')
+
+    for field_count in (100, 1000):
+        fields = read_fields(synthetic.encode_tiff([synthetic.rational_entries(field_count)], ByteOrder.LITTLE_ENDIAN))
+        element_count = decode_values(fields, 'tuple', to_float=False)
+        number = max(5, 5000 // field_count)
+
+        baseline = None
+        for rational_mode in RATIONAL_MODES:
+            t_decode = bench(lambda: decode_values(fields, rational_mode, to_float=False), number=number)
+            t_float = bench(lambda: decode_values(fields, rational_mode, to_float=True), number=number)
+            if baseline is None:
+                baseline = t_decode, t_float
+
+            print(f'{field_count:>6d} {element_count:>8d} {rational_mode:<9s} {t_decode:>11.1f} {baseline[0]/t_decode:>7.1f}x '
+                  f'{t_float:>10.1f} {baseline[1]/t_float:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Scaling benchmark: files/s of batch.scan_paths() with 1, 2, 4, 8 and 16 workers on a synthetic corpus.
+
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --files 5000 --workers 1,4,16 --pools thread,process --output scaling.json
+
+The thread pool scales with the cores only on free-threaded (no-GIL) builds of CPython (e.g. python3.13t),
+with the GIL it shows the overhead of the pool. The corpus is written to a temporary directory:
+the files are read from the page cache of the OS after the first pass.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import sysconfig
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from jparse.info import __version__
+from jparse.endianess import ByteOrder
+from jparse.TagPath import TagPath
+from jparse.batch import POOLS, DEFAULT_CHUNK_SIZE, scan_paths
+
+from benchmarks import synthetic
+
+
+DEFAULT_WORKERS = (1, 2, 4, 8, 16)
+
+TAGS = (TagPath('APP1', 0, 0x010F), TagPath('APP1', 0, 0x0110), TagPath('APP1', 0, 0x0132))
+EXIF_FIELDS = ('image_width', 'image_height', 'orientation', 'datetime_original', 'exposure_time')
+
+
+def is_gil_enabled() -> bool:
+    is_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_enabled is None else is_enabled()
+
+
+def write_corpus(directory: str, spec: synthetic.JpegSpec, files: int, seed: int) -> List[str]:
+    paths = []
+    for i, data in enumerate(synthetic.generate_corpus(files, spec, seed=seed)):
+        paths.append(os.path.join(directory, f'{i:06d}.jpg'))
+        with open(paths[-1], 'wb') as f:
+            f.write(data)
+    return paths
+
+
+def time_batch(paths: Sequence[str], pool: str, workers: int, chunk_size: int, repeat: int) -> float:
+    """
+    Best of `repeat` runs, seconds.
+    """
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = scan_paths(paths, tags=TAGS, exif_fields=EXIF_FIELDS, workers=workers, chunk_size=chunk_size, pool=pool)
+        errors = sum(1 for result in results if not result.ok)
+        elapsed = time.perf_counter() - start
+
+        if errors > 0:
+            raise RuntimeError(f'{errors} files are failed')
+
+        best = min(best, elapsed)
+
+    return best
+
+
+def run_scaling(paths: Sequence[str], pools: Sequence[str], workers: Sequence[int], chunk_size: int,
+                repeat: int) -> Dict[str, List[Dict[str, Any]]]:
+    results = {}
+
+    for pool in pools:
+        results[pool] = []
+        single = None
+
+        for count in workers:
+            seconds = time_batch(paths, pool=pool, workers=count, chunk_size=chunk_size, repeat=repeat)
+            files_per_second = len(paths) / seconds
+            single = files_per_second if single is None else single
+
+            results[pool].append({
+                'workers': count,
+                'seconds': seconds,
+                'files_per_second': files_per_second,
+                'speedup': files_per_second / single,
+            })
+            print(f'{pool:<12s} {count:>4d} {files_per_second:>10.1f} {files_per_second/single:>8.2f}x', file=sys.stderr)
+
+    return results
+
+
+def main(argv: Optional[Sequence[str]]=None) -> int:
+    defaults = synthetic.JpegSpec()
+    arguments = argparse.ArgumentParser(prog='python -m benchmarks.scaling', description='jparse batch scaling benchmark')
+    arguments.add_argument('--files', type=int, default=2000, help='corpus size')
+    arguments.add_argument('--workers', type=lambda value: [ int(count) for count in value.split(',') ],
+                           default=list(DEFAULT_WORKERS), help='comma-separated worker counts (default: 1,2,4,8,16)')
+    arguments.add_argument('--pools', type=lambda value: value.split(','), default=['thread'],
+                           help=f'comma-separated pools (default: thread): {",".join(POOLS)}')
+    arguments.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='files per worker task')
+    arguments.add_argument('--repeat', type=int, default=3, help='runs per worker count, the best one is reported')
+    arguments.add_argument('--seed', type=int, default=0)
+    arguments.add_argument('--field-count', type=int, default=defaults.field_count, help='extra fields per IFD')
+    arguments.add_argument('--output', help='write the JSON results to the file instead of stdout')
+    arguments = arguments.parse_args(argv)
+
+    unknown = [ pool for pool in arguments.pools if pool not in POOLS ]
+    if len(unknown) > 0:
+        arguments.error(f'unknown pools: {", ".join(unknown)}')
+
+    # the image data isn't read by the batch workers: a short scan keeps the corpus small
+    spec = synthetic.JpegSpec(byte_order=ByteOrder.LITTLE_ENDIAN, field_count=arguments.field_count, scan_size=1024)
+
+    print(f'{"pool":<12s} {"workers":>4s} {"files/s":>10s} {"speedup":>9s}', file=sys.stderr)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, spec, files=arguments.files, seed=arguments.seed)
+        pools = run_scaling(paths, arguments.pools, arguments.workers, chunk_size=arguments.chunk_size,
+                            repeat=arguments.repeat)
+
+    results = {
+        'jparse': __version__,
+        'python': f'{platform.python_implementation()} {platform.python_version()}',
+        'free_threaded': bool(sysconfig.get_config_var('Py_GIL_DISABLED')),
+        'gil_enabled': is_gil_enabled(),
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'corpus': { **spec.as_dict(), 'files': arguments.files, 'seed': arguments.seed },
+        'chunk_size': arguments.chunk_size,
+        'pools': pools,
+    }
+
+    if arguments.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(arguments.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
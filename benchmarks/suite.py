@@ -0,0 +1,240 @@
+"""
+Benchmark suite: parsing stages on a synthetic corpus (see synthetic.generate_jpeg), machine-readable results.
+Each stage reports files/s, us/field (stages which handle fields) and peak memory allocated by the stage.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --files 200 --field-count 500 --byte-order big --output big.json
+    python -m benchmarks.suite --compare results.json        # exit code 1 if a stage is slower than tolerance
+
+The corpus is parsed from memory (BufferStream), so the results show the parsing cost, not the disk speed.
+"""
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from jparse.info import __version__
+from jparse.endianess import ByteOrder
+from jparse.BufferStream import BufferStream
+from jparse.ExifSegment import ExifSegment
+from jparse.JpegMetaParser import JpegMetaParser, scan_jpeg_structure
+
+from benchmarks import synthetic
+
+
+class Stage(NamedTuple):
+    name   : str
+    prepare: Callable[[bytes], Any]  # untimed: input of run() for one file
+    run    : Callable[[Any], int]    # timed: returns the number of handled fields
+
+
+def exif_segments(data: bytes) -> List[ExifSegment]:
+    structure = scan_jpeg_structure(BufferStream(data), include_eoi=False)
+    return [ segment for segment in structure if isinstance(segment, ExifSegment) ]
+
+
+def loaded_segments(data: bytes) -> List[ExifSegment]:
+    segments = exif_segments(data)
+    for segment in segments:
+        segment.load()
+    return segments
+
+
+def iterated_fields(data: bytes) -> list:
+    return [ field for segment in loaded_segments(data) for ifd in segment for field in ifd ]
+
+
+def run_scan(stream: BufferStream) -> int:
+    scan_jpeg_structure(stream, include_eoi=False)
+    return 0
+
+
+def run_segment_load(segments: List[ExifSegment]) -> int:
+    for segment in segments:
+        segment.load()
+    return 0
+
+
+def run_ifd_iteration(segments: List[ExifSegment]) -> int:
+    count = 0
+    for segment in segments:
+        for ifd in segment:
+            for _ in ifd:
+                count += 1
+    return count
+
+
+def run_field_load(fields: list) -> int:
+    for field in fields:
+        field.load()
+    return len(fields)
+
+
+def run_exif_info(parser: JpegMetaParser) -> int:
+    return len(parser.exif_info.to_dict())
+
+
+def run_estimate_image_size(stream: BufferStream) -> int:
+    JpegMetaParser(stream, estimate_image_size=True)
+    return 0
+
+
+STAGES = (
+    Stage('scan_jpeg_structure', BufferStream, run_scan),
+    Stage('segment_load', exif_segments, run_segment_load),
+    Stage('ifd_iteration', loaded_segments, run_ifd_iteration),
+    Stage('field_load', iterated_fields, run_field_load),
+    Stage('exif_info', lambda data: JpegMetaParser(BufferStream(data)), run_exif_info),
+    Stage('estimate_image_size', BufferStream, run_estimate_image_size),
+)
+
+
+def time_stage(stage: Stage, corpus: Sequence[bytes], repeat: int) -> Dict[str, Any]:
+    """
+    Best of `repeat` passes over the corpus, the garbage collector is disabled during the timed part (as timeit does).
+    """
+    best = float('inf')
+    field_count = 0
+
+    for _ in range(repeat):
+        inputs = [ stage.prepare(data) for data in corpus ]
+
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            field_count = sum(stage.run(item) for item in inputs)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+
+        best = min(best, elapsed)
+
+    return {
+        'seconds': best,
+        'files_per_second': len(corpus) / best,
+        'us_per_field': best / field_count * 1e6 if field_count > 0 else None,
+        'fields': field_count,
+        'peak_memory_bytes': measure_memory(stage, corpus),
+    }
+
+
+def measure_memory(stage: Stage, corpus: Sequence[bytes]) -> int:
+    """
+    Peak memory allocated by one pass of the stage over the corpus (the prepared inputs are not counted).
+    """
+    inputs = [ stage.prepare(data) for data in corpus ]
+
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            stage.run(item)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def run_suite(spec: synthetic.JpegSpec, files: int, repeat: int, seed: int=0,
+              stages: Optional[Sequence[str]]=None) -> Dict[str, Any]:
+    corpus = synthetic.generate_corpus(files, spec, seed=seed)
+
+    results = {}
+    for stage in STAGES:
+        if stages is None or stage.name in stages:
+            results[stage.name] = time_stage(stage, corpus, repeat)
+
+    return {
+        'jparse': __version__,
+        'python': f'{platform.python_implementation()} {platform.python_version()}',
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'corpus': { **spec.as_dict(), 'files': files, 'seed': seed, 'bytes': sum(map(len, corpus)) },
+        'repeat': repeat,
+        'stages': results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Names of the stages which are slower than the baseline by more than `tolerance` (0.1 - 10%).
+    The corpora should be the same: a different spec is reported to stderr.
+    """
+    if results['corpus'] != baseline['corpus']:
+        print(f'warning: the corpus differs from the baseline: {baseline["corpus"]}', file=sys.stderr)
+
+    regressions = []
+    for name, stage in results['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            continue
+
+        ratio = stage['files_per_second'] / base['files_per_second']
+        memory_ratio = stage['peak_memory_bytes'] / max(base['peak_memory_bytes'], 1)
+        is_regression = ratio < 1 - tolerance
+        print(f'{name:<20s} {ratio:>8.2f}x speed {memory_ratio:>8.2f}x memory{"  REGRESSION" if is_regression else ""}',
+              file=sys.stderr)
+
+        if is_regression:
+            regressions.append(name)
+
+    return regressions
+
+
+def print_table(results: Dict[str, Any]):
+    print(f'{"stage":<20s} {"files/s":>10s} {"us/field":>9s} {"peak, KB":>9s}', file=sys.stderr)
+    for name, stage in results['stages'].items():
+        us_per_field = '-' if stage['us_per_field'] is None else f'{stage["us_per_field"]:.2f}'
+        print(f'{name:<20s} {stage["files_per_second"]:>10.1f} {us_per_field:>9s} '
+              f'{stage["peak_memory_bytes"]/1024:>9.1f}', file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]]=None) -> int:
+    defaults = synthetic.JpegSpec()
+    arguments = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='jparse benchmark suite')
+    arguments.add_argument('--files', type=int, default=50, help='corpus size')
+    arguments.add_argument('--repeat', type=int, default=5, help='timed passes over the corpus, the best one is reported')
+    arguments.add_argument('--seed', type=int, default=0)
+    arguments.add_argument('--byte-order', choices=('little', 'big'), default='little')
+    arguments.add_argument('--app-count', type=int, default=defaults.app_count, help='custom Exif-like APP segments')
+    arguments.add_argument('--field-count', type=int, default=defaults.field_count, help='extra fields per IFD')
+    arguments.add_argument('--makernote-size', type=int, default=defaults.makernote_size, help='bytes')
+    arguments.add_argument('--scan-size', type=int, default=defaults.scan_size, help='bytes of image data')
+    arguments.add_argument('--stages', type=lambda value: value.split(','), default=None,
+                           help=f'comma-separated stages (default: all): {",".join(stage.name for stage in STAGES)}')
+    arguments.add_argument('--output', help='write the JSON results to the file instead of stdout')
+    arguments.add_argument('--compare', metavar='BASELINE', help='JSON results of a previous run')
+    arguments.add_argument('--tolerance', type=float, default=0.1, help='allowed slowdown of --compare (default: 0.1)')
+    arguments = arguments.parse_args(argv)
+
+    spec = synthetic.JpegSpec(byte_order=ByteOrder.LITTLE_ENDIAN if arguments.byte_order == 'little' else ByteOrder.BIG_ENDIAN,
+                              app_count=arguments.app_count,
+                              field_count=arguments.field_count,
+                              makernote_size=arguments.makernote_size,
+                              scan_size=arguments.scan_size)
+
+    results = run_suite(spec, files=arguments.files, repeat=arguments.repeat, seed=arguments.seed, stages=arguments.stages)
+    print_table(results)
+
+    if arguments.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(arguments.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as f:
+            baseline = json.load(f)
+        if len(compare(results, baseline, arguments.tolerance)) > 0:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Synthetic TIFF/Exif data for benchmarks: no real images needed.
+"""
+import random
+import struct
+from typing import List, NamedTuple, Tuple, Sequence
+
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+from jparse.TiffHeader import TiffHeader
+from jparse.IfdField import IfdField
+
+
+EXIF_SUB_IFD = 0x8769
+
+# (tag_id, field_type, values): values are ints, (numerator, denominator) pairs for rationals or str for ASCII
+Entry = Tuple[int, FieldType, Sequence]
+
+
+def encode_value(field_type: FieldType, values: Sequence, byte_order: ByteOrder) -> Tuple[int, bytes]:
+    """
+    Encode field value: returns (count, data).
+    """
+    if field_type == FieldType.ASCII:
+        data = values.encode('ascii') + b'\x00'
+        return len(data), data
+
+    if field_type.is_rational:
+        items = [item for pair in values for item in pair]
+        return len(values), struct.pack(f'{byte_order.value}{len(items)}{field_type.type_chr}', *items)
+
+    return len(values), struct.pack(f'{byte_order.value}{len(values)}{field_type.type_chr}', *values)
+
+
+def encode_ifd(entries: List[Entry], byte_order: ByteOrder, offset: int, next_ifd_offset: int=0) -> bytes:
+    """
+    Encode IFD located at `offset` (relative to TIFF header): directory followed by the value area.
+    """
+    value_area_offset = offset + 2 + len(entries)*IfdField.HEADER_SIZE + 4
+
+    directory = struct.pack(f'{byte_order.value}H', len(entries))
+    value_area = b''
+
+    for tag_id, field_type, values in sorted(entries, key=lambda entry: entry[0]):
+        count, data = encode_value(field_type, values, byte_order)
+
+        if len(data) <= 4:
+            directory += struct.pack(f'{byte_order.value}HHI', tag_id, field_type, count) + data.ljust(4, b'\x00')
+        else:
+            value_offset = value_area_offset + len(value_area)
+            directory += struct.pack(f'{byte_order.value}HHII', tag_id, field_type, count, value_offset)
+            value_area += data.ljust((len(data) + 3) & ~3, b'\x00')  # word alignment
+
+    directory += struct.pack(f'{byte_order.value}I', next_ifd_offset)
+
+    return directory + value_area
+
+
+def encode_tiff_header(byte_order: ByteOrder) -> bytes:
+    signature = b'II' if byte_order == ByteOrder.LITTLE_ENDIAN else b'MM'
+    return signature + struct.pack(f'{byte_order.value}HI', TiffHeader.ID, TiffHeader.SIZE)
+
+
+def encode_tiff(ifds: List[List[Entry]], byte_order: ByteOrder) -> bytes:
+    """
+    Encode TIFF header followed by a linked list of IFDs.
+    """
+    data = encode_tiff_header(byte_order)
+
+    for i, entries in enumerate(ifds):
+        offset = len(data)
+        ifd_size = len(encode_ifd(entries, byte_order, offset))
+        next_ifd_offset = offset + ifd_size if i + 1 < len(ifds) else 0
+        data += encode_ifd(entries, byte_order, offset, next_ifd_offset)
+
+    return data
+
+
+def numeric_entries(field_count: int, seed: int=0, first_tag: int=0x100) -> List[Entry]:
+    """
+    Mix of inline and out-of-line numeric fields, typical for MakerNote IFDs.
+    """
+    rnd = random.Random(seed)
+    entries = []
+
+    for i in range(field_count):
+        kind = i % 4
+        if kind == 0:
+            entry = (FieldType.Short, (rnd.randrange(1 << 16),))
+        elif kind == 1:
+            entry = (FieldType.Long, (rnd.randrange(1 << 32),))
+        elif kind == 2:
+            entry = (FieldType.Short, tuple(rnd.randrange(1 << 16) for _ in range(rnd.randrange(3, 16))))
+        else:
+            entry = (FieldType.Rational, tuple((rnd.randrange(1, 1000), rnd.randrange(1, 1000)) for _ in range(rnd.randrange(1, 4))))
+
+        entries.append((first_tag + i, *entry))
+
+    return entries
+
+
+def rational_entries(field_count: int, seed: int=0, first_tag: int=0x100) -> List[Entry]:
+    """
+    Rational and SRational fields of 1-8 elements, e.g. color matrices and lens data of MakerNote IFDs.
+    """
+    rnd = random.Random(seed)
+    entries = []
+
+    for i in range(field_count):
+        if i % 2 == 0:
+            value = tuple((rnd.randrange(1 << 20), rnd.randrange(1, 1 << 20)) for _ in range(rnd.randrange(1, 9)))
+            entries.append((first_tag + i, FieldType.Rational, value))
+        else:
+            value = tuple((rnd.randrange(-(1 << 20), 1 << 20), rnd.randrange(1, 1 << 20)) for _ in range(rnd.randrange(1, 9)))
+            entries.append((first_tag + i, FieldType.SRational, value))
+
+    return entries
+
+
+def encode_jpeg(tiff: bytes, scan_size: int=64) -> bytes:
+    """
+    Minimal JPEG: APP1/Exif segment with the TIFF data followed by SOS, dummy image data and EOI.
+    """
+    app1 = b'Exif\x00\x00' + tiff
+    sos = b'\x00\x08\x01\x01\x00\x00\x3F\x00'  # single component scan header
+
+    return (b'\xFF\xD8' +
+            b'\xFF\xE1' + struct.pack('>H', len(app1) + 2) + app1 +
+            b'\xFF\xDA' + sos +
+            b'\x00'*scan_size +
+            b'\xFF\xD9')
+
+
+def encode_exif_tiff(ifd0: List[Entry], exif_ifd: List[Entry], ifd1: List[Entry], byte_order: ByteOrder) -> bytes:
+    """
+    Encode Exif TIFF layout: IFD0 with the pointer (0x8769) to Exif sub-IFD, the sub-IFD and IFD1 (thumbnail IFD).
+    """
+    ifd0_offset = TiffHeader.SIZE
+    # the directory size doesn't depend on the pointer value
+    ifd0_size = len(encode_ifd(ifd0 + [(EXIF_SUB_IFD, FieldType.Long, (0,))], byte_order, ifd0_offset))
+
+    exif_offset = ifd0_offset + ifd0_size
+    exif_data = encode_ifd(exif_ifd, byte_order, exif_offset)
+
+    ifd1_offset = exif_offset + len(exif_data)
+    ifd0 = ifd0 + [(EXIF_SUB_IFD, FieldType.Long, (exif_offset,))]
+
+    return (encode_tiff_header(byte_order) +
+            encode_ifd(ifd0, byte_order, ifd0_offset, next_ifd_offset=ifd1_offset) +
+            exif_data +
+            encode_ifd(ifd1, byte_order, ifd1_offset))
+
+
+class JpegSpec(NamedTuple):
+    """
+    Layout of a generated JPEG (see generate_jpeg).
+    """
+    byte_order    : ByteOrder = ByteOrder.LITTLE_ENDIAN
+    app_count     : int = 1          # custom Exif-like segments APP3, APP4, ... (up to 13)
+    field_count   : int = 32         # extra fields in IFD0 and in each IFD of the custom segments
+    makernote_size: int = 4*1024     # bytes, Exif sub-IFD MakerNote
+    scan_size     : int = 256*1024   # bytes, entropy-coded image data
+
+    def as_dict(self) -> dict:
+        return { **self._asdict(), 'byte_order': self.byte_order.name }
+
+
+MAX_APP_COUNT = 13  # APP3 - APP15
+MAX_SEGMENT_SIZE = 0xFFFF
+
+
+def camera_entries(rnd: random.Random) -> Tuple[List[Entry], List[Entry], List[Entry]]:
+    """
+    Typical camera tags of IFD0, Exif sub-IFD and IFD1 (without the sub-IFD pointer and MakerNote).
+    """
+    width, height = rnd.choice(((6000, 4000), (4032, 3024), (1920, 1080)))
+
+    ifd0 = [
+        (0x100, FieldType.Long, (width,)),
+        (0x101, FieldType.Long, (height,)),
+        (0x10F, FieldType.ASCII, 'Synthetic'),
+        (0x110, FieldType.ASCII, f'Model {rnd.randrange(1000)}'),
+        (0x112, FieldType.Short, (1,)),
+        (0x11A, FieldType.Rational, ((72, 1),)),
+        (0x11B, FieldType.Rational, ((72, 1),)),
+        (0x128, FieldType.Short, (2,)),
+        (0x131, FieldType.ASCII, 'jparse benchmarks'),
+        (0x132, FieldType.ASCII, f'2024:01:{rnd.randrange(1, 29):02d} 12:00:00'),
+    ]
+    exif_ifd = [
+        (0x829A, FieldType.Rational, ((1, rnd.choice((60, 125, 250, 1000))),)),
+        (0x829D, FieldType.Rational, ((rnd.randrange(14, 220), 10),)),
+        (0x8827, FieldType.Short, (rnd.choice((100, 200, 400, 3200)),)),
+        (0x9000, FieldType.Undefined, tuple(b'0232')),
+        (0x9004, FieldType.ASCII, '2024:01:01 12:00:00'),
+        (0x9204, FieldType.SRational, ((rnd.randrange(-6, 7), 3),)),
+        (0x9209, FieldType.Short, (16,)),
+        (0x920A, FieldType.Rational, ((rnd.randrange(10, 600), 1),)),
+        (0xA000, FieldType.Undefined, tuple(b'0100')),
+        (0xA001, FieldType.Short, (1,)),
+        (0xA002, FieldType.Long, (width,)),
+        (0xA003, FieldType.Long, (height,)),
+    ]
+    ifd1 = [
+        (0x103, FieldType.Short, (6,)),
+        (0x11A, FieldType.Rational, ((72, 1),)),
+        (0x11B, FieldType.Rational, ((72, 1),)),
+        (0x128, FieldType.Short, (2,)),
+    ]
+
+    return ifd0, exif_ifd, ifd1
+
+
+def random_bytes(rnd: random.Random, size: int) -> bytes:
+    return rnd.getrandbits(8*size).to_bytes(size, 'little') if size > 0 else b''
+
+
+def encode_segment(signature: int, payload: bytes) -> bytes:
+    if len(payload) + 2 > MAX_SEGMENT_SIZE:
+        raise ValueError(f'segment 0x{signature:04X} payload of {len(payload)} bytes exceeds the segment size limit')
+    return struct.pack('>HH', signature, len(payload) + 2) + payload
+
+
+def generate_jpeg(spec: JpegSpec, seed: int=0) -> bytes:
+    """
+    Structurally complete JPEG: APP0/JFIF, APP1/Exif (IFD0, Exif sub-IFD with MakerNote, IFD1),
+    `spec.app_count` custom Exif-like segments of two linked IFDs, DQT, SOF0, DHT, SOS,
+    random byte-stuffed image data and EOI. The image data can't be decoded.
+    """
+    if not 0 <= spec.app_count <= MAX_APP_COUNT:
+        raise ValueError(f'app_count must be in range [0, {MAX_APP_COUNT}], got {spec.app_count}')
+
+    rnd = random.Random(seed)
+    byte_order = spec.byte_order
+
+    ifd0, exif_ifd, ifd1 = camera_entries(rnd)
+    ifd0 += numeric_entries(spec.field_count, seed=seed, first_tag=0xC000)
+    exif_ifd.append((0x927C, FieldType.Undefined, tuple(random_bytes(rnd, spec.makernote_size))))
+    tiff = encode_exif_tiff(ifd0, exif_ifd, ifd1, byte_order)
+
+    width, height = ifd0[0][2][0], ifd0[1][2][0]
+
+    data = b'\xFF\xD8'
+    data += encode_segment(0xFFE0, b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00')
+    data += encode_segment(0xFFE1, b'Exif\x00\x00' + tiff)
+
+    for i in range(spec.app_count):
+        ifds = [ numeric_entries(spec.field_count, seed=seed + i*2 + 1),
+                 numeric_entries(spec.field_count, seed=seed + i*2 + 2) ]
+        data += encode_segment(0xFFE3 + i, f'APP{3 + i}\x00\x00'.encode('ascii') + encode_tiff(ifds, byte_order))
+
+    data += encode_segment(0xFFDB, b'\x00' + bytes(range(1, 65)))
+    data += encode_segment(0xFFC0, struct.pack('>BHHB', 8, height, width, 1) + b'\x01\x11\x00')
+    data += encode_segment(0xFFC4, b'\x00' + b'\x00'*16)
+    data += encode_segment(0xFFDA, b'\x01\x01\x00\x00\x3F\x00')
+
+    # byte stuffing: 0xFF of the entropy-coded data is followed by 0x00
+    data += random_bytes(rnd, spec.scan_size).replace(b'\xFF', b'\xFF\x00')
+
+    return data + b'\xFF\xD9'
+
+
+def generate_corpus(count: int, spec: JpegSpec, seed: int=0) -> List[bytes]:
+    """
+    `count` JPEGs of the same layout with different values.
+    """
+    return [ generate_jpeg(spec, seed=seed + i) for i in range(count) ]
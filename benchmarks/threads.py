@@ -0,0 +1,178 @@
+"""
+Stress test: one JpegMetaParser shared by many threads.
+
+Each thread walks the lazy structure of the same fresh parser in its own order (segments, IFDs by index and by tag,
+field values, ExifInfo, thumbnail) and the results must be identical to a single-threaded walk.
+
+    python -m benchmarks.threads
+    python -m benchmarks.threads --threads 32 --rounds 50 --modes thread_safe,page_cache
+
+The exit code is 1 if any walk differs. A default parser of a plain file (mmap=False without thread_safe=True)
+isn't a mode: its seek() + read() pairs on the shared file position aren't atomic, so it isn't safe to share
+even if a run happens to pass.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.ExifSegment import ExifSegment
+from jparse.App1Segment import App1Segment
+
+from benchmarks import synthetic
+
+
+# mode -> JpegMetaParser.from_path options
+MODES: Dict[str, Dict[str, Any]] = {
+    'thread_safe': { 'mmap': False, 'thread_safe': True },
+    'columnar': { 'mmap': False, 'thread_safe': True, 'columnar': True },
+    'page_cache': { 'page_cache': True },
+    'mmap': { 'mmap': True },
+    'buffered': { 'mmap': False, 'buffered': True },
+}
+
+
+def normalize(value: Any) -> Any:
+    if isinstance(value, memoryview):
+        return bytes(value)
+    if isinstance(value, tuple):
+        return tuple(map(normalize, value))
+    return value
+
+
+def walk(parser: JpegMetaParser, rnd: random.Random) -> Dict[Tuple, Any]:
+    """
+    Everything reachable lazily from the parser as {key: value}, visited in a random order.
+    """
+    result = {}
+
+    segments = [ segment for segment in parser if isinstance(segment, ExifSegment) ]
+    rnd.shuffle(segments)
+
+    if rnd.random() < 0.5:
+        result['exif_info'] = parser.exif_info.to_dict()
+
+    for segment in segments:
+        name = segment.marker.name
+        result[name, 'name'] = segment.name
+
+        ifds = []
+        index = 0
+        while True:
+            ifd = segment.ifd(index)
+            if ifd is None:
+                break
+            ifds.append(ifd)
+            index += 1
+        rnd.shuffle(ifds)
+
+        for ifd in ifds:
+            result[name, ifd.index, 'header'] = (ifd.offset, ifd.field_count, ifd.next_ifd_offset)
+
+            if rnd.random() < 0.5:
+                fields = [ ifd.get_field(index=i) for i in reversed(range(ifd.field_count)) ]
+            else:
+                fields = list(ifd)
+            rnd.shuffle(fields)
+
+            for field in fields:
+                # the lookup by tag races with the lookup by index of the other threads
+                assert ifd.get_field(tag=field.tag_id) is not None
+                result[name, ifd.index, field.offset] = (field.tag_id, field.field_type, field.count, normalize(field.value))
+
+        if isinstance(segment, App1Segment):
+            result[name, 'thumbnail'] = normalize(segment.thumbnail)
+
+    result['exif_info'] = parser.exif_info.to_dict()
+    return result
+
+
+def hammer(open_parser: Callable[[], JpegMetaParser], threads: int, seed: int) -> List[Dict[Tuple, Any]]:
+    """
+    Walks of one parser by `threads` threads started at once.
+    """
+    results: List[Optional[Dict[Tuple, Any]]] = [ None ]*threads
+    errors: List[BaseException] = []
+    barrier = threading.Barrier(threads)
+
+    with open_parser() as parser:
+
+        def run(index: int):
+            try:
+                barrier.wait()
+                results[index] = walk(parser, random.Random(seed + index))
+            except BaseException as e:
+                errors.append(e)
+
+        workers = [ threading.Thread(target=run, args=(i,)) for i in range(threads) ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    if len(errors) > 0:
+        raise errors[0]
+
+    return results
+
+
+def stress(paths: Sequence[str], modes: Sequence[str], threads: int, rounds: int) -> int:
+    failures = 0
+
+    for mode in modes:
+        options = MODES[mode]
+        mode_failures = 0
+
+        for round_index in range(rounds):
+            path = paths[round_index % len(paths)]
+            with JpegMetaParser.from_path(path, mmap=False) as parser:
+                expected = walk(parser, random.Random(0))
+
+            open_parser = lambda: JpegMetaParser.from_path(path, **options)
+            for result in hammer(open_parser, threads=threads, seed=round_index*threads):
+                if result != expected:
+                    mode_failures += 1
+
+        print(f'{mode:<12s} {rounds} rounds x {threads} threads: {"OK" if mode_failures == 0 else f"{mode_failures} FAILED"}',
+              file=sys.stderr)
+        failures += mode_failures
+
+    return failures
+
+
+def main(argv: Optional[Sequence[str]]=None) -> int:
+    arguments = argparse.ArgumentParser(prog='python -m benchmarks.threads', description='shared parser stress test')
+    arguments.add_argument('--threads', type=int, default=16)
+    arguments.add_argument('--rounds', type=int, default=20, help='fresh parsers per mode')
+    arguments.add_argument('--files', type=int, default=4, help='synthetic files, parsers of the rounds cycle over them')
+    arguments.add_argument('--field-count', type=int, default=200, help='extra fields per IFD')
+    arguments.add_argument('--modes', type=lambda value: value.split(','), default=list(MODES),
+                           help=f'comma-separated modes (default: all): {",".join(MODES)}')
+    arguments = arguments.parse_args(argv)
+
+    unknown = [ mode for mode in arguments.modes if mode not in MODES ]
+    if len(unknown) > 0:
+        arguments.error(f'unknown modes: {", ".join(unknown)}')
+
+    # frequent thread switches to provoke races
+    sys.setswitchinterval(1e-6)
+
+    spec = synthetic.JpegSpec(app_count=2, field_count=arguments.field_count, scan_size=1024)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i, data in enumerate(synthetic.generate_corpus(arguments.files, spec)):
+            paths.append(os.path.join(directory, f'{i}.jpg'))
+            with open(paths[-1], 'wb') as f:
+                f.write(data)
+
+        failures = stress(paths, arguments.modes, threads=arguments.threads, rounds=arguments.rounds)
+
+    return 1 if failures > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
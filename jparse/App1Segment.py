@@ -1,19 +1,23 @@
 from __future__ import annotations
 
-from typing import IO, Union
+from typing import IO, Optional, Union
 
+from jparse import parser
 from jparse.log import logger
 from jparse.JpegMarker import JpegMarker
 from jparse.ExifSegment import ExifSegment
 from jparse.IFD import IFD
+from jparse.ValueCache import FileValueCache
 
 
 class App1Segment(ExifSegment):
     """
     Standard APP1/Exif segment. Contains linked IFD0 and IFD1.
-    Other stuff (GPS IFD, ExifPrivate IFD, thumbnail image) should be loaded separately.
+    Exif, GPS and Interop IFDs are reachable by pointer tags: resolve_ifd('GPS'), sub_ifd() and walk_ifds().
     """
 
+    __slots__ = ('__ifd0', '__ifd1')
+
     @property
     def ifd0(self) -> Union[IFD, None]:
         return self.ifd(0)
@@ -22,9 +26,33 @@ class App1Segment(ExifSegment):
     def ifd1(self) -> Union[IFD, None]:
         return self.ifd(1)
 
+    @property
+    def thumbnail(self) -> Union[bytes, None]:
+        """
+        JPEG thumbnail referenced by IFD1 (JPEGInterchangeFormat and JPEGInterchangeFormatLength tags).
+        It's a zero-copy memoryview if the file is memory-mapped (see JpegMetaParser.from_path).
+        """
+        ifd1 = self.ifd1
+        if ifd1 is None:
+            return None
+
+        thumbnail_offset = ifd1.get_field(tag=0x201)
+        thumbnail_size = ifd1.get_field(tag=0x202)
+        if thumbnail_offset is None or thumbnail_size is None:
+            return None
+
+        return parser.read_at(self._stream, self.tiff_header.offset + thumbnail_offset.value, thumbnail_size.value)
 
-    def __init__(self, marker: JpegMarker, stream: IO, offset: int, size: int):
-        super().__init__(marker=marker, stream=stream, offset=offset, size=size)
+
+    def __init__(self, marker: JpegMarker,
+                       stream: IO,
+                       offset: int,
+                       size: int,
+                       ifd_class: Optional[type]=None,
+                       value_cache: Optional[FileValueCache]=None,
+                       rational_mode: str='fraction'):
+        super().__init__(marker=marker, stream=stream, offset=offset, size=size, ifd_class=ifd_class, value_cache=value_cache,
+                         rational_mode=rational_mode)
         self.__ifd0 = None
         self.__ifd1 = None
 
@@ -50,34 +78,44 @@ class App1Segment(ExifSegment):
         if self.__ifd0 is not None:
             return self.__ifd0
 
-        if self.tiff_header is None:
-            logger.debug(f'-> TiffHeader is missing for APP1 -> stop parsing')
-            return None
+        with self._lock:
+            if self.__ifd0 is not None:
+                return self.__ifd0  # loaded by another thread
 
-        ifd0_offset = self.tiff_header.offset + self.tiff_header.ifd0_offset
-        logger.debug(f'-> IFD #0, offset=0x{ifd0_offset:08X}')
+            if self.tiff_header is None:
+                logger.debug(f'-> TiffHeader is missing for APP1 -> stop parsing')
+                return None
 
-        self._stream.seek(ifd0_offset)
-        self.__ifd0 = IFD.parse(self._stream, tiff_header=self.tiff_header, index=0)
-        return self.__ifd0
+            ifd0_offset = self.tiff_header.offset + self.tiff_header.ifd0_offset
+            logger.debug(f'-> IFD #0, offset=0x{ifd0_offset:08X}')
+
+            self.__ifd0 = self._parse_ifd(ifd0_offset, index=0)
+            return self.__ifd0
 
 
     def _load_ifd1(self) -> Union[IFD, None]:
         if self.__ifd1 is not None:
             return self.__ifd1
 
-        ifd0 = self.ifd0
-        if ifd0 is None:
-            logger.debug(f'-> IFD0 is missing for APP1 -> stop parsing')
-            return None
+        with self._lock:
+            if self.__ifd1 is not None:
+                return self.__ifd1  # loaded by another thread
 
-        if ifd0.next_ifd_offset == 0:
-            logger.debug(f'-> IFD1 is missing for APP1 -> stop parsing')
-            return None
+            ifd0 = self.ifd0
+            if ifd0 is None:
+                logger.debug(f'-> IFD0 is missing for APP1 -> stop parsing')
+                return None
+
+            if ifd0.next_ifd_offset == 0:
+                logger.debug(f'-> IFD1 is missing for APP1 -> stop parsing')
+                return None
+
+            ifd1_offset = self.tiff_header.offset + ifd0.next_ifd_offset
+            if ifd1_offset == ifd0.offset:
+                logger.debug(f'-> IFD0 is linked to itself -> IFD1 is missing')
+                return None
 
-        ifd1_offset = self.tiff_header.offset + ifd0.next_ifd_offset
-        logger.debug(f'-> IFD #1, offset=0x{ifd1_offset:08X}')
+            logger.debug(f'-> IFD #1, offset=0x{ifd1_offset:08X}')
 
-        self._stream.seek(ifd1_offset)
-        self.__ifd1 = IFD.parse(self._stream, tiff_header=self.tiff_header, index=1)
-        return self.__ifd1
\ No newline at end of file
+            self.__ifd1 = self._parse_ifd(ifd1_offset, index=1)
+            return self.__ifd1
\ No newline at end of file
@@ -1,6 +1,9 @@
+import threading
+from time import perf_counter
 from typing import IO
 
 from jparse import parser
+from jparse import instrument
 from jparse.log import logger
 from jparse.JpegMarker import JpegMarker
 from jparse.JpegSegment import JpegSegment
@@ -9,8 +12,11 @@ from jparse.JpegSegment import JpegSegment
 class AppSegment(JpegSegment):
     """
     Basic container for the APPx segments.
+    Lazy loading is guarded by the segment's lock: the segment can be shared by threads.
     """
 
+    __slots__ = ('_name', '_is_loaded', '_lock')
+
     @property
     def is_loaded(self) -> bool:
         """
@@ -29,6 +35,8 @@ class AppSegment(JpegSegment):
 
         self._name = None
         self._is_loaded = False
+        # reentrant: loading of IFDs loads the segment header
+        self._lock = threading.RLock()
 
 
     def __str__(self) -> str:
@@ -45,10 +53,18 @@ class AppSegment(JpegSegment):
         """
         if self.is_loaded: return
 
-        self._stream.seek(self.offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE)
-        logger.debug(f'[{self.marker.name}] segment loading...')
+        with self._lock:
+            if self.is_loaded: return  # loaded by another thread
+
+            stats = instrument.current.stats
+            start_time = perf_counter() if stats is not None else 0.0
+
+            logger.debug(f'[{self.marker.name}] segment loading...')
+
+            self._name = parser.parse_app_name(self._stream, offset=self.offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE)
+            logger.debug(f'-> name: {self._name}')
 
-        self._name = parser.parse_app_name(self._stream)
-        logger.debug(f'-> name: {self._name}')
+            self._is_loaded = True
 
-        self._is_loaded = True
\ No newline at end of file
+            if stats is not None:
+                stats.add_time('app_header', perf_counter() - start_time)
\ No newline at end of file
@@ -0,0 +1,343 @@
+import asyncio
+import io
+import os
+from bisect import bisect_right
+from typing import List, Optional, Tuple, Union
+
+try:
+    from typing import Protocol
+except ImportError:  # python 3.7
+    Protocol = object
+
+from jparse import endianess
+from jparse.JpegMarker import JpegMarker, SOI, SOS, EOI, APPn
+from jparse.JpegMetaParser import JpegMetaParser
+
+
+DEFAULT_READAHEAD: int = 64*1024  # bytes, usually covers all segment headers in one request
+DEFAULT_MAX_GAP: int = 16*1024  # bytes, ranges closer than that are fetched in one request
+
+
+class RangeReader(Protocol):
+    """
+    Asynchronous random access source, e.g. ranged GETs from an object store.
+    """
+
+    async def read_at(self, offset: int, size: int) -> bytes:
+        """
+        Read up to `size` bytes from `offset`, less bytes are returned only at the end of the file.
+        """
+        ...
+
+
+class AsyncJpegMetaParser(JpegMetaParser):
+    """
+    JpegMetaParser front end for asynchronous range readers.
+
+    open() fetches only the byte ranges of the segment headers and APP segments, adjacent ranges
+    are coalesced and fetched concurrently. APP segments are fetched entirely (up to 64 KB each)
+    because all IFDs and values are inside them: one ranged request is cheaper than a round trip per IFD.
+    After open() all data is in memory, so the parser is used synchronously as usual.
+    """
+
+    @property
+    def request_count(self) -> int:
+        """
+        Number of read_at() requests to the range reader.
+        """
+        return self.stream.request_count
+
+    @property
+    def fetched_size(self) -> int:
+        """
+        Number of bytes fetched from the range reader.
+        """
+        return self.stream.fetched_size
+
+
+    @classmethod
+    async def open(cls, reader: RangeReader,
+                        readahead: int=DEFAULT_READAHEAD,
+                        max_gap: int=DEFAULT_MAX_GAP,
+                        **kwargs) -> 'AsyncJpegMetaParser':
+        """
+        Fetch metadata through the range reader and parse it.
+        readahead: minimal request size for segment headers scanning.
+        max_gap: ranges separated by a gap up to max_gap bytes are fetched in one request.
+        kwargs: parsing options of JpegMetaParser (image data is not fetched, so estimate_image_size is not supported).
+                `only` and `max_prefix` limit the fetched ranges as well.
+        """
+        if kwargs.get('estimate_image_size', False):
+            raise RuntimeError('estimate_image_size is not supported: image data is not fetched')
+
+        only = kwargs.get('only')
+        wanted = None if only is None else {name.upper() for name in only}
+        max_prefix = kwargs.get('max_prefix')
+
+        buffer = RangeBuffer(reader, readahead=readahead, max_offset=max_prefix)
+
+        # scan segment headers, the segments content isn't needed except APP segments
+        app_ranges = []
+
+        signature = await buffer.fetch_read(0, JpegMarker.MARKER_SIZE)
+        if len(signature) != JpegMarker.MARKER_SIZE or endianess.convert_big_endian(signature) != SOI.signature:
+            raise RuntimeError('file is not JPEG')
+
+        offset = JpegMarker.MARKER_SIZE
+        while wanted is None or len(wanted) > 0:
+            header = await buffer.fetch_read(offset, JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE)
+            if len(header) != JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE:
+                break  # the end of the file: the parser will report it
+
+            marker = JpegMarker.detect(endianess.convert_big_endian(header[:JpegMarker.MARKER_SIZE]))
+            if marker == EOI:
+                break
+
+            size = endianess.convert_big_endian(header[JpegMarker.MARKER_SIZE:]) + JpegMarker.MARKER_SIZE
+            if max_prefix is not None and offset + size > max_prefix:
+                break
+
+            if APPn.check_mask(marker.signature) and (wanted is None or marker.name.upper() in wanted):
+                payload_offset = offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE
+                app_ranges.append((payload_offset, size - JpegMarker.MARKER_SIZE - JpegMarker.LENGTH_SIZE))
+
+            offset += size
+            if marker == SOS:
+                break
+
+            if wanted is not None:
+                wanted.discard(marker.name.upper())
+
+        await buffer.fetch(app_ranges, max_gap=max_gap)
+
+        # the buffer is in memory already, the segments are sliced from it
+        return cls(buffer, **{**kwargs, 'buffered': True})
+
+
+class RangeBuffer:
+    """
+    Sparse in-memory copy of a file: holds only the fetched byte ranges.
+    It's a read-only stream for the synchronous parser,
+    reads of missing bytes return short data (as the end of the stream).
+    """
+
+    mode: str = 'rb'
+
+    @property
+    def request_count(self) -> int:
+        return self._request_count
+
+    @property
+    def fetched_size(self) -> int:
+        return self._fetched_size
+
+
+    def __init__(self, reader: RangeReader, readahead: int=DEFAULT_READAHEAD, max_offset: Optional[int]=None):
+        """
+        max_offset: nothing is fetched beyond this offset.
+        """
+        self._reader = reader
+        self._readahead = readahead
+        self._max_offset = max_offset
+
+        # sorted, non-overlapping and non-adjacent blocks of fetched data
+        self._block_offsets: List[int] = []
+        self._blocks: List[bytes] = []
+
+        self._position = 0
+        self._request_count = 0
+        self._fetched_size = 0
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(blocks={len(self._blocks)}, fetched_size={self.fetched_size})'
+
+
+    async def fetch(self, ranges: List[Tuple[int, int]], max_gap: int=0):
+        """
+        Fetch missing parts of the (offset, size) ranges: close ranges are coalesced,
+        the requests are sent concurrently.
+        """
+        if self._max_offset is not None:
+            ranges = [ (offset, min(size, self._max_offset - offset)) for offset, size in ranges ]
+
+        missing = []
+        for offset, size in ranges:
+            missing.extend(self.missing_ranges(offset, size))
+
+        requests = coalesce_ranges(missing, max_gap=max_gap)
+        if len(requests) == 0:
+            return
+
+        self._request_count += len(requests)
+        results = await asyncio.gather(*(self._reader.read_at(offset, size) for offset, size in requests))
+
+        for (offset, _), data in zip(requests, results):
+            self._insert(offset, bytes(data))
+
+    async def fetch_read(self, offset: int, count: int) -> bytes:
+        """
+        Read the range, a missing range is fetched with readahead.
+        """
+        if len(self.missing_ranges(offset, count)) > 0:
+            await self.fetch([(offset, max(count, self._readahead))])
+
+        return self.read_at(offset, count)
+
+
+    def missing_ranges(self, offset: int, size: int) -> List[Tuple[int, int]]:
+        """
+        Parts of the (offset, size) range which are not fetched yet.
+        """
+        missing = []
+        end = offset + size
+
+        index = max(bisect_right(self._block_offsets, offset) - 1, 0)
+        while offset < end and index < len(self._blocks):
+            block_offset = self._block_offsets[index]
+            block_end = block_offset + len(self._blocks[index])
+
+            if block_end <= offset:
+                index += 1
+                continue
+            if block_offset >= end:
+                break
+
+            if block_offset > offset:
+                missing.append((offset, block_offset - offset))
+            offset = block_end
+            index += 1
+
+        if offset < end:
+            missing.append((offset, end - offset))
+
+        return missing
+
+
+    def read_at(self, offset: int, count: int=-1) -> bytes:
+        index = bisect_right(self._block_offsets, offset) - 1
+        if index < 0:
+            return b''
+
+        start = offset - self._block_offsets[index]
+        block = self._blocks[index]
+        if start >= len(block):
+            return b''
+
+        if count < 0:
+            return block[start:]
+
+        return block[start:start + count]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            raise ValueError(f'unsupported whence: {whence}')
+
+        return self._position
+
+    def read(self, count: int=-1) -> bytes:
+        data = self.read_at(self._position, count)
+        self._position += len(data)
+        return data
+
+
+    def _insert(self, offset: int, data: bytes):
+        self._fetched_size += len(data)
+        if len(data) == 0:
+            return
+
+        end = offset + len(data)
+
+        # merge with all overlapping or adjacent blocks
+        first = bisect_right(self._block_offsets, offset) - 1
+        if first < 0 or self._block_offsets[first] + len(self._blocks[first]) < offset:
+            first += 1
+
+        last = first
+        while last < len(self._blocks) and self._block_offsets[last] <= end:
+            last += 1
+
+        if first < last:
+            merged_offset = min(offset, self._block_offsets[first])
+            merged_end = max(end, self._block_offsets[last - 1] + len(self._blocks[last - 1]))
+
+            merged = bytearray(merged_end - merged_offset)
+            for i in range(first, last):
+                block_start = self._block_offsets[i] - merged_offset
+                merged[block_start:block_start + len(self._blocks[i])] = self._blocks[i]
+            merged[offset - merged_offset:end - merged_offset] = data
+
+            offset, data = merged_offset, bytes(merged)
+
+        self._block_offsets[first:last] = [offset]
+        self._blocks[first:last] = [data]
+
+
+def coalesce_ranges(ranges: List[Tuple[int, int]], max_gap: int=0) -> List[Tuple[int, int]]:
+    """
+    Merge (offset, size) ranges which overlap or are separated by a gap up to max_gap bytes.
+    """
+    merged: List[List[int]] = []
+
+    for offset, size in sorted(ranges):
+        if size <= 0:
+            continue
+
+        if len(merged) > 0 and offset <= merged[-1][1] + max_gap:
+            merged[-1][1] = max(merged[-1][1], offset + size)
+        else:
+            merged.append([offset, offset + size])
+
+    return [(start, end - start) for start, end in merged]
+
+
+class BytesRangeReader:
+    """
+    In-memory range reader with injected latency: a stand-in for an object store in tests and benchmarks.
+    """
+
+    def __init__(self, data: bytes, latency: float=0.0):
+        self._data = data
+        self.latency = latency
+        self.requests: List[Tuple[int, int]] = []
+
+    async def read_at(self, offset: int, size: int) -> bytes:
+        self.requests.append((offset, size))
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self._data[offset:offset + size]
+
+
+class FileRangeReader:
+    """
+    File-backed range reader with injected latency: a stand-in for an object store in tests and benchmarks.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], latency: float=0.0):
+        self._path = path
+        self.latency = latency
+        self.requests: List[Tuple[int, int]] = []
+
+    async def read_at(self, offset: int, size: int) -> bytes:
+        self.requests.append((offset, size))
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return await asyncio.get_running_loop().run_in_executor(None, self._read, offset, size)
+
+    def _read(self, offset: int, size: int) -> bytes:
+        with open(self._path, 'rb') as f:
+            f.seek(offset)
+            return f.read(size)
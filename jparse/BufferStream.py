@@ -0,0 +1,95 @@
+import io
+from typing import Union
+
+
+BufferType = Union[bytes, bytearray, memoryview]
+
+
+class BufferStream:
+    """
+    Read-only binary stream over an in-memory buffer.
+    The buffer holds the bytes [offset, offset + len(buffer)) of the file,
+    so all positions (seek/tell/read_at) are absolute file offsets.
+    """
+
+    mode: str = 'rb'
+
+    @property
+    def offset(self) -> int:
+        """
+        Offset of the first buffered byte from the file start.
+        """
+        return self._offset
+
+    @property
+    def buffer(self) -> BufferType:
+        return self._buffer
+
+    @property
+    def closed(self) -> bool:
+        return self._buffer is None
+
+
+    def __init__(self, buffer: BufferType, offset: int=0):
+        self._buffer = buffer
+        self._offset = offset
+        self._position = offset
+
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(offset={self.offset}, size={len(self)})'
+
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if self._buffer is None:
+            raise ValueError('I/O operation on closed stream')
+
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self._offset + len(self._buffer) + offset
+        else:
+            raise ValueError(f'invalid whence: {whence}')
+
+        return self._position
+
+    def read(self, count: int=-1) -> BufferType:
+        data = self.read_at(self._position, count)
+        self._position += len(data)
+        return data
+
+    def read_at(self, offset: int, count: int=-1) -> BufferType:
+        """
+        Read up to `count` bytes from the absolute `offset` without moving the stream position.
+        """
+        try:
+            if offset < self._offset:
+                # nothing is buffered before the buffer offset
+                return self._buffer[0:0]
+
+            start = offset - self._offset
+            if count < 0:
+                return self._buffer[start:]
+
+            return self._buffer[start:start + count]
+        except TypeError:
+            if self._buffer is None:
+                raise ValueError('I/O operation on closed stream') from None
+            raise
+
+    def close(self):
+        self._buffer = None
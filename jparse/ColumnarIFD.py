@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from time import perf_counter
+from typing import IO, Union, Optional
+
+from jparse import parser
+from jparse import decoder
+from jparse import instrument
+from jparse.TiffHeader import TiffHeader
+from jparse.IfdField import IfdField
+from jparse.IFD import IfdIterator
+from jparse.ValueCache import FileValueCache
+from jparse.FieldType import FieldType, ID_TO_TYPE_MAPPING, TYPE_TO_SIZE_MAPPING
+
+
+class ColumnarIFD:
+    """
+    Compact IFD: all field headers are decoded at once into parallel array columns
+    (tag_id, type, count, value_offset, size), about 20 bytes per field.
+    IfdField objects are created on request as lightweight views and are not cached,
+    values are read from the segment's stream (a shared buffer in buffered and mmap modes),
+    inline values (up to 4 bytes) are decoded from the value column without reading.
+    Tag lookup is a binary search over the sorted tag column.
+
+    It has the same interface as IFD, see JpegMetaParser(columnar=True).
+    """
+
+    __slots__ = ('_stream', '_tiff_header', '_offset', '_index', '_next_ifd_offset', '_size',
+                 '_tag_ids', '_type_ids', '_counts', '_value_words', '_sizes',
+                 '_sorted_tag_ids', '_tag_order', '_value_cache', '_rational_mode')
+
+    @property
+    def offset(self) -> int:
+        """
+        IFD offset from the start of the file.
+        """
+        return self._offset
+
+    @property
+    def field_count(self) -> int:
+        return len(self._tag_ids)
+
+    @property
+    def next_ifd_offset(self) -> int:
+        """
+        Next IFD offset relative to TiffHeader of the segment.
+        """
+        return self._next_ifd_offset
+
+    @property
+    def index(self) -> int:
+        """
+        Index of the IFD
+        """
+        return self._index
+
+    def __len__(self) -> int:
+        return self.field_count
+
+    def __getitem__(self, tag: int) -> IfdField:
+        assert type(tag) == int
+        field = self.get_field(tag=tag)
+        if field is None:
+            raise KeyError(tag)
+        return field
+
+    def __iter__(self) -> IfdIterator:
+        return IfdIterator(ifd=self)
+
+
+    def __init__(self, stream: IO,
+                       tiff_header: TiffHeader,
+                       index: int,
+                       next_ifd_offset: int,
+                       offset: int,
+                       value_cache: Optional[FileValueCache]=None,
+                       rational_mode: str='fraction'):
+        self._stream = stream
+        self._tiff_header = tiff_header
+        self._value_cache = value_cache
+        self._rational_mode = rational_mode
+        self._offset = offset
+        self._index = index
+        self._next_ifd_offset = next_ifd_offset
+        self._size = 2 + 4  # sizeof(field_count) + sizeof(next_ifd_offset)
+
+        self._tag_ids = array('H')
+        self._type_ids = array('H')
+        self._counts = array('I')
+        self._value_words = array('Q')  # absolute value offset or the value data word of inline fields (see get_field)
+        self._sizes = array('I')
+
+        # TIFF requires ascending tags, otherwise a sorted copy and the permutation are kept
+        self._sorted_tag_ids = self._tag_ids
+        self._tag_order: Optional[array] = None
+
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(index={self.index}, '
+                f'fields={self.field_count}, '
+                f'next_ifd_offset={self.next_ifd_offset}, '
+                f'offset={self.offset})')
+
+    def size(self) -> int:
+        """
+        IFD size including out-of-line values.
+        """
+        return self._size
+
+
+    def load_all(self):
+        """
+        All field headers are loaded by parse().
+        """
+        pass
+
+
+    def get_field(self, tag: Union[int, None]=None, index: Union[int, None]=None) -> Union[IfdField, None]:
+        if tag is not None:
+            assert index is None, 'only tag or index can be used at the same time'
+            index = self._find_tag(tag)
+            if index is None:
+                return None
+        else:
+            assert tag is None, 'only tag or index can be used at the same time'
+            if not 0 <= index < self.field_count:
+                return None
+
+        field_offset = self._offset + 2 + index*IfdField.HEADER_SIZE
+        byte_order = self._tiff_header.byte_order
+
+        size = self._sizes[index]
+        if size == IfdField.HEADER_SIZE:
+            # inline value: decoded by the view without reading
+            value_offset = field_offset + 8
+            inline_data = decoder.UINT32[byte_order].pack(self._value_words[index])
+        else:
+            value_offset = self._value_words[index]
+            inline_data = None
+
+        return IfdField(tag_id=self._tag_ids[index],
+                        count=self._counts[index],
+                        field_type=ID_TO_TYPE_MAPPING.get(self._type_ids[index], FieldType.Unknown),
+                        stream=self._stream,
+                        byte_order=byte_order,
+                        value_offset=value_offset,
+                        size=size,
+                        offset=field_offset,
+                        value_cache=self._value_cache,
+                        rational_mode=self._rational_mode,
+                        inline_data=inline_data)
+
+
+    @classmethod
+    def parse(cls, stream: IO,
+                   tiff_header: TiffHeader,
+                   index: int,
+                   offset: Optional[int]=None,
+                   eager: bool=True,
+                   value_cache: Optional[FileValueCache]=None,
+                   rational_mode: str='fraction') -> 'ColumnarIFD':
+        """
+        Parse IFD located at `offset` (the current stream position by default).
+        The whole directory is read and decoded at once, `eager` is accepted for compatibility with IFD.parse().
+        value_cache: cache of the fields' decoded values, the views don't keep values (see ValueCache).
+        rational_mode: representation of Rational/SRational values (see decoder.RATIONAL_MODES).
+        """
+        stats = instrument.current.stats
+        start_time = perf_counter() if stats is not None else 0.0
+
+        ifd_offset = stream.tell() if offset is None else offset
+
+        field_count = parser.read_at(stream, ifd_offset, count=2)
+        field_count, = decoder.UINT16[tiff_header.byte_order].unpack(field_count)
+
+        directory_size = field_count*IfdField.HEADER_SIZE
+        data = parser.read_at(stream, ifd_offset + 2, directory_size + 4)
+        next_ifd_offset, = decoder.UINT32[tiff_header.byte_order].unpack_from(data, directory_size)
+
+        ifd = ColumnarIFD(stream=stream,
+                          tiff_header=tiff_header,
+                          offset=ifd_offset,
+                          index=index,
+                          next_ifd_offset=next_ifd_offset,
+                          value_cache=value_cache,
+                          rational_mode=rational_mode)
+        ifd._load_columns(data[:directory_size])
+
+        if stats is not None:
+            stats.count('fields_parsed', field_count)
+            stats.add_time('ifd_decode', perf_counter() - start_time)
+
+        return ifd
+
+
+    def _load_columns(self, data: bytes):
+        for tag_id, type_id, count, value_word in decoder.FIELD_HEADER[self._tiff_header.byte_order].iter_unpack(data):
+            # the same as IfdField.from_header(), the value word of inline fields is kept as is
+            field_size = count * TYPE_TO_SIZE_MAPPING[ID_TO_TYPE_MAPPING.get(type_id, FieldType.Unknown)]
+            if field_size <= 4:
+                field_size = IfdField.HEADER_SIZE
+            else:
+                value_word += self._tiff_header.offset
+                field_size = parser.align4(field_size) + IfdField.HEADER_SIZE
+
+            self._tag_ids.append(tag_id)
+            self._type_ids.append(type_id)
+            self._counts.append(count)
+            self._value_words.append(value_word)
+            self._sizes.append(field_size)
+
+            self._size += field_size
+
+        tag_ids = self._tag_ids
+        if any(tag_ids[i] > tag_ids[i + 1] for i in range(len(tag_ids) - 1)):
+            self._tag_order = array('H', sorted(range(len(tag_ids)), key=tag_ids.__getitem__))
+            self._sorted_tag_ids = array('H', (tag_ids[i] for i in self._tag_order))
+
+
+    def _find_tag(self, tag: int) -> Optional[int]:
+        position = bisect_left(self._sorted_tag_ids, tag)
+        if position == len(self._sorted_tag_ids) or self._sorted_tag_ids[position] != tag:
+            return None
+
+        return position if self._tag_order is None else self._tag_order[position]
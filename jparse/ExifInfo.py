@@ -1,10 +1,111 @@
-from typing import Optional, Union, Iterable
+import math
+from typing import Any, Callable, Dict, Optional, Tuple, Union, Iterable
 from fractions import Fraction
 
 from jparse.IFD import IFD
-from jparse.IfdField import ValueType
-from jparse.log import logger
+from jparse.IfdField import IfdField, ValueType, load_values
 from jparse.TagPath import TagPath
+from jparse.RawRational import RawRational, divide
+
+
+def version_to_str(version: ValueType) -> str:
+    assert isinstance(version, Iterable)
+    return ''.join(map(chr, version))
+
+
+# FIELDS IFDs
+IFD0         = 0
+EXIF_SUB_IFD = 0x8769
+
+# property name -> (IFD, tag_id, converter of the decoded value)
+FIELDS: Dict[str, Tuple[int, int, Optional[Callable[[ValueType], Any]]]] = {
+    'image_width'                   : (IFD0,         0x100, None),
+    'image_height'                  : (IFD0,         0x101, None),
+    'bits_per_sample'               : (IFD0,         0x102, None),
+    'compression'                   : (IFD0,         0x103, None),
+    'photometric_interpretation'    : (IFD0,         0x106, None),
+    'orientation'                   : (IFD0,         0x112, None),
+    'samples_per_pixel'             : (IFD0,         0x115, None),
+    'planar_configuration'          : (IFD0,         0x11C, None),
+    'ycbcr_sub_sampling'            : (IFD0,         0x212, None),
+    'ycbcr_sub_positioning'         : (IFD0,         0x213, None),
+    'x_resolution'                  : (IFD0,         0x11A, None),
+    'y_resolution'                  : (IFD0,         0x11B, None),
+    'resolution_unit'               : (IFD0,         0x128, None),
+    'whitepoint'                    : (IFD0,         0x13E, None),
+    'primary_chromaticities'        : (IFD0,         0x13F, None),
+    'ycbcr_coefficients'            : (IFD0,         0x211, None),
+    'reference_black_white'         : (IFD0,         0x214, None),
+    'datetime'                      : (IFD0,         0x132, None),
+    'image_description'             : (IFD0,         0x10E, None),
+    'make'                          : (IFD0,         0x10F, None),
+    'model'                         : (IFD0,         0x110, None),
+    'software'                      : (IFD0,         0x131, None),
+    'artist'                        : (IFD0,         0x13B, None),
+    'copyright'                     : (IFD0,         0x8298, None),
+    'exif_ifd_offset'               : (IFD0,         0x8769, None),
+    'gps_ifd_offset'                : (IFD0,         0x8825, None),
+    'interop_ifd_offset'            : (IFD0,         0xA005, None),
+    'exif_version'                  : (EXIF_SUB_IFD, 0x9000, version_to_str),
+    'flashpix_version'              : (EXIF_SUB_IFD, 0xA000, version_to_str),
+    'color_space'                   : (EXIF_SUB_IFD, 0xA001, None),
+    'components_config'             : (EXIF_SUB_IFD, 0x9101, None),
+    'compressed_bpp'                : (EXIF_SUB_IFD, 0x9102, None),
+    'pixel_x_dimension'             : (EXIF_SUB_IFD, 0xA002, None),
+    'pixel_y_dimension'             : (EXIF_SUB_IFD, 0xA003, None),
+    'marker_note'                   : (EXIF_SUB_IFD, 0x927C, None),
+    'user_comment'                  : (EXIF_SUB_IFD, 0x9286, None),
+    'related_sound_file'            : (EXIF_SUB_IFD, 0xA004, None),
+    'datetime_original'             : (EXIF_SUB_IFD, 0x9001, None),
+    'datetime_digitized'            : (EXIF_SUB_IFD, 0x9004, None),
+    'sub_sec_time'                  : (EXIF_SUB_IFD, 0x9290, None),
+    'sub_sec_time_original'         : (EXIF_SUB_IFD, 0x9291, None),
+    'sub_sec_time_digitized'        : (EXIF_SUB_IFD, 0x9292, None),
+    'image_unique_id'               : (EXIF_SUB_IFD, 0xA420, None),
+    'exposure_time'                 : (EXIF_SUB_IFD, 0x829A, None),
+    'f_number'                      : (EXIF_SUB_IFD, 0x829D, None),
+    'exposure_program'              : (EXIF_SUB_IFD, 0x8822, None),
+    'spectral_sensitivity'          : (EXIF_SUB_IFD, 0x8824, None),
+    'iso_speed'                     : (EXIF_SUB_IFD, 0x8827, None),
+    'oecf'                          : (EXIF_SUB_IFD, 0x8828, None),
+    'shutter_speed'                 : (EXIF_SUB_IFD, 0x9201, None),
+    'aperture_value'                : (EXIF_SUB_IFD, 0x9202, None),
+    'brightness_value'              : (EXIF_SUB_IFD, 0x9203, None),
+    'exposure_bias_value'           : (EXIF_SUB_IFD, 0x9204, None),
+    'max_aperture_value'            : (EXIF_SUB_IFD, 0x9205, None),
+    'subject_distance'              : (EXIF_SUB_IFD, 0x9206, None),
+    'metering_mode'                 : (EXIF_SUB_IFD, 0x9207, None),
+    'light_source'                  : (EXIF_SUB_IFD, 0x9208, None),
+    'flash'                         : (EXIF_SUB_IFD, 0x9209, None),
+    'focal_length'                  : (EXIF_SUB_IFD, 0x920A, None),
+    'subject_area'                  : (EXIF_SUB_IFD, 0x9214, None),
+    'flash_energy'                  : (EXIF_SUB_IFD, 0xA20B, None),
+    'spatial_frequency_response'    : (EXIF_SUB_IFD, 0xA20C, None),
+    'focal_plane_x_resolution'      : (EXIF_SUB_IFD, 0xA20E, None),
+    'focal_plane_y_resolution'      : (EXIF_SUB_IFD, 0xA20F, None),
+    'focal_plane_resolution_unit'   : (EXIF_SUB_IFD, 0xA210, None),
+    'subject_location'              : (EXIF_SUB_IFD, 0xA214, None),
+    'exposure_index'                : (EXIF_SUB_IFD, 0xA215, None),
+    'sensing_method'                : (EXIF_SUB_IFD, 0xA217, None),
+    'file_source'                   : (EXIF_SUB_IFD, 0xA300, None),
+    'scene_type'                    : (EXIF_SUB_IFD, 0xA301, None),
+    'cfa_pattern'                   : (EXIF_SUB_IFD, 0xA302, None),
+    'custom_rendered'               : (EXIF_SUB_IFD, 0xA401, None),
+    'exposure_mode'                 : (EXIF_SUB_IFD, 0xA402, None),
+    'white_balance'                 : (EXIF_SUB_IFD, 0xA403, None),
+    'digital_zoom_ratio'            : (EXIF_SUB_IFD, 0xA404, None),
+    'focal_length_35mm'             : (EXIF_SUB_IFD, 0xA405, None),
+    'scene_capture_type'            : (EXIF_SUB_IFD, 0xA406, None),
+    'gain_control'                  : (EXIF_SUB_IFD, 0xA407, None),
+    'contrast'                      : (EXIF_SUB_IFD, 0xA408, None),
+    'saturation'                    : (EXIF_SUB_IFD, 0xA409, None),
+    'sharpness'                     : (EXIF_SUB_IFD, 0xA40A, None),
+    'device_setting_description'    : (EXIF_SUB_IFD, 0xA40B, None),
+    'subject_distance_range'        : (EXIF_SUB_IFD, 0xA40C, None),
+}
+
+# to_dict() representations of rational values
+RATIONAL_FORMATS = ('fraction', 'float', 'pair')
 
 
 class ExifInfo:
@@ -15,343 +116,337 @@ class ExifInfo:
 
     @property
     def image_width(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0,  tag_id=0x100))
+        return self._field_value('image_width')
 
     @property
     def image_height(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0,  tag_id=0x101))
+        return self._field_value('image_height')
 
     @property
     def bits_per_sample(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x102))
+        return self._field_value('bits_per_sample')
 
     @property
     def compression(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x103))
+        return self._field_value('compression')
 
     @property
     def photometric_interpretation(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x106))
+        return self._field_value('photometric_interpretation')
 
     @property
     def orientation(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x112))
+        return self._field_value('orientation')
 
     @property
     def samples_per_pixel(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x115))
+        return self._field_value('samples_per_pixel')
 
     @property
     def planar_configuration(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x11C))
+        return self._field_value('planar_configuration')
 
     @property
     def ycbcr_sub_sampling(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x212))
+        return self._field_value('ycbcr_sub_sampling')
 
     @property
     def ycbcr_sub_positioning(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x213))
+        return self._field_value('ycbcr_sub_positioning')
 
     @property
     def x_resolution(self) -> Optional[Fraction]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x11A))
+        return self._field_value('x_resolution')
 
     @property
     def y_resolution(self) -> Optional[Fraction]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x11B))
+        return self._field_value('y_resolution')
 
     @property
     def resolution_unit(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x128))
+        return self._field_value('resolution_unit')
 
     @property
     def whitepoint(self) -> Optional[list[Fraction]]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x13E))
+        return self._field_value('whitepoint')
 
     @property
     def primary_chromaticities(self) -> Optional[list[Fraction]]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x13F))
+        return self._field_value('primary_chromaticities')
 
     @property
     def ycbcr_coefficients(self) -> Optional[list[Fraction]]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x211))
+        return self._field_value('ycbcr_coefficients')
 
     @property
     def reference_black_white(self) -> Optional[list[Fraction]]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x214))
+        return self._field_value('reference_black_white')
 
     @property
     def datetime(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x132))
+        return self._field_value('datetime')
 
     @property
     def image_description(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x10E))
+        return self._field_value('image_description')
 
     @property
     def make(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x10F))
+        return self._field_value('make')
 
     @property
     def model(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x110))
+        return self._field_value('model')
 
     @property
     def software(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x131))
+        return self._field_value('software')
 
     @property
     def artist(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x13B))
+        return self._field_value('artist')
 
     @property
     def copyright(self) -> Optional[str]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x8298))
+        return self._field_value('copyright')
 
     @property
     def exif_ifd_offset(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x8769))
+        return self._field_value('exif_ifd_offset')
 
     @property
     def gps_ifd_offset(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0x8825))
+        return self._field_value('gps_ifd_offset')
 
     @property
     def interop_ifd_offset(self) -> Optional[int]:
-        return self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=0, tag_id=0xA005))
+        return self._field_value('interop_ifd_offset')
 
     # Exif Sub IFD fields
 
     @property
     def exif_version(self) -> Optional[str]:
-        version = get_sub_ifd_tag_value(tag=0x9000, ifd=self._exif_sub_ifd())
-        if version is None: return None
-        assert isinstance(version, Iterable)
-        return ''.join(map(chr, version))
+        return self._field_value('exif_version')
 
     @property
     def flashpix_version(self) -> Optional[str]:
-        version = get_sub_ifd_tag_value(tag=0xA000, ifd=self._exif_sub_ifd())
-        if version is None: return None
-        assert isinstance(version, Iterable)
-        return ''.join(map(chr, version))
+        return self._field_value('flashpix_version')
 
     @property
     def color_space(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA001, ifd=self._exif_sub_ifd())
+        return self._field_value('color_space')
 
     @property
     def components_config(self) -> Optional[tuple[int]]:
-        return get_sub_ifd_tag_value(tag=0x9101, ifd=self._exif_sub_ifd())
+        return self._field_value('components_config')
 
     @property
     def compressed_bpp(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9102, ifd=self._exif_sub_ifd())
+        return self._field_value('compressed_bpp')
 
     @property
     def pixel_x_dimension(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA002, ifd=self._exif_sub_ifd())
+        return self._field_value('pixel_x_dimension')
 
     @property
     def pixel_y_dimension(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA003, ifd=self._exif_sub_ifd())
+        return self._field_value('pixel_y_dimension')
 
     @property
     def marker_note(self) -> Optional[ValueType]:
-        return get_sub_ifd_tag_value(tag=0x927C, ifd=self._exif_sub_ifd())
+        return self._field_value('marker_note')
 
     @property
     def user_comment(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x9286, ifd=self._exif_sub_ifd())
+        return self._field_value('user_comment')
 
     @property
     def related_sound_file(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0xA004, ifd=self._exif_sub_ifd())
+        return self._field_value('related_sound_file')
 
     @property
     def datetime_original(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x9001, ifd=self._exif_sub_ifd())
+        return self._field_value('datetime_original')
 
     @property
     def datetime_digitized(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x9004, ifd=self._exif_sub_ifd())
+        return self._field_value('datetime_digitized')
 
     @property
     def sub_sec_time(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x9290, ifd=self._exif_sub_ifd())
+        return self._field_value('sub_sec_time')
 
     @property
     def sub_sec_time_original(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x9291, ifd=self._exif_sub_ifd())
+        return self._field_value('sub_sec_time_original')
 
     @property
     def sub_sec_time_digitized(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x9292, ifd=self._exif_sub_ifd())
+        return self._field_value('sub_sec_time_digitized')
 
     @property
     def image_unique_id(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0xA420, ifd=self._exif_sub_ifd())
+        return self._field_value('image_unique_id')
 
     @property
     def exposure_time(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x829A, ifd=self._exif_sub_ifd())
+        return self._field_value('exposure_time')
 
     @property
     def f_number(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x829D, ifd=self._exif_sub_ifd())
+        return self._field_value('f_number')
 
     @property
     def exposure_program(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0x8822, ifd=self._exif_sub_ifd())
+        return self._field_value('exposure_program')
 
     @property
     def spectral_sensitivity(self) -> Optional[str]:
-        return get_sub_ifd_tag_value(tag=0x8824, ifd=self._exif_sub_ifd())
+        return self._field_value('spectral_sensitivity')
 
     @property
     def iso_speed(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0x8827, ifd=self._exif_sub_ifd())
+        return self._field_value('iso_speed')
 
     @property
     def oecf(self) -> Optional[ValueType]:
-        return get_sub_ifd_tag_value(tag=0x8828, ifd=self._exif_sub_ifd())
+        return self._field_value('oecf')
 
     @property
     def shutter_speed(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9201, ifd=self._exif_sub_ifd())
+        return self._field_value('shutter_speed')
 
     @property
     def aperture_value(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9202, ifd=self._exif_sub_ifd())
+        return self._field_value('aperture_value')
 
     @property
     def brightness_value(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9203, ifd=self._exif_sub_ifd())
+        return self._field_value('brightness_value')
 
     @property
     def exposure_bias_value(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9204, ifd=self._exif_sub_ifd())
+        return self._field_value('exposure_bias_value')
 
     @property
     def max_aperture_value(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9205, ifd=self._exif_sub_ifd())
+        return self._field_value('max_aperture_value')
 
     @property
     def subject_distance(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x9206, ifd=self._exif_sub_ifd())
+        return self._field_value('subject_distance')
 
     @property
     def metering_mode(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0x9207, ifd=self._exif_sub_ifd())
+        return self._field_value('metering_mode')
 
     @property
     def light_source(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0x9208, ifd=self._exif_sub_ifd())
+        return self._field_value('light_source')
 
     @property
     def flash(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0x9209, ifd=self._exif_sub_ifd())
+        return self._field_value('flash')
 
     @property
     def focal_length(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0x920A, ifd=self._exif_sub_ifd())
+        return self._field_value('focal_length')
 
     @property
     def subject_area(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0x9214, ifd=self._exif_sub_ifd())
+        return self._field_value('subject_area')
 
     @property
     def flash_energy(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA20B, ifd=self._exif_sub_ifd())
+        return self._field_value('flash_energy')
 
     @property
     def spatial_frequency_response(self) -> Optional[ValueType]:
-        return get_sub_ifd_tag_value(tag=0xA20C, ifd=self._exif_sub_ifd())
+        return self._field_value('spatial_frequency_response')
 
     @property
     def focal_plane_x_resolution(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA20E, ifd=self._exif_sub_ifd())
+        return self._field_value('focal_plane_x_resolution')
 
     @property
     def focal_plane_y_resolution(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA20F, ifd=self._exif_sub_ifd())
+        return self._field_value('focal_plane_y_resolution')
 
     @property
     def focal_plane_resolution_unit(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA210, ifd=self._exif_sub_ifd())
+        return self._field_value('focal_plane_resolution_unit')
 
     @property
     def subject_location(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA214, ifd=self._exif_sub_ifd())
+        return self._field_value('subject_location')
 
     @property
     def exposure_index(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA215, ifd=self._exif_sub_ifd())
+        return self._field_value('exposure_index')
 
     @property
     def sensing_method(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA217, ifd=self._exif_sub_ifd())
+        return self._field_value('sensing_method')
 
     @property
     def file_source(self) -> Optional[ValueType]:
-        return get_sub_ifd_tag_value(tag=0xA300, ifd=self._exif_sub_ifd())
+        return self._field_value('file_source')
 
     @property
     def scene_type(self) -> Optional[ValueType]:
-        return get_sub_ifd_tag_value(tag=0xA301, ifd=self._exif_sub_ifd())
+        return self._field_value('scene_type')
 
     @property
     def cfa_pattern(self) -> Optional[ValueType]:
-        return get_sub_ifd_tag_value(tag=0xA302, ifd=self._exif_sub_ifd())
+        return self._field_value('cfa_pattern')
 
     @property
     def custom_rendered(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA401, ifd=self._exif_sub_ifd())
+        return self._field_value('custom_rendered')
 
     @property
     def exposure_mode(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA402, ifd=self._exif_sub_ifd())
+        return self._field_value('exposure_mode')
 
     @property
     def white_balance(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA403, ifd=self._exif_sub_ifd())
+        return self._field_value('white_balance')
 
     @property
     def digital_zoom_ratio(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA404, ifd=self._exif_sub_ifd())
+        return self._field_value('digital_zoom_ratio')
 
     @property
     def focal_length_35mm(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA405, ifd=self._exif_sub_ifd())
+        return self._field_value('focal_length_35mm')
 
     @property
     def scene_capture_type(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA406, ifd=self._exif_sub_ifd())
+        return self._field_value('scene_capture_type')
 
     @property
     def gain_control(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA407, ifd=self._exif_sub_ifd())
+        return self._field_value('gain_control')
 
     @property
     def contrast(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA408, ifd=self._exif_sub_ifd())
+        return self._field_value('contrast')
 
     @property
     def saturation(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA409, ifd=self._exif_sub_ifd())
+        return self._field_value('saturation')
 
     @property
     def sharpness(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA40A, ifd=self._exif_sub_ifd())
+        return self._field_value('sharpness')
 
     @property
     def device_setting_description(self) -> Optional[Fraction]:
-        return get_sub_ifd_tag_value(tag=0xA40B, ifd=self._exif_sub_ifd())
+        return self._field_value('device_setting_description')
 
     @property
     def subject_distance_range(self) -> Optional[int]:
-        return get_sub_ifd_tag_value(tag=0xA40C, ifd=self._exif_sub_ifd())
+        return self._field_value('subject_distance_range')
 
 
     @property
@@ -374,44 +469,109 @@ class ExifInfo:
         from jparse.JpegMetaParser import JpegMetaParser
         self._parser: JpegMetaParser = parser
 
-        # _exif_sub_ifd() private fields
-        self.__exif_sub_ifd = None
-        self.__exif_sub_ifd_loaded = False
-
 
     def __str__(self) -> str:
         result = f'Exif Info:\n'
-        for attr in self.__dir__():
-            if attr[0] == '_': continue
-            if attr == 'is_available': continue
+        # lazy rationals are converted directly: 0/0 is nan instead of ZeroDivisionError of Fraction
+        for attr, value in self.to_dict(rationals='float').items():
+            result += f'\t{attr:28s}: {value}\n'
+        return result
 
-            value = getattr(self, attr)
-            if value is None: continue
 
-            if isinstance(value, Fraction):
-                value = float(value)
+    def to_dict(self, fields: Optional[Iterable[str]]=None, rationals: str='fraction') -> Dict[str, Any]:
+        """
+        Plain dict of the available fields (all FIELDS by default), missing tags are omitted.
+        IFD0 and the Exif subIFD are resolved once each and their values are read in one pass (see IfdField.load_values).
+        rationals: 'fraction' - Fraction, 'float' - float, 'pair' - (numerator, denominator) in lowest terms.
+                   Fraction and RawRational values are converted (see JpegMetaParser(rational_mode=...)),
+                   RawRational with a zero denominator gives nan or inf for 'float' and the stored pair for 'pair'.
+        """
+        names = tuple(FIELDS) if fields is None else tuple(fields)
+
+        unknown = [ name for name in names if name not in FIELDS ]
+        if len(unknown) > 0:
+            raise ValueError(f'unknown fields: {unknown}')
+        if rationals not in RATIONAL_FORMATS:
+            raise ValueError(f'rationals must be one of {RATIONAL_FORMATS}, got {rationals!r}')
+
+        result = {}
+        for name, field in self._load_fields(names).items():
+            value = field_value(name, field)
+            if value is not None:
+                result[name] = convert_rationals(value, rationals)
+        return result
 
-            result += f'\t{attr:28s}: {value}\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        All available fields with JSON-friendly values (json.dumps(..., allow_nan=False) accepts them):
+        rationals are floats in any rational_mode, non-finite values (e.g. a zero denominator) are None
+        (the 'fraction' mode raises ZeroDivisionError on decoding of 0/0 itself).
+        """
+        result = {}
+        for name, field in self._load_fields(tuple(FIELDS)).items():
+            value = field_value(name, field)
+            if value is None:
+                continue
+
+            if field.field_type.is_rational:
+                value = rationals_to_float(value)
+            result[name] = finite(value)
         return result
 
 
-    def _exif_sub_ifd(self) -> Union[IFD, None]:
-        if self.__exif_sub_ifd_loaded:
-            return self.__exif_sub_ifd
+    def _load_fields(self, names: Tuple[str, ...]) -> Dict[str, IfdField]:
+        """
+        Available fields by name with loaded values: IFD0 and the Exif subIFD are resolved once each,
+        the values are read in one pass.
+        """
+        ifds = { IFD0: self._ifd0() }
+        if any(FIELDS[name][0] == EXIF_SUB_IFD for name in names):
+            ifds[EXIF_SUB_IFD] = self._exif_sub_ifd()
+
+        fields = {}
+        for name in names:
+            ifd_number, tag_id, _ = FIELDS[name]
+            ifd = ifds[ifd_number]
+            field = None if ifd is None else ifd.get_field(tag=tag_id)
+            if field is not None:
+                fields[name] = field
+
+        load_values(fields.values())
+        return fields
+
 
-        if self.exif_ifd_offset is None:
+    def _field_value(self, name: str) -> Any:
+        """
+        Value of the field by FIELDS[name]: None if the tag is missing.
+        """
+        ifd_number, tag_id, converter = FIELDS[name]
+
+        if ifd_number == IFD0:
+            value = self._parser.get_tag_value(TagPath(app_name='APP1', ifd_number=IFD0, tag_id=tag_id))
+        else:
+            value = get_sub_ifd_tag_value(tag=tag_id, ifd=self._exif_sub_ifd())
+
+        if value is None or converter is None:
+            return value
+
+        return converter(value)
+
+
+    def _ifd0(self) -> Union[IFD, None]:
+        app1 = self._parser.get_segment('APP1')
+        if app1 is None:
             return None
 
-        # note: if self.exif_ifd_offset != None then IFD1 and APP1.tiff_header also exists
-        tiff_header = self._parser['APP1'].tiff_header
-        exif_sub_ifd_offset = self.exif_ifd_offset + tiff_header.offset
+        return app1.ifd(0)
 
-        self._parser.stream.seek(exif_sub_ifd_offset)
-        self.__exif_sub_ifd = IFD.parse(stream=self._parser.stream, tiff_header=tiff_header, index=0x8769)
-        logger.debug(f'Exif subIFD: {self.__exif_sub_ifd}')
 
-        self.__exif_sub_ifd_loaded = True
-        return self.__exif_sub_ifd
+    def _exif_sub_ifd(self) -> Union[IFD, None]:
+        app1 = self._parser.get_segment('APP1')
+        if app1 is None:
+            return None
+
+        return app1.resolve_ifd('Exif')
 
 
 def get_sub_ifd_tag_value(tag: int, ifd: Union[IFD, None]) -> Union[ValueType, None]:
@@ -422,4 +582,64 @@ def get_sub_ifd_tag_value(tag: int, ifd: Union[IFD, None]) -> Union[ValueType, N
     if field is None:
         return None
 
-    return field.value
\ No newline at end of file
+    return field.value
+
+
+def field_value(name: str, field: IfdField) -> Any:
+    """
+    Value of the field converted by FIELDS[name] converter.
+    """
+    value = field.value
+    converter = FIELDS[name][2]
+    if value is None or converter is None:
+        return value
+
+    return converter(value)
+
+
+def rationals_to_float(value: Any) -> Any:
+    """
+    Rational value (or array) of any rational_mode as float: 'tuple' mode pairs are divided, 0/0 gives nan.
+    """
+    if isinstance(value, RawRational):
+        return float(value)
+    if isinstance(value, (Fraction, int, float)):
+        return float(value)
+
+    if isinstance(value, tuple):
+        if len(value) == 2 and type(value[0]) is int and type(value[1]) is int:
+            return divide(*value)  # 'tuple' mode (numerator, denominator)
+        return tuple(map(rationals_to_float, value))
+
+    return value
+
+
+def finite(value: Any) -> Any:
+    """
+    Non-finite floats as None: NaN and Infinity are not valid JSON.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, tuple):
+        return tuple(map(finite, value))
+    return value
+
+
+def convert_rationals(value: Any, rationals: str) -> Any:
+    if isinstance(value, RawRational):
+        if rationals == 'float':
+            return float(value)  # 0/0 and x/0 give nan and inf instead of ZeroDivisionError
+        if rationals == 'pair' and value.denominator == 0:
+            return tuple(value)
+        value = value.fraction
+
+    if isinstance(value, Fraction):
+        if rationals == 'fraction':
+            return value
+        return float(value) if rationals == 'float' else (value.numerator, value.denominator)
+
+    # field values are homogeneous arrays
+    if isinstance(value, tuple) and len(value) > 0 and isinstance(value[0], (Fraction, RawRational)):
+        return tuple(convert_rationals(item, rationals) for item in value)
+
+    return value
@@ -1,26 +1,62 @@
 from __future__ import annotations
 
-from typing import IO, Union
+from time import perf_counter
+from typing import IO, Dict, Optional, Tuple, Union
 from collections.abc import Iterator
 
 from jparse import parser
+from jparse import instrument
 from jparse.log import logger
 from jparse.JpegMarker import JpegMarker
 from jparse.AppSegment import AppSegment
 from jparse.TiffHeader import TiffHeader
 from jparse.IFD import IFD
+from jparse.FieldType import FieldType
+from jparse.ValueCache import FileValueCache
+
+
+# sub-IFD name -> (parent IFD: index or sub-IFD name, pointer tag)
+SUB_IFDS: Dict[str, Tuple[Union[int, str], int]] = {
+    'EXIF'   : (0,      0x8769),
+    'GPS'    : (0,      0x8825),
+    'INTEROP': ('EXIF', 0xA005),
+}
+
+POINTER_TAGS = tuple(sorted(tag for _, tag in SUB_IFDS.values()))
 
 
 class ExifSegment(AppSegment):
     """
     Interface for Exif-like segments: set of IFDs.
+    IFDs are cached by the absolute offset: the main IFDs and sub-IFDs referenced by pointer tags
+    (Exif, GPS, Interop, see SUB_IFDS) are parsed once, even if the pointers are shared or looped.
     """
 
+    __slots__ = ('__tiff_header', '_ifd_class', '_value_cache', '_rational_mode', '__ifds')
+
     @property
     def tiff_header(self) -> Union[TiffHeader, None]:
         self.load()
         return self.__tiff_header
 
+    @property
+    def ifd_class(self) -> type:
+        """
+        IFD representation used for the segment's IFDs: IFD or ColumnarIFD.
+        """
+        return self._ifd_class
+
+    @property
+    def value_cache(self) -> Optional[FileValueCache]:
+        return self._value_cache
+
+    @property
+    def rational_mode(self) -> str:
+        """
+        Representation of Rational/SRational values (see decoder.RATIONAL_MODES).
+        """
+        return self._rational_mode
+
     def __getitem__(self, item: int) -> IFD:
         assert type(item) == int, 'index must be int'
         ifd = self.ifd(index=item)
@@ -40,9 +76,90 @@ class ExifSegment(AppSegment):
         raise NotImplementedError()
 
 
-    def __init__(self, marker: JpegMarker, stream: IO, offset: int, size: int):
+    def sub_ifd(self, ifd: IFD, tag: int) -> Union[IFD, None]:
+        """
+        Sub-IFD referenced by the pointer tag of `ifd` (e.g. 0x8825 - GPS IFD) or None.
+        Only the sub-IFD's header is loaded, the result is cached by the offset.
+        """
+        field = ifd.get_field(tag=tag)
+        if field is None:
+            return None
+
+        if field.field_type != FieldType.Long or field.count != 1:
+            logger.debug(f'-> invalid pointer 0x{tag:04X}: {field.field_type}, count={field.count}')
+            return None
+
+        offset = self.tiff_header.offset + field.value
+        if field.value < TiffHeader.SIZE or offset + 2 > self.offset + self.size:
+            logger.debug(f'-> pointer 0x{tag:04X} is out of the segment: offset=0x{offset:08X}')
+            return None
+
+        sub_ifd = self.__ifds.get(offset)
+        if sub_ifd is not None:
+            return sub_ifd
+
+        with self._lock:
+            logger.debug(f'-> subIFD 0x{tag:04X}, offset=0x{offset:08X}')
+            return self._parse_ifd(offset, index=tag)
+
+
+    def resolve_ifd(self, ifd: Union[int, str]) -> Union[IFD, None]:
+        """
+        IFD by index (see ifd) or sub-IFD by name (see SUB_IFDS): e.g. 0, 'Exif', 'GPS', 'Interop'.
+        The parents are resolved from the cache, e.g. 'Interop' -> IFD0 -> Exif IFD -> Interop IFD.
+        """
+        if isinstance(ifd, int):
+            return self.ifd(ifd)
+
+        sub_ifd = SUB_IFDS.get(ifd.upper())
+        if sub_ifd is None:
+            raise ValueError(f'unknown sub-IFD {ifd!r}, expected one of {tuple(SUB_IFDS)}')
+
+        parent, tag = sub_ifd
+        parent = self.resolve_ifd(parent)
+        if parent is None:
+            return None
+
+        return self.sub_ifd(parent, tag)
+
+
+    def walk_ifds(self) -> Iterator[IFD]:
+        """
+        All IFDs of the segment: the main IFDs and sub-IFDs referenced by pointer tags (see POINTER_TAGS),
+        each IFD once. Looped pointers terminate.
+        """
+        visited = set()
+        pending = list(self)
+
+        while len(pending) > 0:
+            ifd = pending.pop(0)
+            if ifd.offset in visited:
+                continue
+
+            visited.add(ifd.offset)
+            yield ifd
+
+            for tag in POINTER_TAGS:
+                sub_ifd = self.sub_ifd(ifd, tag)
+                if sub_ifd is not None and sub_ifd.offset not in visited:
+                    pending.append(sub_ifd)
+
+
+    def __init__(self, marker: JpegMarker,
+                       stream: IO,
+                       offset: int,
+                       size: int,
+                       ifd_class: Optional[type]=None,
+                       value_cache: Optional[FileValueCache]=None,
+                       rational_mode: str='fraction'):
         super().__init__(marker=marker, stream=stream, offset=offset, size=size)
         self.__tiff_header = None
+        self._ifd_class = IFD if ifd_class is None else ifd_class
+        self._value_cache = value_cache
+        self._rational_mode = rational_mode
+
+        # absolute offset -> IFD (see _parse_ifd)
+        self.__ifds: Dict[int, IFD] = {}
 
 
     def load(self):
@@ -52,23 +169,45 @@ class ExifSegment(AppSegment):
         """
         if self.is_loaded: return
 
-        self._stream.seek(self.offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE)
-        logger.debug(f'[{self.marker.name}] segment loading...')
+        with self._lock:
+            if self.is_loaded: return  # loaded by another thread
+
+            stats = instrument.current.stats
+            start_time = perf_counter() if stats is not None else 0.0
+
+            logger.debug(f'[{self.marker.name}] segment loading...')
 
-        self._name = parser.parse_app_name(self._stream)
-        logger.debug(f'-> name: {self._name}')
+            name_offset = self.offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE
+            self._name = parser.parse_app_name(self._stream, offset=name_offset)
+            logger.debug(f'-> name: {self._name}')
+
+            # skip one more 0x00 byte of exif signature ('Exif\0x00\0x00')
+            padding_offset = name_offset + len(self._name) + 1
+            byte = parser.read_at(self._stream, padding_offset, 1)
+            if byte[0] != 0x00:
+                logger.debug(f'-> 0x00 padding is missing after exif-id -> stop parsing')
+            else:
+                self.__tiff_header = TiffHeader.parse(self._stream, offset=padding_offset + 1)
+                logger.debug(f'-> {self.__tiff_header}')
 
-        # skip one more 0x00 byte of exif signature ('Exif\0x00\0x00')
-        byte = parser.read_bytes_strict(self._stream, 1)
-        if byte[0] != 0x00:
-            logger.debug(f'-> 0x00 padding is missing after exif-id -> stop parsing')
             self._is_loaded = True
-            return
 
-        self.__tiff_header = TiffHeader.parse(self._stream)
-        logger.debug(f'-> {self.__tiff_header}')
+            if stats is not None:
+                stats.add_time('app_header', perf_counter() - start_time)
+
 
-        self._is_loaded = True
+    def _parse_ifd(self, offset: int, index: int) -> IFD:
+        """
+        Parse the IFD header at the absolute `offset` or return the cached IFD of this offset.
+        It's called under the segment's lock.
+        """
+        ifd = self.__ifds.get(offset)
+        if ifd is None:
+            ifd = self._ifd_class.parse(self._stream, tiff_header=self.tiff_header, index=index, offset=offset,
+                                        value_cache=self._value_cache, rational_mode=self._rational_mode)
+            self.__ifds[offset] = ifd
+
+        return ifd
 
 
 class ExifIterator(Iterator):
@@ -63,4 +63,7 @@ TYPE_TO_CHR_MAPPING = {
     FieldType.Float    : 'f',
     FieldType.Double   : 'd',
     FieldType.Unknown  : ''
-}
\ No newline at end of file
+}
+
+# type id -> FieldType, ids out of the range are mapped to FieldType.Unknown by the callers
+ID_TO_TYPE_MAPPING: dict[int, FieldType] = { field_type.value: field_type for field_type in FieldType }
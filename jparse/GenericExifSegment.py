@@ -1,9 +1,10 @@
-from typing import IO, Union
+from typing import IO, Optional, Union
 
 from jparse.log import logger
 from jparse.JpegMarker import JpegMarker
 from jparse.ExifSegment import ExifSegment
 from jparse.IFD import IFD
+from jparse.ValueCache import FileValueCache
 
 
 class GenericExifSegment(ExifSegment):
@@ -13,8 +14,17 @@ class GenericExifSegment(ExifSegment):
     Might fail to read IFD if segment contains data except IFDs (e.g. APP1 contains image).
     """
 
-    def __init__(self, marker: JpegMarker, stream: IO, offset: int, size: int):
-        super().__init__(marker=marker, stream=stream, offset=offset, size=size)
+    __slots__ = ('__ifd', '__next_ifd_offset', '__end_of_segment')
+
+    def __init__(self, marker: JpegMarker,
+                       stream: IO,
+                       offset: int,
+                       size: int,
+                       ifd_class: Optional[type]=None,
+                       value_cache: Optional[FileValueCache]=None,
+                       rational_mode: str='fraction'):
+        super().__init__(marker=marker, stream=stream, offset=offset, size=size, ifd_class=ifd_class, value_cache=value_cache,
+                         rational_mode=rational_mode)
 
         # cache for lazy IFD loading
         self.__ifd = []
@@ -34,16 +44,21 @@ class GenericExifSegment(ExifSegment):
             # return IFD from the cache
             return self.__ifd[index]
 
-        # load IFD one by one till index reached or EOF
-        index -= len(self.__ifd) - 1
-        ifd_next = None
-        while index > 0:
-            ifd_next = self._load_next_ifd()
-            if ifd_next is None:
-                return None # end of the segment
-            index -= 1
+        with self._lock:
+            if len(self.__ifd) > index:
+                # loaded by another thread
+                return self.__ifd[index]
+
+            # load IFD one by one till index reached or EOF
+            index -= len(self.__ifd) - 1
+            ifd_next = None
+            while index > 0:
+                ifd_next = self._load_next_ifd()
+                if ifd_next is None:
+                    return None # end of the segment
+                index -= 1
 
-        return ifd_next
+            return ifd_next
 
 
     def _load_next_ifd(self) -> Union[IFD, None]:
@@ -62,11 +77,16 @@ class GenericExifSegment(ExifSegment):
 
         ifd_index = len(self.__ifd)
 
-        self._stream.seek(self.__next_ifd_offset)
+        if any(ifd.offset == self.__next_ifd_offset for ifd in self.__ifd):
+            # the linked list is looped
+            logger.debug(f'-> IFD #{ifd_index}, offset=0x{self.__next_ifd_offset:08X} is already loaded -> stop parsing')
+            self.__end_of_segment = True
+            return None
+
         logger.debug(f'-> IFD #{ifd_index}, offset=0x{self.__next_ifd_offset:08X}')
 
         # parse IFD header (without filed value loading)
-        ifd_i = IFD.parse(self._stream, tiff_header=self.tiff_header, index=ifd_index)
+        ifd_i = self._parse_ifd(self.__next_ifd_offset, index=ifd_index)
 
         # update offset for the next IFD
         if ifd_i.next_ifd_offset > 0:
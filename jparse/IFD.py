@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from io import SEEK_CUR
-from typing import IO, Union
+import threading
+from typing import IO, Union, Optional
 from collections.abc import Iterator
+from time import perf_counter
 
 from jparse import parser
-from jparse import endianess
+from jparse import decoder
+from jparse import instrument
 from jparse.TiffHeader import TiffHeader
 from jparse.IfdField import IfdField
+from jparse.ValueCache import FileValueCache
 
 
 class IFD:
@@ -15,6 +18,10 @@ class IFD:
     IFD - Image File Directory.
     """
 
+    __slots__ = ('_stream', '_tiff_header', '__next_ifd_offset', '__offset', '__index', '__field_count',
+                 '__fields', '__fields_array', '__next_filed_offset', '__size', '_value_cache', '_rational_mode',
+                 '__lock')
+
     @property
     def offset(self) -> int:
         """
@@ -59,9 +66,13 @@ class IFD:
                        index : int,
                        next_ifd_offset: int,
                        filed_count: int,
-                       offset: int):
+                       offset: int,
+                       value_cache: Optional[FileValueCache]=None,
+                       rational_mode: str='fraction'):
         self._stream = stream
         self._tiff_header = tiff_header
+        self._value_cache = value_cache
+        self._rational_mode = rational_mode
 
         self.__next_ifd_offset = next_ifd_offset
         self.__offset = offset
@@ -77,6 +88,9 @@ class IFD:
         # to get full IFD size all fields must be loaded
         self.__size = 2 + 4  # sizeof(field_count) + sizeof(next_ifd_offset)
 
+        # lazy loading of the fields by threads which share the IFD
+        self.__lock = threading.Lock()
+
 
     def __repr__(self) -> str:
         return (f'{self.__class__.__name__}(index={self.index}, '
@@ -89,12 +103,43 @@ class IFD:
         Estimate IFD size. All fields will be loaded to do so.
         """
         # load all fields to estimate the full size of IFD
-        while len(self.__fields) != self.__field_count:
-            self._load_next_filed()
+        self.load_all()
 
         return self.__size
 
 
+    def load_all(self):
+        """
+        Load headers of all remaining fields at once (without values):
+        one read for the whole directory and one iter_unpack() call to decode it.
+        """
+        if len(self.__fields_array) == self.__field_count:
+            return
+
+        with self.__lock:
+            remaining_count = self.__field_count - len(self.__fields_array)
+            if remaining_count == 0:
+                return  # loaded by another thread
+
+            stats = instrument.current.stats
+            start_time = perf_counter() if stats is not None else 0.0
+
+            data = parser.read_at(self._stream, self.__next_filed_offset, remaining_count*IfdField.HEADER_SIZE)
+
+            for header in decoder.FIELD_HEADER[self._tiff_header.byte_order].iter_unpack(data):
+                ifd_field = IfdField.from_header(header,
+                                                 stream=self._stream,
+                                                 tiff_header=self._tiff_header,
+                                                 offset=self.__next_filed_offset,
+                                                 value_cache=self._value_cache,
+                                                 rational_mode=self._rational_mode)
+                self._append_field(ifd_field)
+
+            if stats is not None:
+                stats.count('fields_parsed', remaining_count)
+                stats.add_time('ifd_decode', perf_counter() - start_time)
+
+
     def get_field(self, tag: Union[int, None]=None, index: Union[int, None]=None) -> Union[IfdField, None]:
         if tag is not None:
             assert index is None, 'only tag or index can be used at the same time'
@@ -105,24 +150,50 @@ class IFD:
 
 
     @classmethod
-    def parse(cls, stream: IO, tiff_header: TiffHeader, index: int) -> 'IFD':
-        ifd_offset = stream.tell()
+    def parse(cls, stream: IO,
+                   tiff_header: TiffHeader,
+                   index: int,
+                   offset: Optional[int]=None,
+                   eager: bool=False,
+                   value_cache: Optional[FileValueCache]=None,
+                   rational_mode: str='fraction') -> 'IFD':
+        """
+        Parse IFD header located at `offset` (the current stream position by default).
+        eager: load all field headers at once (see load_all), otherwise fields are loaded lazily one by one.
+        value_cache: cache of the fields' decoded values (see ValueCache).
+        rational_mode: representation of Rational/SRational values (see decoder.RATIONAL_MODES).
+        """
+        stats = instrument.current.stats
+        start_time = perf_counter() if stats is not None else 0.0
+
+        ifd_offset = stream.tell() if offset is None else offset
 
-        field_count = parser.read_bytes_strict(stream, count=2)
-        field_count = endianess.convert(field_count, byte_order=tiff_header.byte_order)
+        field_count = parser.read_at(stream, ifd_offset, count=2)
+        field_count, = decoder.UINT16[tiff_header.byte_order].unpack(field_count)
 
         # skip field headers, it will be loaded on request (lazy loading)
-        stream.seek(field_count*IfdField.HEADER_SIZE, SEEK_CUR)
+        next_ifd_offset = ifd_offset + 2 + field_count*IfdField.HEADER_SIZE
 
-        next_ifd_offset = parser.read_bytes_strict(stream, 4)
-        next_ifd_offset = endianess.convert(next_ifd_offset, byte_order=tiff_header.byte_order)
+        next_ifd_offset = parser.read_at(stream, next_ifd_offset, count=4)
+        next_ifd_offset, = decoder.UINT32[tiff_header.byte_order].unpack(next_ifd_offset)
 
-        return IFD(stream=stream,
-                   tiff_header=tiff_header,
-                   offset=ifd_offset,
-                   index=index,
-                   filed_count=field_count,
-                   next_ifd_offset=next_ifd_offset)
+        ifd = IFD(stream=stream,
+                  tiff_header=tiff_header,
+                  offset=ifd_offset,
+                  index=index,
+                  filed_count=field_count,
+                  next_ifd_offset=next_ifd_offset,
+                  value_cache=value_cache,
+                  rational_mode=rational_mode)
+
+        if stats is not None:
+            # eager loading of the fields is measured by load_all()
+            stats.add_time('ifd_decode', perf_counter() - start_time)
+
+        if eager:
+            ifd.load_all()
+
+        return ifd
 
 
     def _get_field_by_tag(self, tag: int) -> Union[IfdField, None]:
@@ -131,49 +202,72 @@ class IFD:
         if ifd_filed is not None:
             return ifd_filed
 
-        # try to load more fields
-        while True:
-            ifd_filed = self._load_next_filed()
-            if ifd_filed is None:
-                # no more fields to load
-                return None
-
-            if ifd_filed.tag_id == tag:
+        with self.__lock:
+            ifd_filed = self.__fields.get(tag, None)
+            if ifd_filed is not None:
+                # loaded by another thread
                 return ifd_filed
 
+            # try to load more fields
+            while True:
+                ifd_filed = self._load_next_filed()
+                if ifd_filed is None:
+                    # no more fields to load
+                    return None
+
+                if ifd_filed.tag_id == tag:
+                    return ifd_filed
+
     def _get_field_by_index(self, index: int) -> Union[IfdField, None]:
         if len(self.__fields_array) > index:
             # field = iterate_to_index(self.__fields.values(), index=index)
             return self.__fields_array[index]
 
-        index -= len(self.__fields) - 1
-        field = None
-        while index > 0:
-            field = self._load_next_filed()
-            if field is None:
-                return None
-            index -= 1
+        with self.__lock:
+            if len(self.__fields_array) > index:
+                # loaded by another thread
+                return self.__fields_array[index]
 
-        return field
+            index -= len(self.__fields_array) - 1
+            field = None
+            while index > 0:
+                field = self._load_next_filed()
+                if field is None:
+                    return None
+                index -= 1
+
+            return field
 
 
     def _load_next_filed(self) -> Union[IfdField, None]:
+        # note: it's called under the IFD's lock
         if len(self.__fields_array) == self.__field_count:
             # all fields already loaded
             return None
 
-        self._stream.seek(self.__next_filed_offset)
+        stats = instrument.current.stats
+        start_time = perf_counter() if stats is not None else 0.0
 
-        ifd_field = IfdField.parse(self._stream, tiff_header=self._tiff_header)
+        ifd_field = IfdField.parse(self._stream, tiff_header=self._tiff_header, offset=self.__next_filed_offset,
+                                   value_cache=self._value_cache, rational_mode=self._rational_mode)
+        self._append_field(ifd_field)
+
+        if stats is not None:
+            stats.count('fields_parsed')
+            stats.add_time('ifd_decode', perf_counter() - start_time)
+
+        return ifd_field
+
+
+    def _append_field(self, ifd_field: IfdField):
         ifd_field.log()
 
         self.__size += ifd_field.size
-        self.__fields[ifd_field.tag_id] = ifd_field
+        # the first of duplicated tags is found by tag, as by the lazy lookup (see _get_field_by_tag)
+        self.__fields.setdefault(ifd_field.tag_id, ifd_field)
         self.__fields_array.append(ifd_field)
         self.__next_filed_offset += IfdField.HEADER_SIZE
 
-        return ifd_field
-
 
 class IfdIterator(Iterator):
 
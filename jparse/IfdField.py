@@ -1,21 +1,29 @@
-import io
 from numbers import Number
-from typing import Tuple, IO, Union
+from time import perf_counter
+from typing import Tuple, IO, Iterable, Union, Optional
 
 from jparse import parser
+from jparse import instrument
 from jparse.log import logger, logging
-from jparse import endianess
+from jparse import decoder
+from jparse import arrays
 from jparse.endianess import ByteOrder
 from jparse.TiffHeader import TiffHeader
-from jparse.FieldType import FieldType
+from jparse.ValueCache import FileValueCache, MISSING
+from jparse.FieldType import FieldType, ID_TO_TYPE_MAPPING, TYPE_TO_SIZE_MAPPING
 
 
 ValueType = Union[Number, str, Tuple[Number, ...]]
 
+VALUE_READ_GAP: int = 256  # bytes, see load_values()
+
 
 class IfdField:
     HEADER_SIZE = 12
 
+    __slots__ = ('_is_loaded', '_tag_id', '_field_type', '_count', '_value_offset',
+                 '_stream', '_byte_order', '_value', '_size', '_offset', '_value_cache', '_rational_mode')
+
     @property
     def offset(self) -> int:
         return self._offset
@@ -45,6 +53,21 @@ class IfdField:
     def value_offset(self) -> int:
         return self._value_offset
 
+    @property
+    def raw_value(self) -> bytes:
+        """
+        Undecoded value data (e.g. MakerNote content).
+        It's a zero-copy memoryview if the file is memory-mapped (see JpegMetaParser.from_path).
+        """
+        return parser.read_at(self._stream, self.value_offset, self.value_size)
+
+    @property
+    def value_size(self) -> int:
+        """
+        Size of the value data in bytes.
+        """
+        return self.count*self.field_type.byte_count
+
     @property
     def is_loaded(self) -> bool:
         return self._is_loaded
@@ -57,7 +80,16 @@ class IfdField:
                        byte_order: ByteOrder,
                        value_offset: int,
                        size      : int,
-                       offset    : int):
+                       offset    : int,
+                       value_cache: Optional[FileValueCache]=None,
+                       rational_mode: str='fraction',
+                       inline_data: Optional[bytes]=None):
+        """
+        value_cache: decoded values are shared through the cache by parsers of the same file (see ValueCache).
+        rational_mode: representation of Rational/SRational values (see decoder.RATIONAL_MODES).
+        inline_data: value data of a field with the value inside the header (up to 4 bytes),
+                     it's decoded at once, so the value is never read again.
+        """
         self._is_loaded = False
         self._tag_id = tag_id
         self._field_type = field_type
@@ -68,6 +100,20 @@ class IfdField:
         self._value = None
         self._size = size
         self._offset = offset
+        self._value_cache = value_cache
+        self._rational_mode = rational_mode
+
+        if inline_data is not None and field_type in decoder.VALUE_TYPES:
+            try:
+                self._value = parse_value(data=inline_data, count=count, field_type=field_type, byte_order=byte_order,
+                                          rational_mode=rational_mode)
+                self._is_loaded = True
+
+                stats = instrument.current.stats
+                if stats is not None:
+                    stats.count('values_decoded')
+            except UnicodeDecodeError:
+                pass  # reported on the value access as for other fields
 
 
     def log(self, tabs: int=2):
@@ -92,42 +138,96 @@ class IfdField:
                 f'size={self.size:<3d}, '
                 f'value_offset=0x{self.value_offset:08X}')
 
-    def load(self):
+    def load(self, data: Optional[bytes]=None):
+        """
+        data: the value data read in advance (see load_values), otherwise it's read from the stream.
+        """
         if self.is_loaded: return
 
-        self._stream.seek(self.value_offset)
-        data = parser.read_bytes_strict(self._stream, self.count*self.field_type.byte_count)
+        if self._load_from_cache(): return
+
+        stats = instrument.current.stats
+        start_time = perf_counter() if stats is not None else 0.0
 
-        self._value = parse_value(data=data, count=self.count, field_type=self.field_type, byte_order=self._byte_order)
+        if data is None:
+            data = self.raw_value
+
+        self._value = parse_value(data=data, count=self.count, field_type=self.field_type, byte_order=self._byte_order,
+                                  rational_mode=self._rational_mode)
         self._is_loaded = True
 
+        if stats is not None:
+            stats.count('values_decoded')
+            stats.add_time('value_decode', perf_counter() - start_time)
 
-    @classmethod
-    def parse(cls, stream: IO, tiff_header: TiffHeader) -> 'IfdField':
-        field_offset = stream.tell()
+        if self._value_cache is not None:
+            self._value_cache.put(self._value, self._offset)
 
-        tag_id = parser.read_bytes_strict(stream, 2)
-        tag_id = endianess.convert(tag_id, byte_order=tiff_header.byte_order)
+    def as_array(self, rationals: str='pair'):
+        """
+        The value as numpy.ndarray decoded at once with numpy.frombuffer() (requires numpy, see jparse.arrays).
+        Large numeric arrays (e.g. StripOffsets, tone curves) are decoded without Python objects per element.
+        rationals: 'pair' - (N, 2) integer array of (numerator, denominator), 'float' - float64 array.
+        Integer arrays share memory with raw_value: copy them to keep after close() of a memory-mapped file.
+        """
+        return arrays.unpack_ndarray(self.raw_value, count=self.count, field_type=self.field_type,
+                                     byte_order=self._byte_order, rationals=rationals)
 
-        type_id = parser.read_bytes_strict(stream, 2)
-        type_id = endianess.convert(type_id, byte_order=tiff_header.byte_order)
+    def _load_from_cache(self) -> bool:
+        if self._value_cache is None:
+            return False
 
-        if FieldType.is_unknown(type_id):
-            type_id = FieldType.Unknown
-        else:
-            type_id = FieldType(type_id)
+        value = self._value_cache.get(self._offset)
+        if value is MISSING:
+            return False
 
-        count = parser.read_bytes_strict(stream, 4)
-        count = endianess.convert(count, byte_order=tiff_header.byte_order)
+        self._value = value
+        self._is_loaded = True
+        return True
+
+
+    @classmethod
+    def parse(cls, stream: IO,
+                   tiff_header: TiffHeader,
+                   offset: Optional[int]=None,
+                   value_cache: Optional[FileValueCache]=None,
+                   rational_mode: str='fraction') -> 'IfdField':
+        """
+        Parse field header located at `offset` (the current stream position by default).
+        The whole 12-bytes header is read at once.
+        """
+        field_offset = stream.tell() if offset is None else offset
+
+        data = parser.read_at(stream, field_offset, IfdField.HEADER_SIZE)
+        header = decoder.FIELD_HEADER[tiff_header.byte_order].unpack(data)
+
+        return IfdField.from_header(header, stream=stream, tiff_header=tiff_header, offset=field_offset, value_cache=value_cache,
+                                    rational_mode=rational_mode)
 
-        field_size = count * type_id.byte_count
+
+    @classmethod
+    def from_header(cls, header: Tuple[int, int, int, int],
+                         stream: IO,
+                         tiff_header: TiffHeader,
+                         offset: int,
+                         value_cache: Optional[FileValueCache]=None,
+                         rational_mode: str='fraction') -> 'IfdField':
+        """
+        Create field from the decoded header: (tag_id, type_id, count, value or value offset).
+        """
+        tag_id, type_id, count, value_offset = header
+
+        # note: dict lookup is much faster than FieldType(type_id), this method is hot for large IFDs
+        type_id = ID_TO_TYPE_MAPPING.get(type_id, FieldType.Unknown)
+
+        field_size = count * TYPE_TO_SIZE_MAPPING[type_id]
         if field_size <= 4:
-            value_offset = field_offset + 8
-            stream.seek(4, io.SEEK_CUR) # skip value data
+            # the value is the last 4 bytes of the header: the data is restored from the decoded word
+            inline_data = decoder.UINT32[tiff_header.byte_order].pack(value_offset)
+            value_offset = offset + 8
             field_size = IfdField.HEADER_SIZE # no extra data outside the field structure
         else:
-            value_offset = parser.read_bytes_strict(stream, 4)
-            value_offset = endianess.convert(value_offset, byte_order=tiff_header.byte_order)
+            inline_data = None
             value_offset += tiff_header.offset
             field_size = parser.align4(field_size) + IfdField.HEADER_SIZE
 
@@ -138,46 +238,75 @@ class IfdField:
                         byte_order=tiff_header.byte_order,
                         value_offset=value_offset,
                         size=field_size,
-                        offset=field_offset)
+                        offset=offset,
+                        value_cache=value_cache,
+                        rational_mode=rational_mode,
+                        inline_data=inline_data)
 
 
 def parse_value(data : bytes,
                 count: int,
                 field_type: FieldType,
-                byte_order: ByteOrder) -> ValueType:
+                byte_order: ByteOrder,
+                rational_mode: str='fraction') -> ValueType:
     if field_type == FieldType.Unknown:
         raise NotImplementedError('can not parse unknown value type')
 
-    offset = 0
-    value = []
-    for i in range(count):
-        value_data = data[ offset + field_type.byte_count*i : offset + field_type.byte_count*(i+1) ]
-        value_data = unpack_value(value_data, field_type=field_type, byte_order=byte_order)
-        value.append(value_data)
+    if field_type == FieldType.ASCII:
+        return decoder.decode_ascii(data, count=count)
 
-    if field_type == field_type.ASCII:
-        return ''.join(value)
+    # the whole array is decoded at once
+    value = decoder.unpack_array(data, count=count, field_type=field_type, byte_order=byte_order, rational_mode=rational_mode)
 
     if len(value) == 1:
         return value[0]
 
-    return tuple(value)
+    return value
 
 
 def unpack_value(data: bytes,
                  field_type: FieldType,
-                 byte_order: ByteOrder) -> Union[Number, chr]:
+                 byte_order: ByteOrder,
+                 rational_mode: str='fraction') -> Union[Number, chr]:
     assert len(data) == field_type.byte_count, 'invalid dat size'
 
-    if field_type.is_rational:
-        from fractions import Fraction
-        numerator = endianess.convert(data[:4], byte_order=byte_order, data_type=field_type.type_chr)
-        denominator = endianess.convert(data[4:], byte_order=byte_order, data_type=field_type.type_chr)
-        return Fraction(numerator=numerator, denominator=denominator)
-
-    value = endianess.convert(data, byte_order=byte_order, data_type=field_type.type_chr)
-
     if field_type == FieldType.ASCII:
-        value = value.decode('ascii') if value[0] != 0 else ''
-
-    return value
\ No newline at end of file
+        return decoder.decode_ascii(data, count=1)
+
+    return decoder.unpack_element(data, field_type=field_type, byte_order=byte_order, rational_mode=rational_mode)
+
+
+def load_values(fields: Iterable[IfdField], max_gap: int=VALUE_READ_GAP):
+    """
+    Load values of many fields with a few reads: the value reads are sorted by offset
+    and reads separated by up to `max_gap` bytes are merged into one.
+    """
+    pending = {}  # stream id -> fields
+    for field in fields:
+        if field.is_loaded or field._load_from_cache():
+            continue
+        if field.field_type == FieldType.Unknown:
+            field.load()  # it can't be decoded: reported by parse_value() as for a single field
+            continue
+        pending.setdefault(id(field._stream), []).append(field)
+
+    for stream_fields in pending.values():
+        stream_fields.sort(key=lambda field: field.value_offset)
+        stream = stream_fields[0]._stream
+
+        group_start = 0
+        while group_start < len(stream_fields):
+            start = stream_fields[group_start].value_offset
+            end = start + stream_fields[group_start].value_size
+
+            group_end = group_start + 1
+            while group_end < len(stream_fields) and stream_fields[group_end].value_offset <= end + max_gap:
+                end = max(end, stream_fields[group_end].value_offset + stream_fields[group_end].value_size)
+                group_end += 1
+
+            data = parser.read_at(stream, start, end - start)
+            for field in stream_fields[group_start:group_end]:
+                value_start = field.value_offset - start
+                field.load(data=data[value_start:value_start + field.value_size])
+
+            group_start = group_end
\ No newline at end of file
@@ -6,6 +6,8 @@ class JpegMarker:
     LENGTH_SIZE: int = 2  # bytes
     START: int = 0xFF
 
+    __slots__ = ('_signature', '_name', '_info', '_is_mask')
+
     @property
     def signature(self) -> int:
         return self._signature
@@ -82,22 +84,11 @@ class JpegMarker:
         if (signature >> 8) != JpegMarker.START:
             raise RuntimeError(f'invalid signature: 0x{signature:04X}')
 
+        # known markers including APP0-APP15 and RST0-RST7 are shared instances
         marker = SIGNATURE_TO_MARKER_MAPPING.get(signature)
         if marker is not None:
             return marker
 
-        # check for custom APP0-APP15
-        if APPn.check_mask(signature):
-            app_marker = APPn.copy()
-            app_marker.set_index(index=APPn.extract_index(signature))
-            return app_marker
-
-        # check for RST0-RST7
-        if RSTn.check_mask(signature):
-            rst_marker = RSTn.copy()
-            rst_marker.set_index(index=RSTn.extract_index(signature))
-            return rst_marker
-
         return JpegMarker(signature=signature,
                           name=f'UNK[0x{signature:04X}]',
                           info='Unknown')
@@ -133,4 +124,29 @@ SIGNATURE_TO_MARKER_MAPPING = {
     APP0.signature: APP0,
     APP1.signature: APP1,
     APP2.signature: APP2,
-}
\ No newline at end of file
+}
+
+
+def create_indexed_markers(mask: JpegMarker) -> tuple[JpegMarker, ...]:
+    """
+    All markers of the mask (e.g. APP0-APP15), predefined markers (e.g. APP1) are reused.
+    """
+    markers = []
+
+    for index in range((mask.signature & 0xF) + 1):
+        marker = SIGNATURE_TO_MARKER_MAPPING.get((mask.signature & 0xFFF0) + index)
+        if marker is None:
+            marker = mask.copy()
+            marker.set_index(index=index)
+        markers.append(marker)
+
+    return tuple(markers)
+
+
+# interned markers: JpegMarker.detect() returns shared instances instead of copies
+APP_MARKERS = create_indexed_markers(APPn)
+RST_MARKERS = create_indexed_markers(RSTn)
+
+for _marker in APP_MARKERS + RST_MARKERS:
+    SIGNATURE_TO_MARKER_MAPPING[_marker.signature] = _marker
+del _marker
@@ -1,16 +1,26 @@
-from io import SEEK_CUR
-from typing import IO, List, Union, OrderedDict
+import os
+from io import SEEK_CUR, TextIOBase
+from mmap import mmap as MemoryMap, ACCESS_READ
+from time import perf_counter
+from typing import IO, Iterable, List, Optional, Union, OrderedDict
 
 from jparse import parser
 from jparse import endianess
+from jparse import decoder
+from jparse import instrument
 from jparse.log import logger
+from jparse.BufferStream import BufferStream
+from jparse.PageCacheStream import PageCacheStream
+from jparse.PositionalStream import PositionalStream
 from jparse.JpegMarker import JpegMarker, SOI, EOI, SOS, APPn
 from jparse.JpegSegment import JpegSegment
 from jparse.AppSegment import AppSegment
 from jparse.ExifSegment import ExifSegment
-from jparse.IfdField import ValueType
+from jparse.IfdField import ValueType, load_values
 from jparse.IFD import IFD
+from jparse.ColumnarIFD import ColumnarIFD
 from jparse.TagPath import TagPath
+from jparse.ValueCache import ValueCache, FileValueCache, MISSING, NOT_FOUND, file_identity
 
 from jparse.ExifInfo import ExifInfo
 
@@ -20,6 +30,7 @@ class JpegMetaParser:
 
     @property
     def exif_info(self) -> ExifInfo:
+        self._check_open()
         return self._exif_info
 
     @property
@@ -33,8 +44,18 @@ class JpegMetaParser:
     def segments(self) -> tuple[str, ...]:
         return tuple(self._segments.keys())
 
+    @property
+    def skipped_segments(self) -> tuple[JpegSegment, ...]:
+        """
+        APP segments which are listed in the structure but not parsed: the payload exceeds max_segment_size.
+        """
+        return tuple(segment for segment in self._structure
+                     if APPn.check_mask(segment.marker.signature) and not isinstance(segment, AppSegment))
+
     @property
     def image_data_offset(self) -> int:
+        if self._sos is None:
+            raise RuntimeError('SOS is not scanned: the scan was limited by `only` or `max_prefix`')
         return self._sos.offset + self._sos.size
 
     @property
@@ -43,31 +64,156 @@ class JpegMetaParser:
             raise RuntimeError('use JpegMetaParser(estimate_image_size=True, ...)')
         return self._eoi.offset - self._sos.offset - self._sos.size
 
+    @property
+    def prefix_size(self) -> int:
+        """
+        Minimal number of bytes from the file start needed to parse the same segments:
+        the end of the last wanted segment (see `only`) or of the last scanned segment.
+        Image data isn't included even if estimate_image_size=True.
+        """
+        segments = [ segment for segment in self._structure if segment.marker != EOI ]
+        if self._only is not None:
+            segments = [ segment for segment in segments if segment.marker == SOI or segment.marker.name.upper() in self._only ]
+        return max(segment.offset + segment.size for segment in segments)
+
     @property
     def stream(self) -> IO:
         return self._stream
 
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def structure(self) -> tuple[JpegSegment, ...]:
+        """
+        All scanned segments in the file order: SOI, APP*, DQT, ..., SOS (and EOI if estimate_image_size=True).
+        """
+        self._check_open()
+        return tuple(self._structure)
+
     def __len__(self) -> int:
         return len(self.segments)
 
+    def __enter__(self) -> 'JpegMetaParser':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def __getitem__(self, item: str) ->  Union[ExifSegment, AppSegment]:
         assert type(item) == str, 'item must be a str: e.g parser["APP0"]'
+        self._check_open()
         return self._segments[item.upper()]
 
     def __iter__(self):
+        self._check_open()
         return iter(self._segments.values())
 
     def get_segment(self, marker_name: str) -> Union[ExifSegment, AppSegment, None]:
+        self._check_open()
         return self._segments.get(marker_name.upper(), None)
 
 
-    def __init__(self, stream: IO, estimate_image_size: bool=False):
-        if 'r' not in stream.mode or 'b' not in stream.mode:
+    def __init__(self, stream: IO,
+                       estimate_image_size: bool=False,
+                       buffered: bool=False,
+                       eoi_from_end: bool=False,
+                       only: Optional[Iterable[str]]=None,
+                       max_prefix: Optional[int]=None,
+                       columnar: bool=False,
+                       value_cache: Union[ValueCache, FileValueCache, None]=None,
+                       rational_mode: str='fraction',
+                       streaming: bool=False,
+                       max_segment_size: Optional[int]=None,
+                       page_cache: bool=False,
+                       thread_safe: bool=False):
+        """
+        estimate_image_size: scan the image data for EOI to make image_data_size available.
+        buffered: read each APP segment into memory at once during the structure scan.
+                  Segments, IFDs and fields are parsed from these buffers without further stream I/O.
+        eoi_from_end: look for EOI at the end of the file first (see parser.scan_for_eoi).
+        only: names of the wanted segments, e.g. {'APP1'}: other APP segments are skipped
+              and the scan stops as soon as all of them are found (see prefix_size).
+        max_prefix: byte budget, nothing is read beyond this offset (e.g. partially downloaded file).
+                    Segments which don't fit are not parsed.
+        columnar: keep IFDs as compact ColumnarIFD (array columns, O(log n) tag lookup)
+                  instead of IFD with cached IfdField objects, e.g. for MakerNote IFDs with hundreds of fields.
+        value_cache: decoded values shared by parsers of the same file (see ValueCache).
+                     It's used only if the stream is a file, so the file identity is known.
+        rational_mode: representation of Rational/SRational values:
+                       'fraction' - Fraction (default), 'float' - float, 'tuple' - (numerator, denominator),
+                       'lazy' - RawRational: (numerator, denominator) tuple converted to Fraction on request.
+        streaming: the stream is a forward-only byte source (pipe, socket, HTTP response, archive member),
+                   it's read once without seek() up to SOS, only APP segments are kept in memory (see scan_jpeg_stream).
+                   estimate_image_size and eoi_from_end are not supported, value_cache is not used.
+        max_segment_size: streaming mode, APP segments with larger payload are skipped without buffering,
+                          they are listed in the structure without payload (see skipped_segments).
+        page_cache: read the stream through PageCacheStream: repeated and overlapping reads are served
+                    from an LRU cache of 4 KB pages, `stream` property returns the wrapper with read statistics.
+        thread_safe: the parser can be shared by threads: the file is read with positional reads (see PositionalStream)
+                     and lazy loading of segments and IFDs is guarded by their locks.
+                     Buffered, streaming, memory-mapped (see from_path) and page_cache parsers are thread-safe anyway.
+                     Other parsers must not be shared: the seek() + read() pairs on the shared file position
+                     aren't atomic and a thread can read the data at the position set by another thread.
+        """
+        if streaming:
+            if isinstance(stream, TextIOBase):
+                raise RuntimeError('binary stream is required')
+            if estimate_image_size or eoi_from_end:
+                raise RuntimeError('estimate_image_size and eoi_from_end are not supported in streaming mode')
+            if page_cache:
+                raise RuntimeError('page_cache is not supported in streaming mode')
+        elif 'r' not in stream.mode or 'b' not in stream.mode:
             raise RuntimeError('IO mode should be "rb"')
 
-        self._stream = stream
+        if page_cache and not isinstance(stream, PageCacheStream):
+            stream = PageCacheStream(stream)
+        elif thread_safe and not streaming and getattr(stream, 'read_at', None) is None:
+            stream = PositionalStream(stream)
+
+        if rational_mode not in decoder.RATIONAL_MODES:
+            raise ValueError(f'rational_mode must be one of {decoder.RATIONAL_MODES}, got {rational_mode!r}')
+
+        stats = instrument.current.stats
+        if stats is not None:
+            stats.count('parsers')
 
-        structure = scan_jpeg_structure(stream, include_eoi=estimate_image_size)
+        self._stream = stream
+        self._only = None if only is None else frozenset(name.upper() for name in only)
+
+        if isinstance(value_cache, ValueCache):
+            # a stream has no stable identity: e.g. inode of a pipe is reused
+            identity = None if streaming else file_identity(stream)
+            # name of a file opened by a path, an int name is a file descriptor
+            path = getattr(stream, 'name', None)
+            path = path if isinstance(path, str) else None
+            value_cache = None if identity is None else value_cache.bind(identity, variant=rational_mode, path=path)
+        self._value_cache = value_cache
+
+        # resources owned by the parser (see from_path)
+        self._file = None
+        self._mapping = None
+        self._closed = False
+
+        if streaming:
+            structure = scan_jpeg_stream(stream,
+                                         only=self._only,
+                                         max_prefix=max_prefix,
+                                         max_segment_size=max_segment_size,
+                                         ifd_class=ColumnarIFD if columnar else None,
+                                         value_cache=value_cache,
+                                         rational_mode=rational_mode)
+        else:
+            structure = scan_jpeg_structure(stream,
+                                            include_eoi=estimate_image_size,
+                                            buffered=buffered,
+                                            eoi_from_end=eoi_from_end,
+                                            only=self._only,
+                                            max_prefix=max_prefix,
+                                            ifd_class=ColumnarIFD if columnar else None,
+                                            value_cache=value_cache,
+                                            rational_mode=rational_mode)
         self._structure = structure
 
         self._sos = None
@@ -79,34 +225,203 @@ class JpegMetaParser:
         for segment in structure:
             if segment.marker == SOS:
                 self._sos = segment
-            elif APPn.check_mask(segment.marker.signature):
-                assert isinstance(segment, AppSegment)
+            elif isinstance(segment, AppSegment):
                 self._segments[segment.marker.name.upper()] = segment
 
         self._exif_info = ExifInfo(parser=self)
 
 
+    @classmethod
+    def from_path(cls, path: Union[str, os.PathLike], mmap: bool=True, **kwargs) -> 'JpegMetaParser':
+        """
+        Open and parse the file by path. The parser owns the file: use close() or `with` statement.
+
+        mmap: map the file into memory instead of reading it.
+              All reads become memoryview slices of the mapping (zero-copy),
+              so only the pages with metadata are actually loaded from the disk.
+              It's not used with page_cache=True.
+        kwargs: parsing options of the constructor, e.g. estimate_image_size=True.
+        """
+        file = open(path, 'rb')
+        mapping = None
+
+        try:
+            if mmap and not kwargs.get('page_cache', False) and os.fstat(file.fileno()).st_size > 0:
+                mapping = MemoryMap(file.fileno(), 0, access=ACCESS_READ)
+                stream = BufferStream(memoryview(mapping))
+            else:
+                stream = file
+
+            value_cache = kwargs.get('value_cache')
+            if isinstance(value_cache, ValueCache):
+                # the memory mapped stream has no file descriptor
+                kwargs['value_cache'] = value_cache.bind(file_identity(file), variant=kwargs.get('rational_mode', 'fraction'),
+                                                         path=path)
+
+            jpeg_parser = cls(stream, **kwargs)
+        except BaseException:
+            if mapping is not None:
+                stream.close()
+                mapping.close()
+            file.close()
+            raise
+
+        jpeg_parser._file = file
+        jpeg_parser._mapping = mapping
+        return jpeg_parser
+
+
+    def close(self):
+        """
+        Release the file opened by from_path(). Streams passed to the constructor are not closed.
+        Later access to the segments and values of the parser raises ValueError('I/O operation on closed parser'),
+        lazy loading of segments, IFDs and fields obtained before close() raises ValueError of the closed stream.
+        memoryview values returned before close() (e.g. JpegSegment.payload, IfdField.raw_value, thumbnail)
+        stay valid: they keep the memory mapping alive until they are released.
+        """
+        self._closed = True
+
+        if self._mapping is not None:
+            self._stream.close()
+            try:
+                self._mapping.close()
+            except BufferError:
+                # exported slices are still referenced: the mapping will be released with them
+                pass
+            self._mapping = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
     def get_tag_value(self, tag_path: TagPath, default=None) -> Union[ValueType, None]:
+        self._check_open()
         segment = self._segments.get(tag_path.app_name.upper())
         if segment is None:
             logger.debug(f'[get_tag_value] segment "{tag_path.app_name.upper()}" is not found')
             return default
 
-        ifd: IFD = segment.ifd(tag_path.ifd_number)
-        if ifd is None:
-            logger.debug(f'[get_tag_value] IFD{tag_path.ifd_number} is not found in {tag_path.app_name.upper()}')
-            return default
+        if self._value_cache is None:
+            value = find_tag_value(segment, tag_path)
+        else:
+            value = self._value_cache.get(segment.offset, tag_path.ifd_number, tag_path.tag_id)
+            if value is MISSING:
+                value = find_tag_value(segment, tag_path)
+                self._value_cache.put(value, segment.offset, tag_path.ifd_number, tag_path.tag_id)
 
-        field = ifd.get_field(tag_path.tag_id)
-        if field is None:
-            logger.debug(f'[get_tag_value] tag 0x{tag_path.tag_id:04X} is not found in IFD #{tag_path.ifd_number}')
-            return default
+        return default if value is NOT_FOUND else value
 
-        return field.value
 
+    def get_tag_values(self, tag_paths: Iterable[TagPath], default=None) -> tuple[Union[ValueType, None], ...]:
+        """
+        Values of many tags in one pass, aligned with `tag_paths` (`default` for missing tags).
+        Tags are grouped by segment and IFD: each IFD is resolved once with all field headers,
+        the value reads are sorted by offset and nearby reads are merged (see IfdField.load_values).
+        """
+        self._check_open()
+        tag_paths = tuple(tag_paths)
+        values = [ default ]*len(tag_paths)
+
+        ifds = {}    # (segment name, IFD number) -> IFD or None
+        fields = {}  # position -> IfdField
+
+        for position, tag_path in enumerate(tag_paths):
+            segment_name = tag_path.app_name.upper()
+            segment = self._segments.get(segment_name)
+            if segment is None:
+                continue
+
+            if self._value_cache is not None:
+                value = self._value_cache.get(segment.offset, tag_path.ifd_number, tag_path.tag_id)
+                if value is not MISSING:
+                    values[position] = default if value is NOT_FOUND else value
+                    continue
+
+            ifd_key = (segment_name, tag_path.ifd_number)
+            if ifd_key not in ifds:
+                ifd = resolve_ifd(segment, tag_path)
+                if ifd is not None:
+                    ifd.load_all()
+                ifds[ifd_key] = ifd
+
+            ifd = ifds[ifd_key]
+            field = None if ifd is None else ifd.get_field(tag_path.tag_id)
+
+            if field is None:
+                if self._value_cache is not None:
+                    self._value_cache.put(NOT_FOUND, segment.offset, tag_path.ifd_number, tag_path.tag_id)
+                continue
+
+            fields[position] = field
+
+        load_values(fields.values())
+
+        for position, field in fields.items():
+            values[position] = field.value
+            if self._value_cache is not None:
+                tag_path = tag_paths[position]
+                segment = self._segments[tag_path.app_name.upper()]
+                self._value_cache.put(field.value, segment.offset, tag_path.ifd_number, tag_path.tag_id)
+
+        return tuple(values)
+
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError('I/O operation on closed parser')
+
+
+def find_tag_value(segment: Union[ExifSegment, AppSegment], tag_path: TagPath) -> Union[ValueType, object]:
+    """
+    Value of the tag in the segment or NOT_FOUND.
+    """
+    ifd = resolve_ifd(segment, tag_path)
+    if ifd is None:
+        logger.debug(f'[get_tag_value] IFD {tag_path.ifd_number} is not found in {tag_path.app_name.upper()}')
+        return NOT_FOUND
+
+    field = ifd.get_field(tag_path.tag_id)
+    if field is None:
+        logger.debug(f'[get_tag_value] tag 0x{tag_path.tag_id:04X} is not found in IFD {tag_path.ifd_number}')
+        return NOT_FOUND
+
+    return field.value
+
+
+def resolve_ifd(segment: Union[ExifSegment, AppSegment], tag_path: TagPath) -> Union[IFD, None]:
+    """
+    IFD of the tag path or None, including an unknown sub-IFD name (see ExifSegment.SUB_IFDS).
+    """
+    try:
+        return segment.resolve_ifd(tag_path.ifd_number)
+    except ValueError as e:
+        logger.debug(f'[get_tag_value] {e}')
+        return None
+
+
+def scan_jpeg_structure(stream: IO,
+                        include_eoi: bool,
+                        buffered: bool=False,
+                        eoi_from_end: bool=False,
+                        only: Optional[Iterable[str]]=None,
+                        max_prefix: Optional[int]=None,
+                        ifd_class: Optional[type]=None,
+                        value_cache: Optional[FileValueCache]=None,
+                        rational_mode: str='fraction') -> List[JpegSegment]:
+    """
+    only: names of the wanted segments, e.g. {'APP1'}: other APP segments are skipped
+          and the scan stops as soon as all wanted segments are found.
+    max_prefix: don't read beyond this offset, the scan stops at the first segment which doesn't fit.
+    ifd_class: IFD representation of Exif-like segments (see JpegSegment.create).
+    value_cache: cache of decoded values of Exif-like segments (see ValueCache).
+    rational_mode: representation of Rational/SRational values (see decoder.RATIONAL_MODES).
+    """
+    stats = instrument.current.stats
+    start_time = perf_counter() if stats is not None else 0.0
 
-def scan_jpeg_structure(stream: IO, include_eoi: bool) -> List[JpegSegment]:
     offset = stream.tell()
+    wanted = None if only is None else {name.upper() for name in only}
 
     parser.read_jpeg_signature(stream)
     segment = JpegSegment.create(marker=SOI, stream=stream, offset=offset, size=JpegMarker.MARKER_SIZE)
@@ -117,7 +432,7 @@ def scan_jpeg_structure(stream: IO, include_eoi: bool) -> List[JpegSegment]:
 
     # scan segments
 
-    segment_marker = stream.read(JpegMarker.MARKER_SIZE)
+    segment_marker = read_marker(stream, offset, max_prefix)
     while len(segment_marker) == JpegMarker.MARKER_SIZE:
         segment_marker = endianess.convert_big_endian(segment_marker)
         segment_marker = JpegMarker.detect(segment_marker)
@@ -127,21 +442,57 @@ def scan_jpeg_structure(stream: IO, include_eoi: bool) -> List[JpegSegment]:
 
         segment_size = parser.read_bytes_strict(stream, JpegMarker.LENGTH_SIZE)
         segment_size = endianess.convert_big_endian(segment_size) + JpegMarker.MARKER_SIZE
+        payload_size = segment_size - JpegMarker.MARKER_SIZE - JpegMarker.LENGTH_SIZE
 
-        segment = JpegSegment.create(marker=segment_marker, stream=stream, offset=offset, size=segment_size)
+        if max_prefix is not None and offset + segment_size > max_prefix:
+            logger.debug(f'[scan_jpeg_structure] {segment_marker.name} is beyond the prefix of {max_prefix} bytes')
+            break
+
+        is_app = APPn.check_mask(segment_marker.signature)
+        if is_app and wanted is not None and segment_marker.name.upper() not in wanted:
+            # not needed: skipped without reading
+            stream.seek(payload_size, SEEK_CUR)
+            if stats is not None:
+                stats.count_seek(stream)
+            offset += segment_size
+            segment_marker = read_marker(stream, offset, max_prefix)
+            continue
+
+        if buffered and is_app:
+            # read the whole segment once, all further parsing goes through the buffer
+            payload = parser.read_bytes_strict(stream, payload_size)
+            segment_stream = BufferStream(payload, offset=offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE)
+        else:
+            stream.seek(payload_size, SEEK_CUR)
+            if stats is not None:
+                stats.count_seek(stream)
+            segment_stream = stream
+
+        segment = JpegSegment.create(marker=segment_marker, stream=segment_stream, offset=offset, size=segment_size,
+                                     ifd_class=ifd_class, value_cache=value_cache, rational_mode=rational_mode)
         segment.log()
         structure.append(segment)
 
         offset += segment_size
-        stream.seek(segment_size - JpegMarker.MARKER_SIZE - JpegMarker.LENGTH_SIZE, SEEK_CUR)
 
         if segment_marker == SOS:
             break
 
-        segment_marker = stream.read(JpegMarker.MARKER_SIZE)
+        if wanted is not None:
+            wanted.discard(segment_marker.name.upper())
+            if len(wanted) == 0:
+                break
+
+        segment_marker = read_marker(stream, offset, max_prefix)
+
+    if stats is not None:
+        stats.add_time('scan', perf_counter() - start_time)
 
     if include_eoi:
-        eoi_offset = parser.scan_for_eoi(stream)
+        if structure[-1].marker != SOS:
+            raise RuntimeError('the image data is not reached: EOI can not be found')
+
+        eoi_offset = parser.scan_for_eoi(stream, from_end=eoi_from_end)
         if eoi_offset == 0:
             raise RuntimeError('EOI is not found')
 
@@ -149,4 +500,112 @@ def scan_jpeg_structure(stream: IO, include_eoi: bool) -> List[JpegSegment]:
         segment.log()
         structure.append(segment)
 
-    return structure
\ No newline at end of file
+    return structure
+
+
+def scan_jpeg_stream(stream: IO,
+                     only: Optional[Iterable[str]]=None,
+                     max_prefix: Optional[int]=None,
+                     max_segment_size: Optional[int]=None,
+                     ifd_class: Optional[type]=None,
+                     value_cache: Optional[FileValueCache]=None,
+                     rational_mode: str='fraction') -> List[JpegSegment]:
+    """
+    Forward-only scan: the stream is read once without seek() and tell(), the offsets are counted from the current position.
+    APP segments are read into memory (the size is known from the length field) and parsed as in buffered mode,
+    other segments are skipped, the scan stops at SOS (the image data is not read).
+    Segments other than APP keep the source stream: their payload is not available.
+
+    max_segment_size: APP segments with larger payload are skipped without buffering:
+                      they are listed as plain JpegSegment (not parsed, the payload is not available).
+    Other options are the same as of scan_jpeg_structure().
+    """
+    stats = instrument.current.stats
+    start_time = perf_counter() if stats is not None else 0.0
+
+    wanted = None if only is None else {name.upper() for name in only}
+    header_size = JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE
+
+    parser.read_jpeg_signature(stream)
+    segment = JpegSegment.create(marker=SOI, stream=stream, offset=0, size=JpegMarker.MARKER_SIZE)
+    segment.log()
+    structure = [ segment ]
+
+    offset = JpegMarker.MARKER_SIZE
+
+    while max_prefix is None or offset + header_size <= max_prefix:
+        header = parser.read_bytes(stream, header_size)
+        if len(header) < JpegMarker.MARKER_SIZE:
+            break
+
+        segment_marker = JpegMarker.detect(endianess.convert_big_endian(header[:JpegMarker.MARKER_SIZE]))
+        if segment_marker == EOI:
+            raise RuntimeError('unexpected EOI marker before SOS marker')
+        if len(header) != header_size:
+            raise RuntimeError('unexpected end of stream')
+
+        segment_size = endianess.convert_big_endian(header[JpegMarker.MARKER_SIZE:]) + JpegMarker.MARKER_SIZE
+        payload_size = segment_size - header_size
+
+        if max_prefix is not None and offset + segment_size > max_prefix:
+            logger.debug(f'[scan_jpeg_stream] {segment_marker.name} is beyond the prefix of {max_prefix} bytes')
+            break
+
+        if APPn.check_mask(segment_marker.signature):
+            if wanted is not None and segment_marker.name.upper() not in wanted:
+                parser.skip_bytes(stream, payload_size)
+                offset += segment_size
+                continue
+
+            if max_segment_size is not None and payload_size > max_segment_size:
+                logger.info(f'[scan_jpeg_stream] {segment_marker.name} at 0x{offset:08X} is skipped: '
+                            f'{payload_size} bytes exceed max_segment_size={max_segment_size}')
+                parser.skip_bytes(stream, payload_size)
+
+                # listed without payload: the source stream is already behind it
+                segment = JpegSegment(marker=segment_marker, stream=stream, offset=offset, size=segment_size)
+                segment.log()
+                structure.append(segment)
+                offset += segment_size
+                continue
+
+            payload = parser.read_bytes_strict(stream, payload_size)
+            segment_stream = BufferStream(payload, offset=offset + header_size)
+        else:
+            if segment_marker != SOS:
+                parser.skip_bytes(stream, payload_size)
+            segment_stream = stream
+
+        segment = JpegSegment.create(marker=segment_marker, stream=segment_stream, offset=offset, size=segment_size,
+                                     ifd_class=ifd_class, value_cache=value_cache, rational_mode=rational_mode)
+        segment.log()
+        structure.append(segment)
+
+        offset += segment_size
+
+        if segment_marker == SOS:
+            break
+
+        if wanted is not None:
+            wanted.discard(segment_marker.name.upper())
+            if len(wanted) == 0:
+                break
+
+    if stats is not None:
+        stats.add_time('scan', perf_counter() - start_time)
+
+    return structure
+
+
+def read_marker(stream: IO, offset: int, max_prefix: Optional[int]) -> bytes:
+    """
+    Read the next segment marker, nothing is read if the segment header is beyond the prefix.
+    """
+    if max_prefix is not None and offset + JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE > max_prefix:
+        return b''
+
+    marker = stream.read(JpegMarker.MARKER_SIZE)
+    stats = instrument.current.stats
+    if stats is not None:
+        stats.count_read(stream, len(marker))
+    return marker
\ No newline at end of file
@@ -1,10 +1,14 @@
-from typing import IO
+from typing import IO, Optional
+from jparse import parser
 from jparse.JpegMarker import JpegMarker, APPn, APP0, APP1, APP2
 from jparse.log import logger
+from jparse.ValueCache import FileValueCache
 
 
 class JpegSegment:
 
+    __slots__ = ('_marker', '_offset', '_size', '_stream')
+
     @property
     def marker(self) -> JpegMarker:
         return self._marker
@@ -24,6 +28,24 @@ class JpegSegment:
     def size(self) -> int:
         return self._size
 
+    @property
+    def stream(self) -> IO:
+        """
+        The stream the segment is parsed from: the file itself or the segment's buffer.
+        """
+        return self._stream
+
+    @property
+    def payload(self) -> bytes:
+        """
+        The segment's content without marker and length fields.
+        It's a zero-copy memoryview if the file is memory-mapped (see JpegMetaParser.from_path).
+        """
+        header_size = JpegMarker.MARKER_SIZE + JpegMarker.LENGTH_SIZE
+        if self.size <= header_size:
+            return b''
+        return parser.read_at(self._stream, self.offset + header_size, self.size - header_size)
+
     @property
     def is_loaded(self) -> bool:
         """
@@ -33,10 +55,21 @@ class JpegSegment:
 
 
     @staticmethod
-    def create(marker: JpegMarker, stream: IO, offset: int, size: int) -> 'JpegSegment':
+    def create(marker: JpegMarker,
+               stream: IO,
+               offset: int,
+               size: int,
+               ifd_class: Optional[type]=None,
+               value_cache: Optional[FileValueCache]=None,
+               rational_mode: str='fraction') -> 'JpegSegment':
         """
         Segment creation factory method.
+        ifd_class: IFD representation of Exif-like segments: IFD (default) or ColumnarIFD.
+        value_cache: cache of decoded values of Exif-like segments (see ValueCache).
+        rational_mode: representation of Rational/SRational values (see decoder.RATIONAL_MODES).
         """
+        options = {}
+
         if marker in [APP0, APP2]:
             # APP0 - JFIF segment contains no meta, only image data
             # APP2 - Extended Exif (FlashPix)
@@ -44,16 +77,19 @@ class JpegSegment:
         elif marker == APP1:
             # standard Exif segment - Exif Attribute Information
             from jparse.App1Segment import App1Segment as Segment
+            options.update(ifd_class=ifd_class, value_cache=value_cache, rational_mode=rational_mode)
         elif APPn.check_mask(marker.signature):
             # custom APP segment, trying to parse it with generic exif parser
             from jparse.GenericExifSegment import GenericExifSegment as Segment
+            options.update(ifd_class=ifd_class, value_cache=value_cache, rational_mode=rational_mode)
         else:
             Segment = JpegSegment
 
         return Segment(marker=marker,
                        stream=stream,
                        offset=offset,
-                       size=size)
+                       size=size,
+                       **options)
 
 
     def __init__(self, marker: JpegMarker, stream: IO, offset: int, size: int):
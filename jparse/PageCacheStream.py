@@ -0,0 +1,264 @@
+import io
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import IO, Dict, List, Union
+
+from jparse import parser
+
+
+DEFAULT_PAGE_SIZE: int = 4096  # bytes
+DEFAULT_CAPACITY: int = 64     # pages
+
+
+class PageCacheStream:
+    """
+    Read-only stream wrapper with an LRU cache of fixed-size pages of the underlying stream:
+    repeated and overlapping reads (segment names, IFD headers, values of nearby fields) are served from memory,
+    the underlying stream is read in whole pages, adjacent missing pages with one read.
+
+    It also accounts the reads: bytes requested by the parser, bytes fetched from the stream
+    and the redundancy - the share of requested bytes which were already requested before.
+    read_at() is thread-safe: a parser over the cache can be shared by threads.
+
+        with open('image.jpg', 'rb') as f:
+            parser = JpegMetaParser(f, page_cache=True)
+            print(parser.exif_info)
+            print(parser.stream.stats())
+    """
+
+    mode: str = 'rb'
+
+    @property
+    def stream(self) -> IO:
+        return self._stream
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    @property
+    def capacity(self) -> int:
+        """
+        Maximum number of cached pages.
+        """
+        return self._capacity
+
+    @property
+    def requested_bytes(self) -> int:
+        return self._requested_bytes
+
+    @property
+    def fetched_bytes(self) -> int:
+        """
+        Bytes read from the underlying stream.
+        """
+        return self._fetched_bytes
+
+    @property
+    def redundant_bytes(self) -> int:
+        """
+        Requested bytes which were already requested before.
+        """
+        return self._redundant_bytes
+
+    @property
+    def redundancy_ratio(self) -> float:
+        return self._redundant_bytes / self._requested_bytes if self._requested_bytes > 0 else 0.0
+
+    @property
+    def closed(self) -> bool:
+        return self._stream.closed
+
+
+    def __init__(self, stream: IO, page_size: int=DEFAULT_PAGE_SIZE, capacity: int=DEFAULT_CAPACITY):
+        if page_size <= 0 or capacity <= 0:
+            raise ValueError('page_size and capacity must be positive')
+
+        self._stream = stream
+        self._page_size = page_size
+        self._capacity = capacity
+        self._pages: OrderedDict[int, bytes] = OrderedDict()
+        self._position = stream.tell()
+        self._lock = threading.Lock()
+
+        # requested byte ranges: sorted, disjoint and not adjacent [start, end) pairs
+        self._range_starts: List[int] = []
+        self._range_ends: List[int] = []
+
+        self._read_calls = 0
+        self._requested_bytes = 0
+        self._redundant_bytes = 0
+        self._fetched_bytes = 0
+        self._fetch_calls = 0
+        self._hits = 0
+        self._misses = 0
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(page_size={self.page_size}, capacity={self.capacity}, pages={len(self._pages)})'
+
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            return {
+                'read_calls': self._read_calls,
+                'requested_bytes': self._requested_bytes,
+                'redundant_bytes': self._redundant_bytes,
+                'redundancy_ratio': self.redundancy_ratio,
+                'fetch_calls': self._fetch_calls,
+                'fetched_bytes': self._fetched_bytes,
+                'page_hits': self._hits,
+                'page_misses': self._misses,
+                'pages': len(self._pages),
+            }
+
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        # the file identity of the underlying file (see ValueCache)
+        return self._stream.fileno()
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            with self._lock:
+                self._position = self._stream.seek(offset, io.SEEK_END)
+        else:
+            raise ValueError(f'invalid whence: {whence}')
+
+        return self._position
+
+    def read(self, count: int=-1) -> bytes:
+        if count < 0:
+            with self._lock:
+                count = max(0, self._stream.seek(0, io.SEEK_END) - self._position)
+
+        data = self.read_at(self._position, count)
+        self._position += len(data)
+        return data
+
+    def read_at(self, offset: int, count: int) -> bytes:
+        """
+        Read up to `count` bytes from the absolute `offset` without moving the stream position.
+        """
+        with self._lock:
+            self._read_calls += 1
+
+            data = self._read_pages(offset, count)
+            self._account(offset, offset + len(data))
+
+            return data
+
+
+    def _read_pages(self, offset: int, count: int) -> bytes:
+        if count <= 0:
+            return b''
+
+        first_page = offset // self._page_size
+        last_page = (offset + count - 1) // self._page_size
+
+        if last_page - first_page + 1 > self._capacity:
+            # larger than the cache (e.g. the image data scan): read directly without evicting the metadata pages
+            self._stream.seek(offset)
+            data = parser.read_bytes(self._stream, count)
+            self._fetch_calls += 1
+            self._fetched_bytes += len(data)
+            return data
+
+        pages = self._get_pages(first_page, last_page)
+        start = offset - first_page*self._page_size
+
+        if len(pages) == 1:
+            return pages[0][start:start + count]
+
+        return b''.join(pages)[start:start + count]
+
+
+    def _get_pages(self, first_page: int, last_page: int) -> List[bytes]:
+        pages = []
+
+        number = first_page
+        while number <= last_page:
+            page = self._pages.get(number)
+            if page is not None:
+                self._hits += 1
+                self._pages.move_to_end(number)
+                pages.append(page)
+                number += 1
+                continue
+
+            # the run of missing pages is fetched with one read
+            end_page = number + 1
+            while end_page <= last_page and end_page not in self._pages:
+                end_page += 1
+
+            self._misses += end_page - number
+            fetched = self._fetch_pages(number, end_page)
+            pages.extend(fetched)
+
+            if len(fetched) < end_page - number:
+                break  # the end of the stream
+
+            number = end_page
+
+        return pages
+
+    def _fetch_pages(self, first_page: int, end_page: int) -> List[bytes]:
+        """
+        Read pages [first_page, end_page) with one read, the last page might be short at the end of the stream.
+        """
+        self._stream.seek(first_page*self._page_size)
+        data = parser.read_bytes(self._stream, (end_page - first_page)*self._page_size)
+        self._fetch_calls += 1
+        self._fetched_bytes += len(data)
+
+        pages = []
+        for i, number in enumerate(range(first_page, end_page)):
+            page = data[i*self._page_size:(i + 1)*self._page_size]
+            if len(page) == 0:
+                break
+            pages.append(page)
+            self._pages[number] = page
+            self._pages.move_to_end(number)
+
+        while len(self._pages) > self._capacity:
+            self._pages.popitem(last=False)
+
+        return pages
+
+    def _account(self, start: int, end: int):
+        """
+        Add [start, end) to the requested ranges and count the bytes which were requested before.
+        """
+        if end <= start:
+            return
+
+        self._requested_bytes += end - start
+
+        starts, ends = self._range_starts, self._range_ends
+
+        # ranges which overlap or touch [start, end)
+        first = bisect_left(ends, start)
+        last = first
+        while last < len(starts) and starts[last] <= end:
+            self._redundant_bytes += max(0, min(ends[last], end) - max(starts[last], start))
+            last += 1
+
+        if last > first:
+            start = min(start, starts[first])
+            end = max(end, ends[last - 1])
+
+        starts[first:last] = [ start ]
+        ends[first:last] = [ end ]
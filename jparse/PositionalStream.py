@@ -0,0 +1,129 @@
+import io
+import os
+import threading
+from typing import IO, Optional
+
+
+class PositionalStream:
+    """
+    Read-only stream over a binary file for parsers shared by threads (see JpegMetaParser(thread_safe=True)).
+    read_at() is a positional read (os.pread) which doesn't use the file position,
+    so lazy loading of segments, IFDs and values from many threads doesn't need a global lock.
+    Streams without a file descriptor and platforms without os.pread (Windows) are read with seek() and read() under a lock.
+
+    seek(), tell() and read() use the wrapper's own position (the structure scan), the file position is not changed.
+    """
+
+    mode: str = 'rb'
+
+    @property
+    def stream(self) -> IO:
+        return self._stream
+
+    @property
+    def closed(self) -> bool:
+        return self._stream.closed
+
+
+    def __init__(self, stream: IO):
+        self._stream = stream
+        self._position = stream.tell()
+        self._lock = threading.Lock()
+        self._fd = file_descriptor(stream) if hasattr(os, 'pread') else None
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(stream={self._stream!r}, pread={self._fd is not None})'
+
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self._stream.fileno()
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self._size() + offset
+        else:
+            raise ValueError(f'invalid whence: {whence}')
+
+        return self._position
+
+    def read(self, count: int=-1) -> bytes:
+        data = self.read_at(self._position, count)
+        self._position += len(data)
+        return data
+
+    def read_at(self, offset: int, count: int=-1) -> bytes:
+        """
+        Read up to `count` bytes from the absolute `offset`, less bytes are returned only at the end of the file.
+        """
+        if count < 0:
+            count = max(0, self._size() - offset)
+
+        if self._fd is None:
+            with self._lock:
+                self._stream.seek(offset)
+                return read_fully(self._stream, count)
+
+        data = os.pread(self._fd, count, offset)
+        if len(data) == count or len(data) == 0:
+            return data
+
+        # a short read before the end of the file (e.g. a network file system)
+        chunks = [ data ]
+        received = len(data)
+        while received < count:
+            chunk = os.pread(self._fd, count - received, offset + received)
+            if len(chunk) == 0:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+
+        return b''.join(chunks)
+
+
+    def _size(self) -> int:
+        if self._fd is not None:
+            return os.fstat(self._fd).st_size
+
+        with self._lock:
+            return self._stream.seek(0, io.SEEK_END)
+
+
+def file_descriptor(stream: IO) -> Optional[int]:
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def read_fully(stream: IO, count: int) -> bytes:
+    """
+    Read up to `count` bytes: less bytes are returned only at the end of the stream (see parser.read_bytes).
+    """
+    data = stream.read(count)
+    if len(data) == count or len(data) == 0:
+        return data
+
+    chunks = [ bytes(data) ]
+    received = len(data)
+    while received < count:
+        chunk = stream.read(count - received)
+        if len(chunk) == 0:
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+
+    return b''.join(chunks)
@@ -0,0 +1,32 @@
+from fractions import Fraction
+from typing import NamedTuple
+
+
+class RawRational(NamedTuple):
+    """
+    Undecoded Rational/SRational value: (numerator, denominator) as stored in the file.
+    It's a plain tuple, so it's created without gcd normalization,
+    Fraction is built only on request (see JpegMetaParser(rational_mode='lazy')).
+    """
+    numerator  : int
+    denominator: int
+
+    @property
+    def fraction(self) -> Fraction:
+        return Fraction(self.numerator, self.denominator)
+
+    def __float__(self) -> float:
+        return divide(self.numerator, self.denominator)
+
+    def __str__(self) -> str:
+        return f'{self.numerator}/{self.denominator}'
+
+
+def divide(numerator: int, denominator: int) -> float:
+    """
+    Float value of a rational: a zero denominator gives inf or nan instead of ZeroDivisionError.
+    """
+    if denominator == 0:
+        return float('nan') if numerator == 0 else float('inf') if numerator > 0 else float('-inf')
+
+    return numerator / denominator
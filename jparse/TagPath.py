@@ -1,7 +1,7 @@
-from typing import NamedTuple
+from typing import NamedTuple, Union
 
 
 class TagPath(NamedTuple):
     app_name  : str
-    ifd_number: int
+    ifd_number: Union[int, str]  # IFD index or sub-IFD name: 'Exif', 'GPS', 'Interop' (see ExifSegment.SUB_IFDS)
     tag_id    : int
\ No newline at end of file
@@ -1,7 +1,7 @@
-from typing import IO
+from typing import IO, Optional
 
 from jparse import parser
-from jparse import endianess
+from jparse import decoder
 from jparse.endianess import ByteOrder
 
 
@@ -9,6 +9,8 @@ class TiffHeader:
     ID  : int = 0x002A
     SIZE: int = 8
 
+    __slots__ = ('_byte_order', '_ifd0_offset', '_offset')
+
     @property
     def byte_order(self) -> ByteOrder:
         return self._byte_order
@@ -33,12 +35,17 @@ class TiffHeader:
 
 
     @classmethod
-    def parse(cls, stream: IO) -> 'TiffHeader':
-        tiff_header_offset = stream.tell()
+    def parse(cls, stream: IO, offset: Optional[int]=None) -> 'TiffHeader':
+        """
+        Parse TIFF header located at `offset` (the current stream position by default).
+        """
+        tiff_header_offset = stream.tell() if offset is None else offset
+
+        data = parser.read_at(stream, tiff_header_offset, TiffHeader.SIZE)
 
         # read byte order
 
-        byte_order = parser.read_bytes_strict(stream, 2)
+        byte_order = data[0:2]
 
         if byte_order[0] == byte_order[1] == 0x49:
             byte_order = ByteOrder.LITTLE_ENDIAN
@@ -49,15 +56,13 @@ class TiffHeader:
 
         # check tiff header signature
 
-        tiff_id = parser.read_bytes_strict(stream, 2)
-        tiff_id = endianess.convert(tiff_id, byte_order=byte_order)
+        tiff_id, = decoder.UINT16[byte_order].unpack_from(data, 2)
         if tiff_id != TiffHeader.ID:
             raise RuntimeError('invalid tiff header format')
 
         # read IFD0 offset
 
-        ifd0_offset = parser.read_bytes_strict(stream, 4)
-        ifd0_offset = endianess.convert(ifd0_offset, byte_order=byte_order)
+        ifd0_offset, = decoder.UINT32[byte_order].unpack_from(data, 4)
 
         return TiffHeader(offset=tiff_header_offset,
                           byte_order=byte_order,
@@ -0,0 +1,195 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import IO, Any, Dict, Hashable, Optional, Set, Tuple, Union
+
+
+DEFAULT_CAPACITY: int = 4096  # values
+
+# (device, inode, size, mtime_ns)
+FileIdentity = Tuple[int, int, int, int]
+
+PathType = Union[str, os.PathLike]
+
+# get() result for missing keys: None is a valid cached value
+MISSING = object()
+
+# cached result of a lookup of a tag which is not present in the file
+NOT_FOUND = object()
+
+
+class ValueCache:
+    """
+    Thread-safe LRU cache of decoded tag values shared by parser instances.
+
+    Values are keyed by the file identity (device, inode, size, mtime_ns), so a modified file
+    is never answered with stale values. Paths of the bound files are remembered (up to `capacity` paths),
+    so invalidate(path) works after the file is deleted or renamed. The same instance can be passed to many parsers:
+
+        value_cache = ValueCache(capacity=100000)
+        with JpegMetaParser.from_path('image.jpg', value_cache=value_cache) as parser:
+            print(parser.exif_info.model)
+    """
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+    def __init__(self, capacity: int=DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+        # absolute path -> (device, inode) of the files bound by the path, least recently bound first
+        self._paths: OrderedDict[str, Set[Tuple[int, int]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(capacity={self.capacity}, size={len(self)})'
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size': len(self._values),
+                'capacity': self._capacity,
+            }
+
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Cached value or MISSING.
+        """
+        with self._lock:
+            value = self._values.get(key, MISSING)
+            if value is MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._values.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+
+            while len(self._values) > self._capacity:
+                self._values.popitem(last=False)
+                self._evictions += 1
+
+
+    def invalidate(self, path: Optional[PathType]=None):
+        """
+        Drop the values of the file (all its versions) or all values if path is None.
+        The files bound by the path are found without stat(), so a deleted or renamed file is invalidated too,
+        the file which is at the path now is invalidated as well. A path which is unknown and doesn't exist is ignored.
+        """
+        if path is None:
+            with self._lock:
+                self._values.clear()
+                self._paths.clear()
+            return
+
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+            current = { (stat.st_dev, stat.st_ino) }
+        except OSError:
+            current = set()
+
+        with self._lock:
+            files = self._paths.pop(path, set()) | current
+            if len(files) == 0:
+                return
+
+            stale = [ key for key in self._values if key[0][:2] in files ]
+            for key in stale:
+                del self._values[key]
+
+
+    def bind(self, identity: FileIdentity, variant: Hashable=None, path: Optional[PathType]=None) -> 'FileValueCache':
+        """
+        variant: decoding options which change the values (e.g. rational_mode), they are a part of the keys.
+        path: path the file is opened by, it's remembered for invalidate(path).
+        """
+        if path is not None:
+            path = os.path.abspath(path)
+            with self._lock:
+                files = self._paths.pop(path, set())
+                files.add(identity[:2])
+                self._paths[path] = files
+
+                while len(self._paths) > self._capacity:
+                    self._paths.popitem(last=False)
+
+        return FileValueCache(self, identity, variant)
+
+
+class FileValueCache:
+    """
+    ValueCache view for one file: prepends the file identity and the decoding variant to the keys.
+    """
+
+    __slots__ = ('_cache', '_identity', '_variant')
+
+    @property
+    def cache(self) -> ValueCache:
+        return self._cache
+
+    @property
+    def identity(self) -> FileIdentity:
+        return self._identity
+
+
+    @property
+    def variant(self) -> Hashable:
+        return self._variant
+
+
+    def __init__(self, cache: ValueCache, identity: FileIdentity, variant: Hashable=None):
+        self._cache = cache
+        self._identity = identity
+        self._variant = variant
+
+
+    def get(self, *key: Hashable) -> Any:
+        return self._cache.get((self._identity, self._variant, *key))
+
+    def put(self, value: Any, *key: Hashable):
+        self._cache.put((self._identity, self._variant, *key), value)
+
+
+def file_identity(file: IO) -> Optional[FileIdentity]:
+    """
+    Identity of an opened file or None if the stream is not a file (e.g. BytesIO).
+    """
+    try:
+        stat = os.fstat(file.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
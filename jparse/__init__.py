@@ -1,7 +1,11 @@
 from jparse.info import __version__, __author__, __email__
 
 from jparse.JpegMetaParser import JpegMetaParser, TagPath, ValueType
+from jparse.BufferStream import BufferStream
 from jparse.AppSegment import AppSegment
 from jparse.ExifSegment import ExifSegment
 from jparse.IFD import IFD, IfdField
-from jparse.ExifInfo import ExifInfo
\ No newline at end of file
+from jparse.ColumnarIFD import ColumnarIFD
+from jparse.ExifInfo import ExifInfo
+from jparse.ValueCache import ValueCache
+from jparse.RawRational import RawRational
\ No newline at end of file
@@ -0,0 +1,6 @@
+import sys
+
+from jparse.cli import main
+
+
+sys.exit(main())
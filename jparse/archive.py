@@ -0,0 +1,158 @@
+"""
+Metadata of JPEG files inside zip and tar archives without extraction.
+
+Each member is parsed in the streaming mode (see JpegMetaParser(streaming=True)): it's read once up to SOS,
+so a compressed member is decompressed only up to the image data. Results are BatchResult as in jparse.batch.
+
+    for result in scan_archives(['upload.zip', 'upload.tar.gz'], exif_fields=['model', 'datetime']):
+        print(result.path.member, result.data)
+"""
+import os
+import tarfile
+import zipfile
+from functools import partial
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+from jparse.batch import BatchResult, DEFAULT_CHUNK_SIZE, PathType, check_exif_fields, iterate_chunks, map_paths, read_parser_values
+
+
+DEFAULT_SUFFIXES: Tuple[str, ...] = ('.jpg', '.jpeg', '.jpe', '.jfif')
+
+
+class MemberPath(NamedTuple):
+    archive: PathType
+    member : str
+
+    def __str__(self) -> str:
+        return f'{os.fspath(self.archive)}/{self.member}'
+
+
+# worker task: zip archive with the names of members to read or tar archive with None (all members, sequentially)
+ArchiveTask = Tuple[PathType, Optional[Tuple[str, ...]]]
+
+
+def iterate_archive(path: PathType,
+                    tags: Sequence[TagPath]=(),
+                    exif_fields: Sequence[str]=(),
+                    suffixes: Iterable[str]=DEFAULT_SUFFIXES,
+                    **parser_options) -> Iterator[BatchResult]:
+    """
+    Parse JPEG members of a zip or tar archive (including compressed tar) one by one in the current process.
+    BatchResult.path is MemberPath, data is a dict: TagPath or ExifInfo property name -> value (None if not found).
+
+    suffixes: members with these file name suffixes (case insensitive) are parsed.
+    parser_options: options of JpegMetaParser, the streaming mode is always used.
+    """
+    check_exif_fields(exif_fields)
+
+    read = partial(read_member_values, tags=tuple(tags), exif_fields=tuple(exif_fields), parser_options=parser_options)
+    suffixes = tuple(suffix.lower() for suffix in suffixes)
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(suffixes):
+                    yield read_member(read, path, info.filename, lambda: archive.open(info))
+        return
+
+    # note: the members of a compressed tar are decompressed sequentially anyway (no random access),
+    #       but only the metadata prefix of each JPEG is parsed
+    with tarfile.open(path, mode='r:*') as archive:
+        for info in archive:
+            if info.isfile() and info.name.lower().endswith(suffixes):
+                yield read_member(read, path, info.name, lambda: archive.extractfile(info))
+
+
+def scan_archives(paths: Iterable[PathType],
+                  tags: Sequence[TagPath]=(),
+                  exif_fields: Sequence[str]=(),
+                  suffixes: Iterable[str]=DEFAULT_SUFFIXES,
+                  workers: Optional[int]=None,
+                  chunk_size: int=DEFAULT_CHUNK_SIZE,
+                  ordered: bool=True,
+                  pool: str='process',
+                  **parser_options) -> Iterator[BatchResult]:
+    """
+    Parse JPEG members of many archives in parallel with the batch pool (see batch.map_paths).
+    Zip members are split into chunks of `chunk_size` members, each worker opens the archive once per chunk.
+    A tar archive is read sequentially by one worker.
+    An archive which can't be opened is reported by one BatchResult with the archive path and doesn't abort the batch.
+
+    pool: 'process', 'thread' or 'interpreter' (see batch.map_paths).
+    """
+    check_exif_fields(exif_fields)
+
+    suffixes = tuple(suffix.lower() for suffix in suffixes)
+    function = partial(read_archive_task, tags=tuple(tags), exif_fields=tuple(exif_fields),
+                       suffixes=suffixes, parser_options=parser_options)
+
+    tasks = iterate_tasks(paths, suffixes, chunk_size)
+    for task_result in map_paths(function, tasks, workers=workers, chunk_size=1, ordered=ordered, pool=pool):
+        if task_result.ok:
+            yield from task_result.data
+        else:
+            archive_path, _ = task_result.path
+            yield BatchResult(path=archive_path, data=None, error=task_result.error)
+
+
+def iterate_tasks(paths: Iterable[PathType], suffixes: Tuple[str, ...], chunk_size: int) -> Iterator[ArchiveTask]:
+    for path in paths:
+        if not zipfile.is_zipfile(path):
+            yield path, None
+            continue
+
+        # the central directory is read once here, workers read only their members
+        try:
+            with zipfile.ZipFile(path) as archive:
+                names = [ info.filename for info in archive.infolist()
+                          if not info.is_dir() and info.filename.lower().endswith(suffixes) ]
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError):
+            # the whole archive goes to a worker: it fails to open it again and reports the error for the archive
+            yield path, None
+            continue
+
+        for chunk in iterate_chunks(names, chunk_size):
+            yield path, tuple(chunk)
+
+
+def read_archive_task(task: ArchiveTask,
+                      tags: Sequence[TagPath],
+                      exif_fields: Sequence[str],
+                      suffixes: Tuple[str, ...],
+                      parser_options: Dict[str, Any]) -> List[BatchResult]:
+    """
+    Parse the members of the task (scan_archives worker).
+    """
+    path, names = task
+    if names is None:
+        return list(iterate_archive(path, tags, exif_fields, suffixes, **parser_options))
+
+    read = partial(read_member_values, tags=tags, exif_fields=exif_fields, parser_options=parser_options)
+
+    with zipfile.ZipFile(path) as archive:
+        return [ read_member(read, path, name, lambda: archive.open(name)) for name in names ]
+
+
+def read_member(read: Callable[[IO], Any],
+                archive_path: PathType,
+                name: str,
+                open_member: Callable[[], IO]) -> BatchResult:
+    """
+    Per-member errors are reported in BatchResult.error and don't abort the archive.
+    """
+    path = MemberPath(archive=archive_path, member=name)
+    try:
+        with open_member() as stream:
+            return BatchResult(path=path, data=read(stream), error=None)
+    except Exception as e:
+        return BatchResult(path=path, data=None, error=f'{type(e).__name__}: {e}')
+
+
+def read_member_values(stream: IO,
+                       tags: Sequence[TagPath],
+                       exif_fields: Sequence[str],
+                       parser_options: Dict[str, Any]) -> Dict[Union[TagPath, str], Any]:
+    parser = JpegMetaParser(stream, **{**parser_options, 'streaming': True})
+    return read_parser_values(parser, tags, exif_fields)
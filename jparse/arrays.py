@@ -0,0 +1,81 @@
+"""
+Optional NumPy decoding of numeric field values: pip install "jparse[numpy]".
+"""
+from typing import Any
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+
+# element dtype without byte order, rationals are decoded as (numerator, denominator) pairs
+TYPE_TO_DTYPE_MAPPING = {
+    FieldType.Byte     : 'u1',
+    FieldType.ASCII    : 'S1',
+    FieldType.Short    : 'u2',
+    FieldType.Long     : 'u4',
+    FieldType.Rational : 'u4',
+    FieldType.SByte    : 'i1',
+    FieldType.Undefined: 'u1',
+    FieldType.SShort   : 'i2',
+    FieldType.SLong    : 'i4',
+    FieldType.SRational: 'i4',
+    FieldType.Float    : 'f4',
+    FieldType.Double   : 'f8',
+}
+
+RATIONAL_FORMATS = ('pair', 'float')
+
+
+def is_available() -> bool:
+    return numpy is not None
+
+
+def numpy_dtype(field_type: FieldType, byte_order: ByteOrder) -> Any:
+    """
+    numpy.dtype of the field type elements, e.g. dtype('<u2') for little endian Short.
+    """
+    require_numpy()
+
+    if field_type not in TYPE_TO_DTYPE_MAPPING:
+        raise NotImplementedError('can not parse unknown value type')
+
+    return numpy.dtype(f'{byte_order.value}{TYPE_TO_DTYPE_MAPPING[field_type]}')
+
+
+def unpack_ndarray(data: bytes,
+                   count: int,
+                   field_type: FieldType,
+                   byte_order: ByteOrder,
+                   rationals: str='pair') -> Any:
+    """
+    Decode `count` elements of `field_type` as numpy.ndarray with numpy.frombuffer() (no per-element loop).
+    The array shares memory with `data` and is read-only.
+    rationals: 'pair' - (N, 2) integer array of (numerator, denominator),
+               'float' - float64 array, zero denominators give inf or nan.
+    """
+    if rationals not in RATIONAL_FORMATS:
+        raise ValueError(f'rationals must be one of {RATIONAL_FORMATS}, got {rationals!r}')
+
+    dtype = numpy_dtype(field_type, byte_order)
+    item_count = 2*count if field_type.is_rational else count
+
+    items = numpy.frombuffer(data, dtype=dtype, count=item_count)
+    if not field_type.is_rational:
+        return items
+
+    pairs = items.reshape(count, 2)
+    if rationals == 'pair':
+        return pairs
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return pairs[:, 0] / pairs[:, 1]
+
+
+def require_numpy():
+    if numpy is None:
+        raise RuntimeError('numpy is required: pip install "jparse[numpy]"')
@@ -0,0 +1,244 @@
+"""
+Batch parsing of many files with a process pool or a thread pool.
+
+Results are plain picklable objects (no parsers, segments or fields bound to open files)
+and streamed back as a generator, so memory stays flat for any number of files.
+
+The thread pool (pool='thread') has no pickling costs: it scales with the number of cores
+on free-threaded (no-GIL) builds of CPython, each file is parsed by its own parser and the parsers share no mutable state.
+"""
+import concurrent.futures
+import os
+import platform
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from jparse import instrument
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.ExifInfo import ExifInfo
+from jparse.TagPath import TagPath
+
+
+PathType = Union[str, os.PathLike]
+
+DEFAULT_CHUNK_SIZE: int = 64  # files per task
+
+# pool -> executor class, 'interpreter' is available since Python 3.14
+POOLS: Dict[str, Optional[type]] = {
+    'process': ProcessPoolExecutor,
+    'thread': ThreadPoolExecutor,
+    'interpreter': getattr(concurrent.futures, 'InterpreterPoolExecutor', None),
+}
+
+
+class BatchResult(NamedTuple):
+    path : PathType
+    data : Any            # result of the per-file function, None on error
+    error: Optional[str]  # per-file error, e.g. 'RuntimeError: file is not JPEG'
+    stats: Optional[Dict[str, Union[int, float]]] = None  # instrument.Stats.to_dict() of the file (collect_stats=True)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def scan_paths(paths: Iterable[PathType],
+               tags: Sequence[TagPath]=(),
+               exif_fields: Sequence[str]=(),
+               workers: Optional[int]=None,
+               chunk_size: int=DEFAULT_CHUNK_SIZE,
+               ordered: bool=True,
+               pool: str='process',
+               collect_stats: bool=False,
+               **parser_options) -> Iterator[BatchResult]:
+    """
+    Parse files in parallel and read the requested values.
+    BatchResult.data is a dict: TagPath or ExifInfo property name -> value (None if not found).
+
+    tags: raw tags to read, e.g. TagPath('APP1', 0, 0x0110).
+    exif_fields: ExifInfo properties to read, e.g. 'model'.
+    workers: number of processes (threads), os.cpu_count() by default; 1 - parse in the current thread.
+    chunk_size: number of files sent to a worker at once.
+    ordered: yield results in the input order, otherwise in the completion order.
+    pool: 'process', 'thread' or 'interpreter' (see map_paths).
+    collect_stats: instrumentation of each file in BatchResult.stats (see map_paths).
+    parser_options: options of JpegMetaParser.from_path().
+    """
+    check_exif_fields(exif_fields)
+
+    function = partial(read_values, tags=tuple(tags), exif_fields=tuple(exif_fields), parser_options=parser_options)
+    return map_paths(function, paths, workers=workers, chunk_size=chunk_size, ordered=ordered, pool=pool,
+                     collect_stats=collect_stats)
+
+
+def scan_prefix_sizes(paths: Iterable[PathType],
+                      only: Optional[Iterable[str]]=None,
+                      workers: Optional[int]=None,
+                      chunk_size: int=DEFAULT_CHUNK_SIZE,
+                      ordered: bool=True,
+                      pool: str='process',
+                      collect_stats: bool=False,
+                      **parser_options) -> Iterator[BatchResult]:
+    """
+    Measure in parallel how many bytes from the start of each file are needed to parse it.
+    BatchResult.data is JpegMetaParser.prefix_size, e.g. only={'APP1'} - the end of APP1 segment.
+    """
+    if only is not None:
+        parser_options['only'] = frozenset(only)
+
+    function = partial(read_prefix_size, parser_options=parser_options)
+    return map_paths(function, paths, workers=workers, chunk_size=chunk_size, ordered=ordered, pool=pool,
+                     collect_stats=collect_stats)
+
+
+def read_prefix_size(path: PathType, parser_options: Dict[str, Any]) -> int:
+    """
+    Measure the prefix size of the file (scan_prefix_sizes worker): only segment headers are read.
+    """
+    parser_options = {'mmap': False, **parser_options}
+
+    with JpegMetaParser.from_path(path, **parser_options) as parser:
+        return parser.prefix_size
+
+
+def read_values(path: PathType,
+                tags: Sequence[TagPath],
+                exif_fields: Sequence[str],
+                parser_options: Dict[str, Any]) -> Dict[Union[TagPath, str], Any]:
+    """
+    Read values of tags and ExifInfo properties from the file (scan_paths worker).
+    The file is read at once (no memory mapping) by default: it's the fastest way for metadata only.
+    """
+    parser_options = {'mmap': False, 'buffered': True, **parser_options}
+
+    with JpegMetaParser.from_path(path, **parser_options) as parser:
+        return read_parser_values(parser, tags, exif_fields)
+
+
+def read_parser_values(parser: JpegMetaParser,
+                       tags: Sequence[TagPath],
+                       exif_fields: Sequence[str]) -> Dict[Union[TagPath, str], Any]:
+    values = {}
+    for tag in tags:
+        values[tag] = parser.get_tag_value(tag)
+    for name in exif_fields:
+        values[name] = getattr(parser.exif_info, name)
+
+    return values
+
+
+def check_exif_fields(exif_fields: Iterable[str]):
+    for name in exif_fields:
+        if not isinstance(getattr(ExifInfo, name, None), property):
+            raise ValueError(f'unknown ExifInfo field: {name}')
+
+
+def map_paths(function: Callable[[PathType], Any],
+              paths: Iterable[PathType],
+              workers: Optional[int]=None,
+              chunk_size: int=DEFAULT_CHUNK_SIZE,
+              ordered: bool=True,
+              pool: str='process',
+              collect_stats: bool=False) -> Iterator[BatchResult]:
+    """
+    Apply a function to each path in a pool of workers.
+    Exceptions are reported per file in BatchResult.error and don't abort the batch.
+    The number of chunks in flight is bounded, so `paths` can be a lazy iterable of any length.
+
+    pool: 'process' - process pool, the function and the results must be picklable;
+          'thread' - thread pool without pickling, parallel on free-threaded builds of CPython;
+          'interpreter' - pool of subinterpreters (Python 3.14+), the function must be picklable.
+    collect_stats: each call is instrumented in the worker thread (see instrument.collect),
+                   BatchResult.stats is Stats.to_dict() of the file: sum them up with instrument.Stats.merge().
+    """
+    if pool not in POOLS:
+        raise ValueError(f'pool must be one of {tuple(POOLS)}, got {pool!r}')
+
+    executor_class = POOLS[pool]
+    if executor_class is None:
+        raise ValueError(f'{pool} pool is not supported by Python {platform.python_version()}')
+
+    return _map_paths(function, paths, executor_class, workers=workers, chunk_size=chunk_size, ordered=ordered,
+                      collect_stats=collect_stats)
+
+
+def _map_paths(function: Callable[[PathType], Any],
+               paths: Iterable[PathType],
+               executor_class: type,
+               workers: Optional[int],
+               chunk_size: int,
+               ordered: bool,
+               collect_stats: bool) -> Iterator[BatchResult]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = iterate_chunks(paths, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from process_chunk(function, chunk, collect_stats)
+        return
+
+    executor: Executor = executor_class(max_workers=workers)
+    pending: Deque[Future] = deque()
+    max_pending = 2*workers
+
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(process_chunk, function, chunk, collect_stats))
+            if len(pending) >= max_pending:
+                yield from collect_results(pending, ordered)
+
+        while pending:
+            yield from collect_results(pending, ordered)
+    finally:
+        # the generator might be closed before all results are consumed
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def process_chunk(function: Callable[[PathType], Any], paths: List[PathType], collect_stats: bool=False) -> List[BatchResult]:
+    results = []
+
+    for path in paths:
+        if collect_stats:
+            with instrument.collect() as stats:
+                result = call(function, path)
+            results.append(result._replace(stats=stats.to_dict()))
+        else:
+            results.append(call(function, path))
+
+    return results
+
+
+def call(function: Callable[[PathType], Any], path: PathType) -> BatchResult:
+    try:
+        return BatchResult(path=path, data=function(path), error=None)
+    except Exception as e:
+        return BatchResult(path=path, data=None, error=f'{type(e).__name__}: {e}')
+
+
+def collect_results(pending: Deque[Future], ordered: bool) -> Iterator[BatchResult]:
+    """
+    Wait for the oldest chunk (ordered) or for any completed chunks and yield their results.
+    """
+    if ordered:
+        yield from pending.popleft().result()
+        return
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield from future.result()
+
+
+def iterate_chunks(paths: Iterable[PathType], chunk_size: int) -> Iterator[List[PathType]]:
+    iterator = iter(paths)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield chunk
@@ -0,0 +1,353 @@
+"""
+Persistent on-disk metadata cache (SQLite).
+
+Files are identified by (device, inode, size, mtime_ns), so unchanged files are answered
+from the cache with a single os.stat() call, the JPEG itself is not opened.
+Parser options which change the values (see VALUE_OPTIONS) are a part of the key.
+
+The total size of the records is a counter in the `state` table updated in the same transaction as the records,
+so a store costs a few indexed statements for any number of records. Hits don't write to the database:
+the new `last_used` times are kept in memory and written with the next store or on close(),
+a record used within LAST_USED_RESOLUTION_NS is not touched again.
+"""
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from jparse.log import logger
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.ExifSegment import ExifSegment
+from jparse.TagPath import TagPath
+
+
+PathType = Union[str, os.PathLike]
+
+DEFAULT_MAX_SIZE: int = 256*1024*1024  # bytes of cached records
+
+LAST_USED_RESOLUTION_NS: int = 60*1_000_000_000  # last_used of a hit is updated if it's older
+MAX_PENDING_TOUCHES: int = 4096                  # pending last_used updates are flushed at this number
+
+# parser options which change the cached values -> default value
+VALUE_OPTIONS: Dict[str, Any] = {
+    'rational_mode': 'fraction',
+    'only': None,
+    'max_prefix': None,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    file_key  TEXT PRIMARY KEY,
+    path      TEXT NOT NULL,
+    record    BLOB NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metadata_last_used ON metadata (last_used);
+CREATE INDEX IF NOT EXISTS metadata_path ON metadata (path);
+CREATE TABLE IF NOT EXISTS state (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO state (name, value) SELECT 'size', COALESCE(SUM(size), 0) FROM metadata;
+"""
+
+
+# segment table entry: (name, offset, size), e.g. ('APP1', 20, 1956)
+SegmentEntry = Tuple[str, int, int]
+
+# IFD directory entry: (tag_id, type_id, count, value_offset)
+FieldEntry = Tuple[int, int, int, int]
+
+
+class IfdEntry(NamedTuple):
+    index          : int
+    offset         : int
+    next_ifd_offset: int
+    fields         : Tuple[FieldEntry, ...]
+
+
+class CachedMetadata(NamedTuple):
+    segments: Tuple[SegmentEntry, ...]            # segment table from scan_jpeg_structure
+    ifds    : Dict[str, Tuple[IfdEntry, ...]]     # segment name -> IFD directories
+    values  : Dict[TagPath, Any]                  # decoded values of the requested tags, None if not found
+
+
+class MetadataCache:
+    """
+    Size-bounded LRU cache of the segment table, IFD directories and decoded tag values.
+
+        with MetadataCache('metadata.sqlite') as cache:
+            values = cache.get_tag_values('image.jpg', [TagPath('APP1', 0, 0x0110)])
+
+    Records are pickled: the cache file must be trusted like any other pickle.
+    """
+
+    @property
+    def path(self) -> PathType:
+        return self._path
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the cached records in bytes.
+        """
+        return self._connection.execute("SELECT value FROM state WHERE name = 'size'").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM metadata').fetchone()[0]
+
+    def __enter__(self) -> 'MetadataCache':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def __init__(self, path: PathType, max_size: int=DEFAULT_MAX_SIZE):
+        """
+        path: SQLite database file, created if it doesn't exist.
+        max_size: the least recently used records are evicted when the records take more bytes.
+        """
+        self._path = path
+        self._max_size = max_size
+
+        self._connection = sqlite3.connect(os.fspath(path))
+        self._connection.executescript(SCHEMA)
+
+        # file_key -> last_used of the hits which is not written yet
+        self._touched: Dict[str, int] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(path={str(self.path)!r}, hits={self.hits}, misses={self.misses})'
+
+
+    def close(self):
+        with self._connection:
+            self._flush_touched()
+        self._connection.close()
+
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'size': self.size,
+        }
+
+
+    def get(self, path: PathType, tags: Iterable[TagPath]=(), **parser_options) -> CachedMetadata:
+        """
+        Get the file metadata with values of `tags`.
+        The file is parsed only if it's not cached, changed or some tags are not cached yet.
+        parser_options: options of JpegMetaParser.from_path() used on a miss.
+        """
+        tags = tuple(tags)
+        file_key = make_file_key(path, parser_options)
+
+        record = self._load(file_key)
+        if record is not None and all(tag in record.values for tag in tags):
+            self._hits += 1
+            return record
+
+        self._misses += 1
+        known_values = {} if record is None else record.values
+        record = parse_metadata(path, tags, known_values, **parser_options)
+        self._store(file_key, path, record)
+
+        return record
+
+
+    def get_tag_values(self, path: PathType, tags: Iterable[TagPath], **parser_options) -> Dict[TagPath, Any]:
+        """
+        Values of `tags` (None if the tag isn't found), see get().
+        """
+        tags = tuple(tags)
+        record = self.get(path, tags, **parser_options)
+        return { tag: record.values[tag] for tag in tags }
+
+
+    def invalidate(self, path: PathType):
+        """
+        Remove all records of the path (including records of previous file versions).
+        """
+        with self._connection:
+            rows = self._connection.execute('SELECT file_key, size FROM metadata WHERE path = ?',
+                                            (os.path.abspath(path),)).fetchall()
+            self._delete(rows)
+
+
+    def clear(self):
+        self._touched.clear()
+        with self._connection:
+            self._connection.execute('DELETE FROM metadata')
+            self._connection.execute("UPDATE state SET value = 0 WHERE name = 'size'")
+
+
+    def _load(self, file_key: str) -> Optional[CachedMetadata]:
+        row = self._connection.execute('SELECT record, last_used FROM metadata WHERE file_key = ?', (file_key,)).fetchone()
+        if row is None:
+            return None
+
+        record, last_used = row
+        now = time.time_ns()
+        if now - last_used > LAST_USED_RESOLUTION_NS:
+            self._touched[file_key] = now
+            if len(self._touched) >= MAX_PENDING_TOUCHES:
+                with self._connection:
+                    self._flush_touched()
+
+        return pickle.loads(record)
+
+
+    def _store(self, file_key: str, path: PathType, record: CachedMetadata):
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        path = os.path.abspath(path)
+
+        with self._connection:
+            # the replaced record (the same file may be cached by another path: a renamed file)
+            # and the previous versions of the file, records of other parser options are kept
+            identity = file_key.split('/', 1)[0]
+            rows = self._connection.execute('SELECT file_key, size FROM metadata WHERE file_key = ? '
+                                            'OR (path = ? AND substr(file_key, 1, ?) != ?)',
+                                            (file_key, path, len(identity) + 1, identity + '/')).fetchall()
+            self._delete(rows)
+
+            self._connection.execute('INSERT INTO metadata (file_key, path, record, size, last_used) VALUES (?, ?, ?, ?, ?)',
+                                     (file_key, path, data, len(data), time.time_ns()))
+            self._add_size(len(data))
+
+            self._flush_touched()
+            self._evict()
+
+
+    def _evict(self):
+        excess = self.size - self._max_size
+        if excess <= 0:
+            return
+
+        # the least recently used records by the last_used index, only as many as needed
+        cursor = self._connection.execute('SELECT file_key, size FROM metadata ORDER BY last_used')
+        rows = []
+        while excess > 0:
+            batch = cursor.fetchmany(256)
+            if len(batch) == 0:
+                break
+            for file_key, size in batch:
+                if excess <= 0:
+                    break
+                rows.append((file_key, size))
+                excess -= size
+        cursor.close()
+
+        self._delete(rows)
+        self._evictions += len(rows)
+
+        logger.debug(f'[MetadataCache] evicted {len(rows)} records, size: {self.size} bytes')
+
+
+    def _delete(self, rows: Iterable[Tuple[str, int]]):
+        """
+        Delete the records (file_key, size) and subtract their sizes, inside a transaction.
+        """
+        rows = list(rows)
+        if len(rows) == 0:
+            return
+
+        self._connection.executemany('DELETE FROM metadata WHERE file_key = ?', [ (file_key,) for file_key, _ in rows ])
+        self._add_size(-sum(size for _, size in rows))
+        for file_key, _ in rows:
+            self._touched.pop(file_key, None)
+
+    def _add_size(self, delta: int):
+        self._connection.execute("UPDATE state SET value = value + ? WHERE name = 'size'", (delta,))
+
+    def _flush_touched(self):
+        """
+        Write the pending last_used times of the hits, inside a transaction.
+        """
+        if len(self._touched) == 0:
+            return
+
+        self._connection.executemany('UPDATE metadata SET last_used = ? WHERE file_key = ?',
+                                     [ (last_used, file_key) for file_key, last_used in self._touched.items() ])
+        self._touched.clear()
+
+
+def make_file_key(path: PathType, parser_options: Optional[Dict[str, Any]]=None) -> str:
+    """
+    File identity (device, inode, size, mtime_ns) and the parser options which change the values,
+    e.g. '2049:1234:5678:1700000000000000000/fraction:None:None'.
+    """
+    stat = os.stat(path)
+    return f'{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}/{options_key(parser_options or {})}'
+
+
+def options_key(parser_options: Dict[str, Any]) -> str:
+    values = []
+    for name, default in VALUE_OPTIONS.items():
+        value = parser_options.get(name, default)
+        if name == 'only' and value is not None:
+            value = ','.join(sorted(segment.upper() for segment in value))
+        values.append(str(value))
+
+    return ':'.join(values)
+
+
+def parse_metadata(path: PathType,
+                   tags: Iterable[TagPath],
+                   known_values: Dict[TagPath, Any],
+                   **parser_options) -> CachedMetadata:
+    """
+    Parse the segment table, IFD directories and values of `tags`.
+    """
+    parser_options = {'mmap': False, 'buffered': True, **parser_options}
+
+    with JpegMetaParser.from_path(path, **parser_options) as parser:
+        segments = tuple((segment.marker.name, segment.offset, segment.size) for segment in parser.structure)
+
+        ifds = {}
+        for segment in parser:
+            if isinstance(segment, ExifSegment):
+                ifds[segment.marker.name] = read_ifd_entries(segment)
+
+        values = dict(known_values)
+        for tag in tags:
+            values[tag] = parser.get_tag_value(tag)
+
+    return CachedMetadata(segments=segments, ifds=ifds, values=values)
+
+
+def read_ifd_entries(segment: ExifSegment) -> Tuple[IfdEntry, ...]:
+    entries = []
+
+    try:
+        # the main IFDs and the Exif, GPS and Interop sub-IFDs
+        for ifd in segment.walk_ifds():
+            fields = tuple((field.tag_id, int(field.field_type), field.count, field.value_offset) for field in ifd)
+            entries.append(IfdEntry(index=ifd.index, offset=ifd.offset, next_ifd_offset=ifd.next_ifd_offset, fields=fields))
+    except (RuntimeError, ValueError) as e:
+        # e.g. a custom APP segment which is not Exif-like, or its name can't be decoded (UnicodeDecodeError)
+        logger.debug(f'[MetadataCache] {segment.marker.name}: IFD parsing stopped: {e}')
+
+    return tuple(entries)
@@ -0,0 +1,307 @@
+"""
+Command-line tool: metadata of many JPEG files as JSON Lines or CSV.
+
+    jparse photos/ --fields make,model,datetime --workers 8 --stats > metadata.jsonl
+    jparse photos/ --tag APP1:0:0x0110 --format csv
+    jparse image.jpg --segments
+    jparse image.jpg --ifds
+
+Directories are walked recursively and lazily, the files are parsed by the batch process (or thread) pool
+and each record is written as soon as it's ready, so memory stays flat for any number of files.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from fractions import Fraction
+from functools import partial
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from jparse.info import __version__
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.ExifSegment import ExifSegment, SUB_IFDS
+from jparse.ExifInfo import FIELDS
+from jparse.TagPath import TagPath
+from jparse.batch import BatchResult, DEFAULT_CHUNK_SIZE, POOLS, map_paths
+
+
+DEFAULT_EXTENSIONS: Tuple[str, ...] = ('.jpg', '.jpeg', '.jpe', '.jfif')
+
+SEGMENT_COLUMNS = ('marker', 'name', 'offset', 'size')
+IFD_COLUMNS = ('segment', 'index', 'offset', 'fields', 'next_ifd_offset')
+
+
+def main(argv: Optional[Sequence[str]]=None) -> int:
+    arguments = parse_arguments(argv)
+
+    mode = 'segments' if arguments.segments else 'ifds' if arguments.ifds else 'fields'
+    tags = tuple(arguments.tags)
+    if arguments.fields is not None:
+        fields = tuple(arguments.fields)
+    else:
+        # all ExifInfo fields unless only raw tags are requested
+        fields = () if len(tags) > 0 else tuple(FIELDS)
+
+    function = partial(read_record, mode=mode, fields=fields, tags=tags)
+    paths = iterate_files(arguments.paths, extensions=tuple(arguments.extensions))
+    results = map_paths(function, paths, workers=arguments.workers, chunk_size=arguments.chunk_size,
+                        ordered=not arguments.unordered, pool=arguments.pool)
+
+    if arguments.format == 'csv':
+        writer = CsvWriter(sys.stdout, columns=csv_columns(mode, fields, tags))
+    else:
+        writer = JsonLinesWriter(sys.stdout)
+
+    stats = Stats()
+    try:
+        for result in results:
+            stats.add(result)
+            writer.write(result)
+    except BrokenPipeError:
+        # the output is closed early, e.g. `jparse photos/ | head`
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+    if arguments.stats:
+        print(stats.summary(), file=sys.stderr)
+
+    return 0
+
+
+def parse_arguments(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    arguments = argparse.ArgumentParser(prog='jparse', description='JPEG structure and Exif metadata as JSON Lines or CSV.')
+
+    arguments.add_argument('paths', nargs='+', help='files and directories (walked recursively)')
+
+    modes = arguments.add_mutually_exclusive_group()
+    modes.add_argument('--segments', action='store_true', help='list APP segments of each file')
+    modes.add_argument('--ifds', action='store_true', help='list IFDs of Exif-like segments of each file')
+
+    arguments.add_argument('--fields', type=parse_fields, metavar='NAMES',
+                           help='comma-separated ExifInfo fields, e.g. make,model,datetime (default: all)')
+    arguments.add_argument('--tag', dest='tags', type=parse_tag_path, action='append', default=[], metavar='TAG',
+                           help='raw tag APP:IFD:TAG, IFD is an index or Exif, GPS, Interop, e.g. APP1:0:0x0110 (repeatable)')
+    arguments.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help='output format (default: jsonl)')
+    arguments.add_argument('--ext', dest='extensions', type=parse_extensions, default=DEFAULT_EXTENSIONS, metavar='EXTS',
+                           help='comma-separated file extensions of directory walk (default: jpg,jpeg,jpe,jfif)')
+    arguments.add_argument('--workers', type=int, default=None, help='number of processes or threads (default: number of cores)')
+    arguments.add_argument('--pool', choices=tuple(POOLS), default='process',
+                           help='worker pool (default: process), thread - for free-threaded Python builds')
+    arguments.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='files per worker task')
+    arguments.add_argument('--unordered', action='store_true', help='write records in the completion order')
+    arguments.add_argument('--stats', action='store_true', help='print files/s and MB read to stderr')
+    arguments.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+
+    return arguments.parse_args(argv)
+
+
+def parse_fields(value: str) -> List[str]:
+    names = [ name.strip() for name in value.split(',') if name.strip() ]
+
+    unknown = [ name for name in names if name not in FIELDS ]
+    if len(unknown) > 0:
+        raise argparse.ArgumentTypeError(f'unknown fields: {", ".join(unknown)}')
+
+    return names
+
+
+def parse_tag_path(value: str) -> TagPath:
+    try:
+        app_name, ifd_number, tag_id = value.split(':')
+        if ifd_number.upper() in SUB_IFDS:
+            ifd_number = ifd_number.upper()
+        else:
+            ifd_number = int(ifd_number, 0)
+        return TagPath(app_name=app_name.upper(), ifd_number=ifd_number, tag_id=int(tag_id, 0))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid tag "{value}", expected APP:IFD:TAG, e.g. APP1:0:0x0110 or APP1:GPS:0x0002')
+
+
+def parse_extensions(value: str) -> Tuple[str, ...]:
+    return tuple('.' + extension.strip().lstrip('.').lower() for extension in value.split(',') if extension.strip())
+
+
+def format_tag_path(tag_path: TagPath) -> str:
+    return f'{tag_path.app_name}:{tag_path.ifd_number}:0x{tag_path.tag_id:04X}'
+
+
+def iterate_files(paths: Iterable[str], extensions: Tuple[str, ...]) -> Iterator[str]:
+    """
+    Files and files of the directories (recursively, in a stable order) with the extensions.
+    The walk is lazy: the batch pool starts before the whole tree is listed.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(directory, name)
+
+
+def read_record(path: str, mode: str, fields: Sequence[str], tags: Sequence[TagPath]) -> Tuple[Dict[str, Any], int]:
+    """
+    Parse the file (map_paths worker): returns (record, bytes read).
+    The file is read once up to SOS (see JpegMetaParser(streaming=True)), only APP1 is needed for fields and tags.
+    """
+    wanted_segments = None
+    if mode == 'fields':
+        wanted_segments = { tag_path.app_name for tag_path in tags } | ({'APP1'} if len(fields) > 0 else set())
+
+    with open(path, 'rb') as file:
+        parser = JpegMetaParser(file, streaming=True, only=wanted_segments, rational_mode='float')
+
+        if mode == 'segments':
+            record = { 'segments': [ segment_record(segment) for segment in parser ] }
+        elif mode == 'ifds':
+            record = { 'ifds': [ ifd_record(segment, ifd) for segment in parser if isinstance(segment, ExifSegment)
+                                                          for ifd in iterate_ifds(segment) ] }
+        else:
+            record = parser.exif_info.to_dict(fields) if len(fields) > 0 else {}
+            if len(tags) > 0:
+                values = parser.get_tag_values(tags)
+                record.update(zip(map(format_tag_path, tags), values))
+
+        return record, file.tell()
+
+
+def segment_record(segment) -> Dict[str, Any]:
+    return { 'marker': segment.marker.name, 'name': segment.name, 'offset': segment.offset, 'size': segment.size }
+
+
+def ifd_record(segment: ExifSegment, ifd) -> Dict[str, Any]:
+    return { 'segment': segment.marker.name, 'index': ifd.index, 'offset': ifd.offset,
+             'fields': len(ifd), 'next_ifd_offset': ifd.next_ifd_offset }
+
+
+def iterate_ifds(segment: ExifSegment) -> Iterator:
+    """
+    IFDs of the segment: a custom APP segment might be not Exif-like, it has no IFDs then.
+    """
+    try:
+        yield from segment
+    except RuntimeError:
+        return
+
+
+def to_json(value: Any) -> Any:
+    """
+    json.dumps() default: values which are not JSON types.
+    """
+    if isinstance(value, Fraction):
+        return float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def finite(value: Any) -> Any:
+    """
+    Non-finite floats as None: rationals with a zero denominator are inf or nan in the float mode
+    and NaN/Infinity are not valid JSON.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return { key: finite(item) for key, item in value.items() }
+    if isinstance(value, (tuple, list)):
+        return [ finite(item) for item in value ]
+    return value
+
+
+class JsonLinesWriter:
+    """
+    One JSON object per file: {"path": ..., <values>} or {"path": ..., "error": ...}.
+    """
+
+    def __init__(self, output: IO):
+        self._output = output
+
+    def write(self, result: BatchResult):
+        if result.ok:
+            record, _ = result.data
+            record = { 'path': result.path, **record }
+        else:
+            record = { 'path': result.path, 'error': result.error }
+
+        self._output.write(json.dumps(finite(record), default=to_json, allow_nan=False) + '\n')
+
+
+class CsvWriter:
+    """
+    One row per file, segment or IFD (see csv_columns): sequences are written as JSON arrays.
+    """
+
+    def __init__(self, output: IO, columns: Sequence[str]):
+        self._writer = csv.writer(output)
+        self._columns = columns
+        self._writer.writerow(columns)
+
+    def write(self, result: BatchResult):
+        if not result.ok:
+            self._write_row({ 'path': result.path, 'error': result.error })
+            return
+
+        record, _ = result.data
+        rows = record.get('segments', record.get('ifds'))
+        if rows is None:
+            self._write_row({ 'path': result.path, **record })
+            return
+
+        for row in rows:
+            self._write_row({ 'path': result.path, **row })
+
+    def _write_row(self, row: Dict[str, Any]):
+        self._writer.writerow([ format_csv_value(row.get(column)) for column in self._columns ])
+
+
+def csv_columns(mode: str, fields: Sequence[str], tags: Sequence[TagPath]) -> Tuple[str, ...]:
+    if mode == 'segments':
+        return ('path', *SEGMENT_COLUMNS, 'error')
+    if mode == 'ifds':
+        return ('path', *IFD_COLUMNS, 'error')
+
+    return ('path', *fields, *map(format_tag_path, tags), 'error')
+
+
+def format_csv_value(value: Any) -> Any:
+    value = finite(value)
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return json.dumps(value, default=to_json, allow_nan=False)
+    return value
+
+
+class Stats:
+
+    def __init__(self):
+        self.files = 0
+        self.errors = 0
+        self.bytes_read = 0
+        self._start = time.perf_counter()
+
+    def add(self, result: BatchResult):
+        self.files += 1
+        if result.ok:
+            self.bytes_read += result.data[1]
+        else:
+            self.errors += 1
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self._start
+        files_per_second = self.files / elapsed if elapsed > 0 else 0.0
+        return (f'files: {self.files}, errors: {self.errors}, time: {elapsed:.2f} s, '
+                f'{files_per_second:.1f} files/s, read: {self.bytes_read/(1024*1024):.2f} MB')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import struct
+import threading
+from itertools import repeat
+from operator import truediv
+from fractions import Fraction
+from typing import Dict, Tuple, Union
+from numbers import Number
+
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+from jparse.RawRational import RawRational, divide
+
+
+# Precompiled decoders: format strings are parsed once at import time instead of on every value.
+
+UINT16: dict[ByteOrder, struct.Struct] = {
+    byte_order: struct.Struct(f'{byte_order.value}H') for byte_order in ByteOrder
+}
+
+UINT32: dict[ByteOrder, struct.Struct] = {
+    byte_order: struct.Struct(f'{byte_order.value}I') for byte_order in ByteOrder
+}
+
+# IFD field header: tag_id, type_id, count, value (or value offset)
+FIELD_HEADER: dict[ByteOrder, struct.Struct] = {
+    byte_order: struct.Struct(f'{byte_order.value}HHII') for byte_order in ByteOrder
+}
+
+# single element of each field type: rationals are decoded as (numerator, denominator)
+VALUE: dict[Tuple[ByteOrder, FieldType], struct.Struct] = {
+    (byte_order, field_type): struct.Struct(f'{byte_order.value}{2 if field_type.is_rational else 1}{field_type.type_chr}')
+    for byte_order in ByteOrder
+    for field_type in FieldType if field_type != FieldType.Unknown
+}
+
+VALUE_TYPES = frozenset(field_type for field_type in FieldType if field_type != FieldType.Unknown)
+RATIONAL_TYPES = frozenset((FieldType.Rational, FieldType.SRational))
+
+# representations of Rational/SRational values:
+#   'fraction' - Fraction (normalized with gcd), a zero denominator raises ZeroDivisionError,
+#   'float'    - float, a zero denominator gives inf or nan,
+#   'tuple'    - (numerator, denominator),
+#   'lazy'     - RawRational: (numerator, denominator) tuple converted to Fraction on request
+RATIONAL_MODES = ('fraction', 'float', 'tuple', 'lazy')
+
+ARRAY_STRUCT_CACHE_SIZE: int = 512  # decoders per thread, see array_struct()
+
+# the tables above are read-only after import, the array decoders are cached per thread:
+# threads of a thread pool (free-threaded builds) don't share mutable state
+_thread_local = threading.local()
+
+
+def array_struct(byte_order: ByteOrder, field_type: FieldType, count: int) -> struct.Struct:
+    """
+    Decoder for the whole array of `count` elements, e.g. '<256H'.
+    """
+    if count == 1:
+        return VALUE[(byte_order, field_type)]
+
+    try:
+        cache: Dict[Tuple[ByteOrder, FieldType, int], struct.Struct] = _thread_local.array_structs
+    except AttributeError:
+        cache = _thread_local.array_structs = {}
+
+    key = (byte_order, field_type, count)
+    decoder = cache.get(key)
+    if decoder is None:
+        if len(cache) >= ARRAY_STRUCT_CACHE_SIZE:
+            cache.clear()
+
+        item_count = 2*count if field_type in RATIONAL_TYPES else count
+        decoder = cache[key] = struct.Struct(f'{byte_order.value}{item_count}{field_type.type_chr}')
+
+    return decoder
+
+
+def unpack_array(data: bytes,
+                 count: int,
+                 field_type: FieldType,
+                 byte_order: ByteOrder,
+                 offset: int=0,
+                 rational_mode: str='fraction') -> Tuple[Number, ...]:
+    """
+    Decode `count` elements of `field_type` with a single unpack_from() call.
+    Rational and SRational elements are returned as specified by `rational_mode` (see RATIONAL_MODES).
+    """
+    if field_type not in VALUE_TYPES:
+        raise NotImplementedError('can not parse unknown value type')
+
+    items = array_struct(byte_order, field_type, count).unpack_from(data, offset)
+
+    if field_type in RATIONAL_TYPES:
+        return make_rationals(items[0::2], items[1::2], rational_mode)
+
+    return items
+
+
+def make_rationals(numerators: Tuple[int, ...], denominators: Tuple[int, ...], rational_mode: str) -> tuple:
+    if rational_mode == 'fraction':
+        return tuple(map(Fraction, numerators, denominators))
+
+    if rational_mode == 'float':
+        try:
+            return tuple(map(truediv, numerators, denominators))
+        except ZeroDivisionError:
+            return tuple(map(divide, numerators, denominators))
+
+    if rational_mode == 'tuple':
+        return tuple(zip(numerators, denominators))
+
+    if rational_mode == 'lazy':
+        # tuple.__new__ directly: the generated NamedTuple.__new__ is a Python function
+        return tuple(map(tuple.__new__, repeat(RawRational), zip(numerators, denominators)))
+
+    raise ValueError(f'rational_mode must be one of {RATIONAL_MODES}, got {rational_mode!r}')
+
+
+def decode_ascii(data: bytes, count: int, offset: int=0) -> str:
+    """
+    Decode ASCII value: null characters (terminator and padding) are dropped.
+    """
+    return bytes(data[offset:offset + count]).replace(b'\x00', b'').decode('ascii')
+
+
+def unpack_element(data: bytes,
+                   field_type: FieldType,
+                   byte_order: ByteOrder,
+                   offset: int=0,
+                   rational_mode: str='fraction') -> Union[Number, bytes]:
+    """
+    Decode a single element of `field_type`.
+    """
+    items = VALUE[(byte_order, field_type)].unpack_from(data, offset)
+
+    if field_type in RATIONAL_TYPES:
+        return make_rationals(items[0:1], items[1:2], rational_mode)[0]
+
+    return items[0]
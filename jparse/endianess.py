@@ -6,22 +6,33 @@ class ByteOrder(Enum):
     LITTLE_ENDIAN = '<'
     BIG_ENDIAN = '>'
 
+    # members are singletons: identity hash is valid and much faster than Enum.__hash__,
+    # ByteOrder is a key of the decoder tables which are used for each field
+    __hash__ = object.__hash__
+
 
 TYPE_STR_MAPPING: dict[int, chr] = { 1: 'B', 2: 'H', 4: 'I' }
 
+# precompiled decoders to avoid format string building and parsing on each call
+STRUCT_MAPPING: dict[tuple[ByteOrder, chr], struct.Struct] = {
+    (byte_order, data_type): struct.Struct(f'{byte_order.value}{data_type}')
+    for byte_order in ByteOrder
+    for data_type in 'cbBhHiIlLqQfd'
+}
 
-def convert(data: bytes, byte_order: ByteOrder, data_type: chr=None):
-    byte_order = '<' if byte_order == ByteOrder.LITTLE_ENDIAN else '>'
-    # Note: byte_order = byte_order.value is slower
 
+def convert(data: bytes, byte_order: ByteOrder, data_type: chr=None):
     if data_type is None:
         # type auto-detection by size
         byte_cnt = len(data)
         assert byte_cnt in (1, 2, 4), 'unsupported data size'
         data_type = TYPE_STR_MAPPING[byte_cnt]
 
-    result = struct.unpack(f'{byte_order}{data_type}', data)
-    return result[0]
+    decoder = STRUCT_MAPPING.get((byte_order, data_type))
+    if decoder is None:
+        return struct.unpack(f'{byte_order.value}{data_type}', data)[0]
+
+    return decoder.unpack(data)[0]
 
 
 def convert_big_endian(data: bytes) -> int:
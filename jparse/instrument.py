@@ -0,0 +1,159 @@
+"""
+Opt-in instrumentation: I/O counters and wall time per parsing stage of the parsers of a thread.
+
+    from jparse import instrument
+
+    stats = instrument.enable()
+    with JpegMetaParser.from_path('image.jpg') as parser:
+        print(parser.exif_info)
+    print(stats.to_dict())   # e.g. for a Prometheus exporter
+    instrument.disable()
+
+    with instrument.collect() as stats:
+        ...
+
+Collection is per thread: each thread enables its own Stats, so threads of a pool don't contend for one lock
+(pass the same Stats to enable() in several threads to collect them together). Batch workers collect per file
+with map_paths(..., collect_stats=True) and the results are merged by Stats.merge(BatchResult.stats).
+
+When it's disabled, the hot paths check one thread-local attribute (`current.stats is None`) and nothing else.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+from jparse.BufferStream import BufferStream
+from jparse.PageCacheStream import PageCacheStream
+
+
+# wall time is measured for the stages:
+#   scan         - segment scan up to SOS (scan_jpeg_structure, scan_jpeg_stream), without scan_for_eoi
+#   app_header   - APP segment header: name and TIFF header (AppSegment.load, ExifSegment.load)
+#   ifd_decode   - IFD directory: field count and field headers (IFD, ColumnarIFD)
+#   value_decode - field value read and decoding (IfdField.load)
+#   scan_for_eoi - image data scan for EOI (estimate_image_size=True)
+STAGES = ('scan', 'app_header', 'ifd_decode', 'value_decode', 'scan_for_eoi')
+
+# bytes_read, read_calls, seek_calls - reads of files and other streams
+# buffer_bytes, buffer_reads         - reads of in-memory buffers (buffered mode, memory-mapped files, page cache)
+COUNTERS = ('parsers', 'bytes_read', 'read_calls', 'seek_calls', 'buffer_bytes', 'buffer_reads',
+            'fields_parsed', 'values_decoded')
+
+# reads of these streams are served from memory
+MEMORY_STREAMS = (BufferStream, PageCacheStream)
+
+
+class Stats:
+    """
+    Counters and stage times. Thread-safe: parsers of many threads can share it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self._calls: Dict[str, int] = dict.fromkeys(STAGES, 0)
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.to_dict()})'
+
+
+    def count(self, counter: str, value: int=1):
+        with self._lock:
+            self._counters[counter] += value
+
+    def count_read(self, stream, size: int):
+        with self._lock:
+            if isinstance(stream, MEMORY_STREAMS):
+                self._counters['buffer_reads'] += 1
+                self._counters['buffer_bytes'] += size
+            else:
+                self._counters['read_calls'] += 1
+                self._counters['bytes_read'] += size
+
+    def count_seek(self, stream):
+        if isinstance(stream, MEMORY_STREAMS):
+            return  # only the buffer position
+        with self._lock:
+            self._counters['seek_calls'] += 1
+
+    def add_time(self, stage: str, seconds: float):
+        with self._lock:
+            self._seconds[stage] += seconds
+            self._calls[stage] += 1
+
+
+    def merge(self, values: Optional[Dict[str, Union[int, float]]]):
+        """
+        Add the counters and stage times of another Stats.to_dict() (e.g. BatchResult.stats), None is ignored.
+        """
+        if values is None:
+            return
+        with self._lock:
+            for counter in COUNTERS:
+                self._counters[counter] += values.get(counter, 0)
+            for stage in STAGES:
+                self._seconds[stage] += values.get(f'{stage}_seconds', 0.0)
+                self._calls[stage] += values.get(f'{stage}_calls', 0)
+
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        """
+        Flat dict: counters and `<stage>_seconds`, `<stage>_calls` of each stage.
+        """
+        with self._lock:
+            result: Dict[str, Union[int, float]] = dict(self._counters)
+            for stage in STAGES:
+                result[f'{stage}_seconds'] = self._seconds[stage]
+                result[f'{stage}_calls'] = self._calls[stage]
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._counters = dict.fromkeys(COUNTERS, 0)
+            self._seconds = dict.fromkeys(STAGES, 0.0)
+            self._calls = dict.fromkeys(STAGES, 0)
+
+
+class Current(threading.local):
+
+    def __init__(self):
+        # Stats collected by the parsers of the thread or None if the instrumentation is disabled,
+        # an instance attribute: a class attribute default is looked up slower
+        self.stats: Optional[Stats] = None
+
+
+current = Current()
+
+
+def enable(stats: Optional[Stats]=None) -> Stats:
+    """
+    Start collecting into `stats` (a new Stats by default) in the current thread and return it.
+    """
+    current.stats = Stats() if stats is None else stats
+    return current.stats
+
+
+def disable() -> Optional[Stats]:
+    """
+    Stop collecting in the current thread, returns the collected Stats.
+    """
+    stats, current.stats = current.stats, None
+    return stats
+
+
+def is_enabled() -> bool:
+    return current.stats is not None
+
+
+@contextmanager
+def collect(stats: Optional[Stats]=None) -> Iterator[Stats]:
+    """
+    Collect within the `with` block in the current thread, the previous state is restored after it.
+    """
+    previous = current.stats
+    try:
+        yield enable(stats)
+    finally:
+        current.stats = previous
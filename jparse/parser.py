@@ -1,15 +1,52 @@
-from typing import IO
+from io import SEEK_END
+from time import perf_counter
+from typing import IO, Optional
 from jparse import endianess
+from jparse import instrument
 from jparse.JpegMarker import JpegMarker, EOI, SOI
 
 
+APP_NAME_CHUNK_SIZE: int = 32  # bytes
+EOI_SCAN_CHUNK_SIZE: int = 1 << 20  # bytes
+EOI_TAIL_SIZE: int = 64  # bytes
+SKIP_CHUNK_SIZE: int = 64*1024  # bytes, see skip_bytes()
+
+EOI_BYTES: bytes = EOI.signature.to_bytes(JpegMarker.MARKER_SIZE, 'big')
+
+
 def align4(addr: int) -> int:
     addr += (4 - (addr & 0x3)) & 0x3
     return addr
 
 
-def read_bytes_strict(stream: IO, count: int) -> bytes:
+def read_bytes(stream: IO, count: int) -> bytes:
+    """
+    Read up to `count` bytes: less bytes are returned only at the end of the stream.
+    Pipes and sockets may return less data than requested before the end, the read is continued.
+    """
     data = stream.read(count)
+    stats = instrument.current.stats
+    if stats is not None:
+        stats.count_read(stream, len(data))
+    if len(data) == count or len(data) == 0:
+        return data
+
+    chunks = [ bytes(data) ]
+    received = len(data)
+    while received < count:
+        chunk = stream.read(count - received)
+        if stats is not None:
+            stats.count_read(stream, len(chunk))
+        if len(chunk) == 0:
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+
+    return b''.join(chunks)
+
+
+def read_bytes_strict(stream: IO, count: int) -> bytes:
+    data = read_bytes(stream, count)
 
     if len(data) != count:
         raise RuntimeError('unexpected end of stream')
@@ -17,42 +54,154 @@ def read_bytes_strict(stream: IO, count: int) -> bytes:
     return data
 
 
-def parse_app_name(stream: IO) -> str:
-    name = ''
+def skip_bytes(stream: IO, count: int, chunk_size: int=SKIP_CHUNK_SIZE):
+    """
+    Skip `count` bytes of a forward-only stream (no seek): the data is read in chunks and dropped.
+    """
+    stats = instrument.current.stats
+    while count > 0:
+        chunk = stream.read(min(count, chunk_size))
+        if stats is not None:
+            stats.count_read(stream, len(chunk))
+        if len(chunk) == 0:
+            raise RuntimeError('unexpected end of stream')
+        count -= len(chunk)
+
+
+def read_at(stream: IO, offset: int, count: int) -> bytes:
+    """
+    Read exactly `count` bytes from the absolute `offset`.
+    """
+    data = read_at_most(stream, offset, count)
+    if len(data) != count:
+        raise RuntimeError('unexpected end of stream')
+    return data
+
+
+def read_at_most(stream: IO, offset: int, count: int) -> bytes:
+    """
+    Read up to `count` bytes from the absolute `offset`: less bytes are returned only at the end of the stream.
+    Streams with positional reads (read_at method: BufferStream, PositionalStream, PageCacheStream)
+    are read without changing the stream position, so the read is safe for concurrent threads.
+    """
+    stats = instrument.current.stats
+
+    positional_read = getattr(stream, 'read_at', None)
+    if positional_read is None:
+        stream.seek(offset)
+        if stats is not None:
+            stats.count_seek(stream)
+        return read_bytes(stream, count)  # the reads are counted by read_bytes()
+
+    data = positional_read(offset, count)
+    if stats is not None:
+        stats.count_read(stream, len(data))
+    return data
+
+
+def parse_app_name(stream: IO, offset: int) -> str:
+    """
+    Read the null-terminated name of an APP segment located at `offset`.
+    The name is read in chunks instead of byte by byte.
+    """
+    name = b''
 
     while True:
-        byte = read_bytes_strict(stream, 1)
+        chunk = bytes(read_at_most(stream, offset + len(name), APP_NAME_CHUNK_SIZE))
+        if len(chunk) == 0:
+            raise RuntimeError('unexpected end of stream')
 
-        if byte[0] == 0x00:
+        end = chunk.find(0x00)
+        if end >= 0:
+            name += chunk[:end]
             break
 
-        name += byte.decode('ascii')
+        name += chunk
+
+    return name.decode('ascii')
+
+
+def scan_for_eoi(stream: IO, from_end: bool=False, chunk_size: int=EOI_SCAN_CHUNK_SIZE) -> int:
+    """
+    Find EOI marker in the image data starting from the current stream position.
+    Returns EOI offset relative to the start position or 0 if EOI is not found.
+
+    The data is scanned in large chunks with bytes.find(): byte-stuffed 0xFF00 in the entropy-coded data
+    can't match 0xFFD9, so the first 0xFFD9 is EOI.
+
+    from_end: check the end of the file first (EOI is almost always the last 2 bytes),
+              the forward scan is used if EOI is not found there.
+              Note: it's not reliable if there is data after EOI which contains another EOI
+                    (e.g. images appended by Multi-Picture Format).
+    """
+    stats = instrument.current.stats
+    if stats is None:
+        return _find_eoi(stream, from_end, chunk_size, stats)
+
+    start_time = perf_counter()
+    try:
+        return _find_eoi(stream, from_end, chunk_size, stats)
+    finally:
+        stats.add_time('scan_for_eoi', perf_counter() - start_time)
 
-    return name
 
+def _find_eoi(stream: IO, from_end: bool, chunk_size: int, stats: Optional[instrument.Stats]) -> int:
+    start = stream.tell()
+
+    if from_end:
+        offset = _scan_tail_for_eoi(stream, start, stats)
+        if offset > 0:
+            return offset
+        stream.seek(start)
+        if stats is not None:
+            stats.count_seek(stream)
 
-def scan_for_eoi(stream: IO) -> int:
     offset = 0
+    ends_with_marker_start = False
 
     while True:
-        marker = stream.read(1)
-        if len(marker) < 1:
+        chunk = stream.read(chunk_size)
+        if stats is not None:
+            stats.count_read(stream, len(chunk))
+        if len(chunk) == 0:
             return 0  # not found
 
-        offset += 1
-        if marker[0] != JpegMarker.START:
-            continue
+        if not isinstance(chunk, bytes):
+            chunk = bytes(chunk)
 
-        marker = stream.read(1)
-        if len(marker) < 1:
-            return 0  # not found
+        # the marker might straddle the chunks boundary
+        if ends_with_marker_start and chunk[0] == EOI_BYTES[1]:
+            return offset - 1
+
+        index = chunk.find(EOI_BYTES)
+        if index >= 0:
+            return offset + index
+
+        ends_with_marker_start = chunk[-1] == JpegMarker.START
+        offset += len(chunk)
+
+
+def _scan_tail_for_eoi(stream: IO, start: int, stats: Optional[instrument.Stats]) -> int:
+    """
+    Look for EOI at the end of the file, a short zero padding after EOI is allowed.
+    Returns EOI offset relative to `start` or 0 if EOI is not found.
+    """
+    end = stream.seek(0, SEEK_END)
+    tail_offset = max(start, end - EOI_TAIL_SIZE)
+
+    stream.seek(tail_offset)
+    tail = bytes(stream.read(end - tail_offset))
 
-        if marker[0] == (EOI.signature & 0xFF):
-            return offset -1
+    if stats is not None:
+        stats.count_seek(stream)
+        stats.count_seek(stream)
+        stats.count_read(stream, len(tail))
 
-        offset += 1
+    index = tail.rfind(EOI_BYTES)
+    if index < 0 or tail[index + len(EOI_BYTES):].strip(b'\x00'):
+        return 0
 
-    return 0
+    return tail_offset + index - start
 
 
 def read_jpeg_signature(stream: IO):
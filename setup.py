@@ -2,7 +2,7 @@
 if __name__ == '__main__':
     # import info without executing __init__
     import sys
-    sys.path.append('uplot')
+    sys.path.append('jparse')
     import info
     import setuptools
 
@@ -14,6 +14,12 @@ if __name__ == '__main__':
         author_email=info.__email__,
         license=info.__license__,
         url='https://github.com/MakarovDi/jparse',
-        packages=setuptools.find_namespace_packages(),
-        python_requires='>=3.7'
+        packages=setuptools.find_namespace_packages(include=['jparse', 'jparse.*']),
+        python_requires='>=3.7',
+        extras_require={
+            'numpy': ['numpy'],
+        },
+        entry_points={
+            'console_scripts': ['jparse = jparse.cli:main'],
+        }
     )
\ No newline at end of file
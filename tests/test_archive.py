@@ -0,0 +1,63 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from jparse.archive import MemberPath, scan_archives
+
+from benchmarks import synthetic
+
+
+@pytest.fixture
+def jpeg_data():
+    return synthetic.generate_jpeg(synthetic.JpegSpec(scan_size=256))
+
+
+@pytest.fixture
+def archives(tmp_path, jpeg_data):
+    good_zip = tmp_path / 'good.zip'
+    with zipfile.ZipFile(good_zip, 'w') as archive:
+        archive.writestr('a.jpg', jpeg_data)
+        archive.writestr('b.jpg', jpeg_data)
+
+    # valid end of central directory record, broken central directory
+    data = bytearray(good_zip.read_bytes())
+    start = data.find(b'PK\x01\x02')
+    data[start:start + 4] = b'XXXX'
+    bad_zip = tmp_path / 'bad.zip'
+    bad_zip.write_bytes(bytes(data))
+    assert zipfile.is_zipfile(bad_zip)
+
+    good_tar = tmp_path / 'good.tar'
+    with tarfile.open(good_tar, 'w') as archive:
+        info = tarfile.TarInfo('c.jpg')
+        info.size = len(jpeg_data)
+        archive.addfile(info, io.BytesIO(jpeg_data))
+
+    not_archive = tmp_path / 'text.txt'
+    not_archive.write_bytes(b'not an archive')
+
+    return str(good_zip), str(bad_zip), str(good_tar), str(not_archive)
+
+
+@pytest.mark.parametrize('pool, workers', [ ('thread', 1), ('thread', 4), ('process', 2) ])
+def test_broken_archives_dont_abort_batch(archives, pool, workers):
+    good_zip, bad_zip, good_tar, not_archive = archives
+
+    results = list(scan_archives([ bad_zip, good_zip, not_archive, good_tar ], exif_fields=[ 'make' ],
+                                 workers=workers, chunk_size=1, pool=pool))
+
+    assert [ result.path for result in results ] == [ bad_zip, MemberPath(good_zip, 'a.jpg'), MemberPath(good_zip, 'b.jpg'),
+                                                      not_archive, MemberPath(good_tar, 'c.jpg') ]
+
+    assert results[0].error.startswith('BadZipFile: ')
+    assert results[3].error.startswith('ReadError: ')
+    for result in (results[1], results[2], results[4]):
+        assert result.ok
+        assert result.data == { 'make': 'Synthetic' }
+
+
+def test_unknown_pool(archives):
+    with pytest.raises(ValueError):
+        list(scan_archives(archives[:1], pool='fiber'))
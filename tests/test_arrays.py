@@ -0,0 +1,99 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from jparse import arrays
+from jparse.BufferStream import BufferStream
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+from benchmarks import synthetic
+
+
+BYTE_ORDERS = [ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ]
+
+# field type, element dtype, value: every value is stored out of the field header
+ENTRIES = [
+    (FieldType.Byte,      'u1', tuple(range(250, 256))),
+    (FieldType.Short,     'u2', (1, 0x0102, 0xFFFF)),
+    (FieldType.Long,      'u4', (1, 0x01020304, 0xFFFFFFFF)),
+    (FieldType.SByte,     'i1', (-128, -1, 0, 1, 127)),
+    (FieldType.Undefined, 'u1', (0, 1, 2, 0xFE, 0xFF)),
+    (FieldType.SShort,    'i2', (-32768, -2, 0x0102)),
+    (FieldType.SLong,     'i4', (-2**31, 0x01020304)),
+    (FieldType.Float,     'f4', (1.5, -0.25)),
+    (FieldType.Double,    'f8', (2.25, -1e300)),
+    (FieldType.Rational,  'u4', ((72, 1), (0x01020304, 0xFFFFFFFF))),
+    (FieldType.SRational, 'i4', ((-1, 3), (5, -7))),
+]
+
+
+def ifd0_fields(byte_order: ByteOrder) -> dict:
+    entries = [ (0x0100 + i, field_type, value) for i, (field_type, _, value) in enumerate(ENTRIES) ]
+    entries.append((0x0200, FieldType.ASCII, 'Synthetic'))
+
+    tiff = synthetic.encode_tiff([ entries ], byte_order)
+    ifd = JpegMetaParser(BufferStream(synthetic.encode_jpeg(tiff)), rational_mode='tuple')['APP1'].ifd(0)
+    return { field.field_type: field for field in ifd }
+
+
+def expected_dtype(code: str, byte_order: ByteOrder) -> str:
+    # single byte elements have no byte order
+    return f'|{code}' if code[1] == '1' else f'{byte_order.value}{code}'
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('field_type, code, value', ENTRIES, ids=[ entry[0].name for entry in ENTRIES ])
+def test_as_array(byte_order, field_type, code, value):
+    field = ifd0_fields(byte_order)[field_type]
+    array = field.as_array()
+
+    assert array.dtype.str == expected_dtype(code, byte_order)
+    assert array.dtype == arrays.numpy_dtype(field_type, byte_order)
+    assert not array.flags.writeable
+
+    if field_type.is_rational:
+        assert array.shape == (len(value), 2)
+        assert [ tuple(pair) for pair in array.tolist() ] == list(value) == list(field.value)
+    else:
+        assert array.shape == (len(value),)
+        assert array.tolist() == list(value)
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('field_type', [ FieldType.Rational, FieldType.SRational ], ids=lambda field_type: field_type.name)
+def test_rationals_as_float(byte_order, field_type):
+    field = ifd0_fields(byte_order)[field_type]
+    array = field.as_array(rationals='float')
+
+    assert array.dtype == numpy.float64
+    assert array.tolist() == [ numerator/denominator for numerator, denominator in field.value ]
+
+
+def test_ascii():
+    field = ifd0_fields(ByteOrder.BIG_ENDIAN)[FieldType.ASCII]
+    array = field.as_array()
+
+    assert array.dtype.str == '|S1'
+    assert array.tobytes() == b'Synthetic\x00'
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+def test_zero_denominator(byte_order):
+    data = numpy.array([ 1, 2, 1, 0, 0, 0 ], dtype=f'{byte_order.value}u4').tobytes()
+
+    value = arrays.unpack_ndarray(data, 3, FieldType.Rational, byte_order, rationals='float')
+    assert value[0] == 0.5 and numpy.isinf(value[1]) and numpy.isnan(value[2])
+
+
+def test_invalid_arguments(monkeypatch):
+    with pytest.raises(ValueError):
+        arrays.unpack_ndarray(b'\x00'*8, 1, FieldType.Rational, ByteOrder.LITTLE_ENDIAN, rationals='fraction')
+    with pytest.raises(NotImplementedError):
+        arrays.numpy_dtype(FieldType.Unknown, ByteOrder.LITTLE_ENDIAN)
+
+    monkeypatch.setattr(arrays, 'numpy', None)
+    assert not arrays.is_available()
+    with pytest.raises(RuntimeError):
+        arrays.numpy_dtype(FieldType.Short, ByteOrder.LITTLE_ENDIAN)
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from jparse.AsyncJpegMetaParser import AsyncJpegMetaParser, BytesRangeReader, FileRangeReader, coalesce_ranges
+from jparse.BufferStream import BufferStream
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+from jparse.endianess import ByteOrder
+
+from benchmarks import synthetic
+
+
+TAGS = [ TagPath('APP1', 0, 0x010F), TagPath('APP1', 0, 0x011A), TagPath('APP1', 'Exif', 0x829A),
+         TagPath('APP1', 0, 0x9999) ]
+
+
+@pytest.fixture(params=[ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ])
+def jpeg_data(request) -> bytes:
+    return synthetic.generate_jpeg(synthetic.JpegSpec(byte_order=request.param, app_count=2, field_count=10,
+                                                      scan_size=128*1024))
+
+
+def open_parser(reader, **kwargs) -> AsyncJpegMetaParser:
+    return asyncio.run(AsyncJpegMetaParser.open(reader, **kwargs))
+
+
+@pytest.mark.parametrize('ranges, max_gap, expected', [
+    ([], 0, []),
+    ([ (0, 10) ], 0, [ (0, 10) ]),
+    # adjacent
+    ([ (0, 10), (10, 5) ], 0, [ (0, 15) ]),
+    # overlapping and contained
+    ([ (0, 10), (5, 10) ], 0, [ (0, 15) ]),
+    ([ (0, 20), (5, 5) ], 0, [ (0, 20) ]),
+    # separated by a gap
+    ([ (0, 10), (11, 5) ], 0, [ (0, 10), (11, 5) ]),
+    ([ (0, 10), (14, 6) ], 4, [ (0, 20) ]),
+    ([ (0, 10), (15, 5) ], 4, [ (0, 10), (15, 5) ]),
+    # unsorted input, empty ranges are dropped
+    ([ (30, 5), (0, 10), (12, 3), (20, 0), (40, -1) ], 2, [ (0, 15), (30, 5) ]),
+])
+def test_coalesce_ranges(ranges, max_gap, expected):
+    assert coalesce_ranges(ranges, max_gap=max_gap) == expected
+
+
+def test_equivalence(jpeg_data):
+    expected = JpegMetaParser(BufferStream(jpeg_data))
+    parser = open_parser(BytesRangeReader(jpeg_data))
+
+    assert [ (s.name, s.offset, s.size) for s in parser.structure ] == \
+           [ (s.name, s.offset, s.size) for s in expected.structure ]
+    assert parser.exif_info.to_dict() == expected.exif_info.to_dict()
+    assert parser.get_tag_values(TAGS) == expected.get_tag_values(TAGS)
+    assert parser['APP1'].payload == expected['APP1'].payload
+
+
+def test_request_count(jpeg_data):
+    # all segment headers and APP segments are within the default readahead: one request
+    reader = BytesRangeReader(jpeg_data)
+    parser = open_parser(reader)
+
+    assert reader.requests == [ (0, 64*1024) ]
+    assert parser.request_count == 1
+    assert parser.fetched_size == 64*1024 < len(jpeg_data)
+
+
+def test_request_count_without_readahead(jpeg_data):
+    expected = JpegMetaParser(BufferStream(jpeg_data))
+    headers = len(expected.structure) - 1  # SOI is read with the first request
+
+    reader = BytesRangeReader(jpeg_data)
+    parser = open_parser(reader, readahead=1, max_gap=0)
+
+    # a request per segment header, then one request per APP payload (they aren't adjacent)
+    app_count = sum(1 for s in expected.structure if s.marker.name.startswith('APP'))
+    assert parser.request_count == len(reader.requests) == 1 + headers + app_count
+
+    # with max_gap the APP payloads are fetched by one request
+    reader = BytesRangeReader(jpeg_data)
+    parser = open_parser(reader, readahead=1)
+    assert parser.request_count == len(reader.requests) == 1 + headers + 1
+
+    # nothing beyond SOS is fetched
+    sos = expected.structure[-1]
+    assert max(offset + size for offset, size in reader.requests) <= sos.offset + sos.size
+    assert parser.exif_info.to_dict() == expected.exif_info.to_dict()
+
+
+def test_only(jpeg_data):
+    expected = JpegMetaParser(BufferStream(jpeg_data), only={'APP1'})
+
+    reader = BytesRangeReader(jpeg_data)
+    parser = open_parser(reader, readahead=1, only={'APP1'})
+    everything = open_parser(BytesRangeReader(jpeg_data), readahead=1)
+
+    assert [ s.name for s in parser.structure ] == [ 'SOI', 'Exif' ]
+    assert parser.fetched_size < everything.fetched_size
+    assert parser.get_tag_values(TAGS) == expected.get_tag_values(TAGS)
+
+
+def test_file_range_reader(jpeg_data, tmp_path):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(jpeg_data)
+
+    reader = FileRangeReader(path)
+    parser = open_parser(reader, readahead=16)
+
+    assert parser.request_count == len(reader.requests)
+    assert parser.exif_info.to_dict() == JpegMetaParser(BufferStream(jpeg_data)).exif_info.to_dict()
+
+
+def test_estimate_image_size():
+    with pytest.raises(RuntimeError, match='estimate_image_size'):
+        open_parser(BytesRangeReader(b''), estimate_image_size=True)
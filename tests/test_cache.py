@@ -0,0 +1,207 @@
+import os
+import sqlite3
+
+import pytest
+
+from jparse import cache as cache_module
+from jparse.cache import MetadataCache, make_file_key
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+from jparse.TagPath import TagPath
+
+from benchmarks import synthetic
+
+
+MAKE = TagPath('APP1', 0, 0x010F)
+MODEL = TagPath('APP1', 0, 0x0110)
+
+
+@pytest.fixture
+def jpeg_paths(tmp_path):
+    spec = synthetic.JpegSpec(field_count=10, scan_size=256)
+    paths = []
+    for i, data in enumerate(synthetic.generate_corpus(4, spec)):
+        paths.append(str(tmp_path / f'{i}.jpg'))
+        with open(paths[-1], 'wb') as f:
+            f.write(data)
+    return paths
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'metadata.sqlite')
+
+
+def total_size(cache_path: str) -> int:
+    with sqlite3.connect(cache_path) as connection:
+        return connection.execute('SELECT COALESCE(SUM(size), 0) FROM metadata').fetchone()[0]
+
+
+def test_hit_and_miss(jpeg_paths, cache_path):
+    with MetadataCache(cache_path) as cache:
+        values = cache.get_tag_values(jpeg_paths[0], [ MAKE ])
+        assert values == { MAKE: 'Synthetic' }
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        assert cache.get_tag_values(jpeg_paths[0], [ MAKE ]) == values
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # a tag which is not cached yet: the file is parsed again, the known values are kept
+        record = cache.get(jpeg_paths[0], [ MODEL ])
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert set(record.values) == { MAKE, MODEL }
+        assert len(cache) == 1
+
+    # the cache persists
+    with MetadataCache(cache_path) as cache:
+        assert cache.get_tag_values(jpeg_paths[0], [ MAKE, MODEL ])[MAKE] == 'Synthetic'
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_record_content(jpeg_paths, cache_path):
+    with MetadataCache(cache_path) as cache:
+        record = cache.get(jpeg_paths[0], [ TagPath('APP1', 0, 0x9999) ])
+
+    assert record.values == { TagPath('APP1', 0, 0x9999): None }
+    assert [ name for name, _, _ in record.segments ][:3] == [ 'SOI', 'APP0', 'APP1' ]
+
+    # IFD0, IFD1 and the Exif sub-IFD
+    tags = { field[0] for ifd in record.ifds['APP1'] for field in ifd.fields }
+    assert { 0x010F, 0x8769, 0x829A } <= tags
+
+
+@pytest.mark.parametrize('change', [ 'mtime', 'size' ])
+def test_changed_file(jpeg_paths, cache_path, change):
+    path = jpeg_paths[0]
+
+    with MetadataCache(cache_path) as cache:
+        cache.get(path, [ MAKE ])
+        key = make_file_key(path)
+
+        if change == 'mtime':
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        else:
+            with open(path, 'ab') as f:
+                f.write(b'\x00'*16)
+        assert make_file_key(path) != key
+
+        cache.get(path, [ MAKE ])
+        assert (cache.hits, cache.misses) == (0, 2)
+
+        # the record of the previous version is replaced
+        assert len(cache) == 1
+        assert cache.size == total_size(cache_path)
+
+
+def test_parser_options_are_a_part_of_the_key(jpeg_paths, cache_path):
+    resolution = TagPath('APP1', 0, 0x011A)
+
+    with MetadataCache(cache_path) as cache:
+        fraction = cache.get_tag_values(jpeg_paths[0], [ resolution ])[resolution]
+        value = cache.get_tag_values(jpeg_paths[0], [ resolution ], rational_mode='float')[resolution]
+
+        assert type(value) is float and value == fraction
+        assert len(cache) == 2
+
+
+def test_invalidate_and_clear(jpeg_paths, cache_path):
+    with MetadataCache(cache_path) as cache:
+        for path in jpeg_paths:
+            cache.get(path, [ MAKE ])
+
+        cache.invalidate(jpeg_paths[0])
+        assert len(cache) == len(jpeg_paths) - 1
+        assert cache.size == total_size(cache_path)
+
+        cache.get(jpeg_paths[0], [ MAKE ])
+        assert cache.misses == len(jpeg_paths) + 1
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+
+def test_eviction(jpeg_paths, cache_path):
+    with MetadataCache(cache_path) as cache:
+        cache.get(jpeg_paths[0], [ MAKE ])
+        record_size = cache.size
+
+    # room for two records
+    with MetadataCache(cache_path, max_size=2*record_size + record_size//2) as cache:
+        cache.get(jpeg_paths[1], [ MAKE ])
+        assert cache.evictions == 0
+
+        cache.get(jpeg_paths[2], [ MAKE ])
+        assert cache.evictions == 1
+        assert len(cache) == 2
+        assert cache.size == total_size(cache_path) <= 2*record_size + record_size//2
+
+        # the least recently used record (jpeg_paths[0]) is evicted
+        cache.get(jpeg_paths[1], [ MAKE ])
+        cache.get(jpeg_paths[2], [ MAKE ])
+        assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_hits_update_last_used_lazily(jpeg_paths, cache_path, monkeypatch):
+    monkeypatch.setattr(cache_module, 'LAST_USED_RESOLUTION_NS', -1)
+
+    with MetadataCache(cache_path) as cache:
+        cache.get(jpeg_paths[0], [ MAKE ])
+        cache.get(jpeg_paths[1], [ MAKE ])
+        record_size = cache.size // 2
+
+    with sqlite3.connect(cache_path) as connection:
+        before = dict(connection.execute('SELECT path, last_used FROM metadata'))
+
+    # the hit of the older record isn't written until close()
+    with MetadataCache(cache_path) as cache:
+        cache.get(jpeg_paths[0], [ MAKE ])
+        with sqlite3.connect(cache_path) as connection:
+            assert dict(connection.execute('SELECT path, last_used FROM metadata')) == before
+
+    with sqlite3.connect(cache_path) as connection:
+        after = dict(connection.execute('SELECT path, last_used FROM metadata'))
+    assert after[jpeg_paths[0]] > before[jpeg_paths[0]]
+    assert after[jpeg_paths[1]] == before[jpeg_paths[1]]
+
+    # jpeg_paths[1] is the least recently used now: it's evicted by the next store
+    with MetadataCache(cache_path, max_size=2*record_size + record_size//2) as cache:
+        cache.get(jpeg_paths[2], [ MAKE ])
+        assert cache.evictions == 1
+        cache.get(jpeg_paths[0], [ MAKE ])
+        assert cache.hits == 1
+
+
+def test_undecodable_app_name(tmp_path, cache_path):
+    tiff = synthetic.encode_tiff([ [ (0x010F, FieldType.ASCII, 'Synthetic') ] ], ByteOrder.LITTLE_ENDIAN)
+
+    data = b'\xFF\xD8'
+    data += synthetic.encode_segment(0xFFE1, b'Exif\x00\x00' + tiff)
+    data += synthetic.encode_segment(0xFFE3, b'\xE9\xE9\x00\x00' + tiff)
+    data += synthetic.encode_segment(0xFFDA, b'\x01\x01\x00\x00\x3F\x00')
+    data += b'\x00'*16 + b'\xFF\xD9'
+
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(data)
+
+    with MetadataCache(cache_path) as cache:
+        record = cache.get(str(path), [ MAKE ])
+
+    assert record.values == { MAKE: 'Synthetic' }
+    assert record.ifds['APP3'] == ()
+    assert len(record.ifds['APP1']) == 1
+
+
+def test_size_of_existing_database(jpeg_paths, cache_path):
+    with MetadataCache(cache_path) as cache:
+        for path in jpeg_paths:
+            cache.get(path, [ MAKE ])
+        size = cache.size
+
+    # a database without the size counter
+    with sqlite3.connect(cache_path) as connection:
+        connection.execute('DROP TABLE state')
+
+    with MetadataCache(cache_path) as cache:
+        assert cache.size == size == total_size(cache_path)
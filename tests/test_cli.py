@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+
+import pytest
+
+from jparse import cli
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+from benchmarks import synthetic
+
+
+def reject_constant(name: str):
+    raise ValueError(f'{name} is not valid JSON')
+
+
+@pytest.fixture
+def jpeg_path(tmp_path):
+    # x_resolution 0/0 -> nan, y_resolution 1/0 -> inf in the float mode
+    ifd0 = [
+        (0x10F, FieldType.ASCII, 'Synthetic'),
+        (0x11A, FieldType.Rational, ((0, 0),)),
+        (0x11B, FieldType.Rational, ((1, 0),)),
+        (0x132, FieldType.ASCII, '2024:01:01 12:00:00'),
+    ]
+    tiff = synthetic.encode_tiff([ ifd0 ], ByteOrder.LITTLE_ENDIAN)
+
+    data = b'\xFF\xD8'
+    data += synthetic.encode_segment(0xFFE1, b'Exif\x00\x00' + tiff)
+    data += synthetic.encode_segment(0xFFDA, b'\x01\x01\x00\x00\x3F\x00')
+    data += b'\x00'*16 + b'\xFF\xD9'
+
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(data)
+    return str(path)
+
+
+def run(capsys, *argv: str) -> str:
+    assert cli.main([ *argv, '--pool', 'thread', '--workers', '1' ]) == 0
+    return capsys.readouterr().out
+
+
+def test_jsonl_zero_denominator(capsys, jpeg_path):
+    output = run(capsys, jpeg_path, '--fields', 'make,x_resolution,y_resolution', '--tag', 'APP1:0:0x011A')
+
+    lines = output.splitlines()
+    assert len(lines) == 1
+
+    record = json.loads(lines[0], parse_constant=reject_constant)
+    assert record == { 'path': jpeg_path, 'make': 'Synthetic', 'x_resolution': None, 'y_resolution': None,
+                       'APP1:0:0x011A': None }
+
+
+def test_csv_zero_denominator(capsys, jpeg_path):
+    output = run(capsys, jpeg_path, '--fields', 'make,x_resolution,y_resolution', '--format', 'csv')
+
+    rows = list(csv.reader(io.StringIO(output)))
+    assert rows == [ [ 'path', 'make', 'x_resolution', 'y_resolution', 'error' ],
+                     [ jpeg_path, 'Synthetic', '', '', '' ] ]
+
+
+def test_finite():
+    value = { 'a': float('nan'), 'b': (1.5, float('inf'), -float('inf')), 'c': [ 'x', 2 ] }
+    assert cli.finite(value) == { 'a': None, 'b': [ 1.5, None, None ], 'c': [ 'x', 2 ] }
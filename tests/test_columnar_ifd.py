@@ -0,0 +1,170 @@
+import pytest
+
+from jparse.BufferStream import BufferStream
+from jparse.ColumnarIFD import ColumnarIFD
+from jparse.IFD import IFD
+from jparse.IfdField import IfdField
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TiffHeader import TiffHeader
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+from benchmarks import synthetic
+
+
+BYTE_ORDERS = [ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ]
+
+ENTRIES = [
+    (0x0100, FieldType.Long, (4000,)),
+    (0x0102, FieldType.Short, (8, 8, 8)),
+    (0x010F, FieldType.ASCII, 'Synthetic'),
+    (0x0110, FieldType.ASCII, 'ab'),
+    (0x011A, FieldType.Rational, ((72, 1),)),
+    (0x0201, FieldType.SByte, (-1, 2, -3)),
+    (0x0202, FieldType.SShort, (-2,)),
+    (0x0203, FieldType.SLong, (-3, 4)),
+    (0x0204, FieldType.SRational, ((-1, 3), (5, 7))),
+    (0x0205, FieldType.Float, (1.5,)),
+    (0x0206, FieldType.Double, (2.25, -0.5)),
+    (0x0207, FieldType.Undefined, tuple(range(12))),
+    (0x0208, FieldType.Byte, (1, 2, 3, 4)),
+]
+
+
+def encode_ifd0(entries, byte_order: ByteOrder, order=None) -> bytes:
+    """
+    TIFF with a single IFD: `order` permutes the field headers (the values stay where they are).
+    """
+    tiff = bytearray(synthetic.encode_tiff([ entries ], byte_order))
+    if order is not None:
+        start = TiffHeader.SIZE + 2
+        headers = [ bytes(tiff[start + i*IfdField.HEADER_SIZE:start + (i + 1)*IfdField.HEADER_SIZE])
+                    for i in range(len(entries)) ]
+        tiff[start:start + len(headers)*IfdField.HEADER_SIZE] = b''.join(headers[i] for i in order)
+    return bytes(tiff)
+
+
+def ifd0_pair(tiff: bytes, **options):
+    data = synthetic.encode_jpeg(tiff)
+    ifd = JpegMetaParser(BufferStream(data), **options)['APP1'].ifd(0)
+    columnar = JpegMetaParser(BufferStream(data), columnar=True, **options)['APP1'].ifd(0)
+    assert type(ifd) is IFD and type(columnar) is ColumnarIFD
+    return ifd, columnar
+
+
+def describe(field: IfdField) -> tuple:
+    try:
+        value = field.value
+    except Exception as e:
+        value = type(e)
+    return (field.tag_id, field.field_type, field.count, field.offset, field.value_offset, field.size, field.value_size,
+            bytes(field.raw_value) if field.value_size > 0 and field.field_type != FieldType.Unknown else None, value)
+
+
+def describe_ifd(ifd) -> tuple:
+    return (ifd.index, ifd.offset, ifd.field_count, len(ifd), ifd.next_ifd_offset, ifd.size())
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('rational_mode', [ 'fraction', 'tuple' ])
+def test_iteration(byte_order, rational_mode):
+    ifd, columnar = ifd0_pair(encode_ifd0(ENTRIES, byte_order), rational_mode=rational_mode)
+
+    assert [ describe(field) for field in columnar ] == [ describe(field) for field in ifd ]
+    assert describe_ifd(columnar) == describe_ifd(ifd)
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('order', [ None, [ 3, 0, 12, 5, 1, 2, 4, 6, 7, 8, 9, 10, 11 ], list(range(12, -1, -1)) ],
+                         ids=[ 'sorted', 'shuffled', 'reversed' ])
+def test_lookup(byte_order, order):
+    tiff = encode_ifd0(ENTRIES, byte_order, order)
+
+    # tag lookup on a fresh IFD (lazy loading of IFD) and after the iteration
+    for iterate_first in (False, True):
+        ifd, columnar = ifd0_pair(tiff)
+        if iterate_first:
+            list(ifd), list(columnar)
+
+        for tag_id, _, _ in ENTRIES:
+            assert describe(columnar.get_field(tag=tag_id)) == describe(ifd.get_field(tag=tag_id))
+            assert describe(columnar[tag_id]) == describe(ifd[tag_id])
+
+        for tag_id in (0x0000, 0x0101, 0x0209, 0xFFFF):
+            assert ifd.get_field(tag=tag_id) is None and columnar.get_field(tag=tag_id) is None
+            with pytest.raises(KeyError):
+                columnar[tag_id]
+            with pytest.raises(KeyError):
+                ifd[tag_id]
+
+    # lookup by index follows the file order
+    ifd, columnar = ifd0_pair(tiff)
+    for index in range(len(ENTRIES)):
+        assert describe(columnar.get_field(index=index)) == describe(ifd.get_field(index=index))
+    assert [ field.tag_id for field in columnar ] == [ ENTRIES[i][0] for i in (order or range(len(ENTRIES))) ]
+    assert ifd.get_field(index=len(ENTRIES)) is None and columnar.get_field(index=len(ENTRIES)) is None
+
+
+def test_unknown_field_type():
+    tiff = bytearray(encode_ifd0(ENTRIES[:3], ByteOrder.LITTLE_ENDIAN))
+    # type id of the second field
+    tiff[TiffHeader.SIZE + 2 + IfdField.HEADER_SIZE + 2] = 99
+
+    ifd, columnar = ifd0_pair(bytes(tiff))
+    assert [ describe(field) for field in columnar ] == [ describe(field) for field in ifd ]
+    assert columnar[0x0102].field_type == FieldType.Unknown
+    with pytest.raises(NotImplementedError):
+        columnar[0x0102].value
+
+
+def test_empty_ifd():
+    ifd, columnar = ifd0_pair(encode_ifd0([], ByteOrder.LITTLE_ENDIAN))
+
+    assert list(columnar) == list(ifd) == []
+    assert describe_ifd(columnar) == describe_ifd(ifd)
+    assert columnar.get_field(tag=0x010F) is None and columnar.get_field(index=0) is None
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+def test_generated_file(byte_order):
+    data = synthetic.generate_jpeg(synthetic.JpegSpec(byte_order=byte_order, app_count=2, field_count=64, scan_size=256))
+    parser = JpegMetaParser(BufferStream(data))
+    columnar = JpegMetaParser(BufferStream(data), columnar=True)
+
+    for name in parser.segments:
+        if not hasattr(parser[name], 'walk_ifds'):
+            continue
+
+        ifds = list(parser[name].walk_ifds())
+        columnar_ifds = list(columnar[name].walk_ifds())
+        assert len(ifds) == len(columnar_ifds) > 0
+        assert all(type(ifd) is ColumnarIFD for ifd in columnar_ifds)
+
+        for ifd, columnar_ifd in zip(ifds, columnar_ifds):
+            assert describe_ifd(columnar_ifd) == describe_ifd(ifd)
+            assert [ describe(field) for field in columnar_ifd ] == [ describe(field) for field in ifd ]
+
+    assert columnar.exif_info.to_dict() == parser.exif_info.to_dict()
+
+
+@pytest.mark.parametrize('access', [ 'tag', 'iterate', 'index', 'reversed_index' ])
+def test_duplicated_tags(access):
+    entries = [ (0x0100 + i, FieldType.Long, (i,)) for i in range(4) ]
+    tiff = bytearray(encode_ifd0(entries, ByteOrder.LITTLE_ENDIAN))
+    # the third field gets the tag of the first one
+    tiff[TiffHeader.SIZE + 2 + 2*IfdField.HEADER_SIZE] = 0x00
+    tiff = bytes(tiff)
+
+    ifd, columnar = ifd0_pair(tiff)
+    for item in (ifd, columnar):
+        if access == 'iterate':
+            list(item)
+        elif access == 'index':
+            [ item.get_field(index=i) for i in range(4) ]
+        elif access == 'reversed_index':
+            [ item.get_field(index=i) for i in range(3, -1, -1) ]
+
+    # the first of the duplicates is found by tag, the file order is kept
+    assert ifd[0x0100].value == columnar[0x0100].value == 0
+    assert [ describe(ifd.get_field(index=i)) for i in range(4) ] == [ describe(columnar.get_field(index=i)) for i in range(4) ]
+    assert [ field.value for field in ifd ] == [ field.value for field in columnar ] == [ 0, 1, 2, 3 ]
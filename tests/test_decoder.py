@@ -0,0 +1,115 @@
+import random
+import struct
+from fractions import Fraction
+
+import pytest
+
+from jparse import decoder
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+from jparse.IfdField import parse_value, unpack_value
+
+from benchmarks.decode_values import legacy_parse_value, legacy_unpack_value
+
+
+BYTE_ORDERS = [ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ]
+NUMERIC_TYPES = [ field_type for field_type in FieldType if field_type not in (FieldType.ASCII, FieldType.Unknown) ]
+COUNTS = [ 1, 2, 3, 17, 256 ]
+
+
+def make_data(field_type: FieldType, count: int, byte_order: ByteOrder, seed: int=0) -> bytes:
+    """
+    Random elements: all bit patterns of the integer types, finite floats, rationals without zero denominators.
+    """
+    rng = random.Random(seed)
+
+    if field_type in (FieldType.Float, FieldType.Double):
+        return struct.pack(f'{byte_order.value}{count}{field_type.type_chr}',
+                           *(rng.uniform(-1e6, 1e6) for _ in range(count)))
+
+    data = bytearray(rng.getrandbits(8) for _ in range(count*field_type.byte_count))
+    if field_type.is_rational:
+        # the denominator is the second half of each element
+        for i in range(count):
+            data[8*i + 4 + (3 if byte_order == ByteOrder.LITTLE_ENDIAN else 0)] |= 1
+    return bytes(data)
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('field_type', NUMERIC_TYPES, ids=lambda field_type: field_type.name)
+@pytest.mark.parametrize('count', COUNTS)
+def test_parse_value(byte_order, field_type, count):
+    data = make_data(field_type, count, byte_order)
+
+    expected = legacy_parse_value(data, count, field_type, byte_order)
+    value = parse_value(data, count, field_type, byte_order)
+
+    assert value == expected
+    assert type(value) is type(expected)
+    if count > 1:
+        assert [ type(item) for item in value ] == [ type(item) for item in expected ]
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('field_type', NUMERIC_TYPES, ids=lambda field_type: field_type.name)
+def test_unpack_value(byte_order, field_type):
+    data = make_data(field_type, 1, byte_order, seed=1)
+    assert unpack_value(data, field_type, byte_order) == legacy_unpack_value(data, field_type, byte_order)
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('field_type', NUMERIC_TYPES, ids=lambda field_type: field_type.name)
+def test_unpack_array_offset(byte_order, field_type):
+    data = make_data(field_type, 8, byte_order, seed=2)
+    offset = 3*field_type.byte_count
+
+    value = decoder.unpack_array(b'\xAA' + data, count=5, field_type=field_type, byte_order=byte_order, offset=1 + offset)
+    assert value == legacy_parse_value(data[offset:], 5, field_type, byte_order)
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('data, count', [ (b'Canon\x00', 6), (b'A', 1), (b'\x00', 1), (b'ab\x00\x00cd\x00', 7), (b'', 0) ])
+def test_ascii(byte_order, data, count):
+    assert parse_value(data, count, FieldType.ASCII, byte_order) == legacy_parse_value(data, count, FieldType.ASCII, byte_order)
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+@pytest.mark.parametrize('field_type', [ FieldType.Rational, FieldType.SRational ], ids=lambda field_type: field_type.name)
+@pytest.mark.parametrize('rational_mode', decoder.RATIONAL_MODES)
+def test_rational_modes(byte_order, field_type, rational_mode):
+    data = make_data(field_type, 4, byte_order, seed=3)
+    expected = legacy_parse_value(data, 4, field_type, byte_order)
+    pairs = struct.unpack(f'{byte_order.value}8{field_type.type_chr}', data)
+
+    value = parse_value(data, 4, field_type, byte_order, rational_mode=rational_mode)
+
+    if rational_mode == 'tuple':
+        assert value == tuple(zip(pairs[0::2], pairs[1::2]))
+    elif rational_mode == 'float':
+        assert value == tuple(float(item) for item in expected)
+    elif rational_mode == 'lazy':
+        assert tuple(item.fraction for item in value) == expected
+        assert tuple(value) == tuple(zip(pairs[0::2], pairs[1::2]))
+    else:
+        assert value == expected
+
+
+@pytest.mark.parametrize('byte_order', BYTE_ORDERS, ids=[ 'le', 'be' ])
+def test_zero_denominator(byte_order):
+    data = struct.pack(f'{byte_order.value}4I', 1, 2, 3, 0)
+
+    with pytest.raises(ZeroDivisionError):
+        legacy_parse_value(data, 2, FieldType.Rational, byte_order)
+    with pytest.raises(ZeroDivisionError):
+        parse_value(data, 2, FieldType.Rational, byte_order)
+
+    assert parse_value(data, 2, FieldType.Rational, byte_order, rational_mode='float') == (0.5, float('inf'))
+    assert parse_value(data, 2, FieldType.Rational, byte_order, rational_mode='tuple') == ((1, 2), (3, 0))
+    assert parse_value(data, 2, FieldType.Rational, byte_order, rational_mode='lazy')[0].fraction == Fraction(1, 2)
+
+
+def test_unknown_type():
+    with pytest.raises(NotImplementedError):
+        parse_value(b'\x00'*4, 1, FieldType.Unknown, ByteOrder.LITTLE_ENDIAN)
+    with pytest.raises(NotImplementedError):
+        decoder.unpack_array(b'\x00'*4, 1, FieldType.Unknown, ByteOrder.LITTLE_ENDIAN)
@@ -0,0 +1,110 @@
+import json
+import math
+
+import pytest
+
+from jparse.BufferStream import BufferStream
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+from jparse.decoder import RATIONAL_MODES
+
+from benchmarks import synthetic
+
+
+def encode_jpeg(ifd0, exif_ifd) -> bytes:
+    tiff = synthetic.encode_exif_tiff(ifd0, exif_ifd, [], ByteOrder.LITTLE_ENDIAN)
+
+    data = b'\xFF\xD8'
+    data += synthetic.encode_segment(0xFFE1, b'Exif\x00\x00' + tiff)
+    data += synthetic.encode_segment(0xFFDA, b'\x01\x01\x00\x00\x3F\x00')
+    return data + b'\x00'*16 + b'\xFF\xD9'
+
+
+@pytest.fixture
+def zero_denominators() -> bytes:
+    # x_resolution 0/0, y_resolution 1/0, exposure_time 0/0, exposure_bias -1/0
+    ifd0 = [
+        (0x010F, FieldType.ASCII, 'Synthetic'),
+        (0x011A, FieldType.Rational, ((0, 0),)),
+        (0x011B, FieldType.Rational, ((1, 0),)),
+    ]
+    exif_ifd = [
+        (0x829A, FieldType.Rational, ((0, 0),)),
+        (0x829D, FieldType.Rational, ((28, 10),)),
+        (0x9204, FieldType.SRational, ((-1, 0),)),
+    ]
+    return encode_jpeg(ifd0, exif_ifd)
+
+
+def lines(text: str) -> dict:
+    result = {}
+    for line in text.splitlines()[1:]:
+        name, value = line.split(':', 1)
+        result[name.strip()] = value.strip()
+    return result
+
+
+@pytest.mark.parametrize('rational_mode', [ mode for mode in RATIONAL_MODES if mode != 'fraction' ])
+def test_str_zero_denominator(zero_denominators, rational_mode):
+    parser = JpegMetaParser(BufferStream(zero_denominators), rational_mode=rational_mode)
+    values = lines(str(parser.exif_info))
+
+    assert values['make'] == 'Synthetic'
+    if rational_mode == 'tuple':
+        expected = { 'x_resolution': '(0, 0)', 'y_resolution': '(1, 0)', 'exposure_time': '(0, 0)',
+                     'exposure_bias_value': '(-1, 0)', 'f_number': '(28, 10)' }
+    else:
+        expected = { 'x_resolution': 'nan', 'y_resolution': 'inf', 'exposure_time': 'nan',
+                     'exposure_bias_value': '-inf', 'f_number': '2.8' }
+    assert { name: values[name] for name in expected } == expected
+
+
+def test_str_zero_denominator_fraction(zero_denominators):
+    # Fraction can't represent 0/0: the value itself raises, as the documented 'fraction' mode does
+    parser = JpegMetaParser(BufferStream(zero_denominators), rational_mode='fraction')
+
+    with pytest.raises(ZeroDivisionError):
+        parser.exif_info.x_resolution
+    with pytest.raises(ZeroDivisionError):
+        str(parser.exif_info)
+
+
+@pytest.mark.parametrize('rational_mode', RATIONAL_MODES)
+def test_str(rational_mode):
+    data = synthetic.generate_jpeg(synthetic.JpegSpec(field_count=0, scan_size=64))
+    parser = JpegMetaParser(BufferStream(data), rational_mode=rational_mode)
+    values = lines(str(parser.exif_info))
+
+    assert values['make'] == 'Synthetic'
+    if rational_mode == 'tuple':
+        assert values['x_resolution'] == '(72, 1)'
+    else:
+        assert float(values['x_resolution']) == 72.0
+        assert math.isfinite(float(values['exposure_time']))
+
+
+@pytest.mark.parametrize('rational_mode', [ mode for mode in RATIONAL_MODES if mode != 'fraction' ])
+def test_snapshot_zero_denominator(zero_denominators, rational_mode):
+    parser = JpegMetaParser(BufferStream(zero_denominators), rational_mode=rational_mode)
+    snapshot = parser.exif_info.snapshot()
+
+    assert json.loads(json.dumps(snapshot, allow_nan=False)) == snapshot
+    assert { name: snapshot[name] for name in ('x_resolution', 'y_resolution', 'exposure_time', 'exposure_bias_value') } == \
+           dict.fromkeys(('x_resolution', 'y_resolution', 'exposure_time', 'exposure_bias_value'))
+    assert snapshot['f_number'] == 2.8
+    assert snapshot['make'] == 'Synthetic'
+
+
+def test_snapshot_is_the_same_in_every_mode():
+    data = synthetic.generate_jpeg(synthetic.JpegSpec(field_count=0, scan_size=64, makernote_size=0))
+
+    snapshots = []
+    for rational_mode in RATIONAL_MODES:
+        snapshot = JpegMetaParser(BufferStream(data), rational_mode=rational_mode).exif_info.snapshot()
+        json.dumps(snapshot, allow_nan=False)
+        snapshots.append(snapshot)
+
+    assert snapshots[0]['x_resolution'] == 72.0
+    assert type(snapshots[0]['exposure_time']) is float
+    assert all(snapshot == snapshots[0] for snapshot in snapshots)
@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from jparse import instrument
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.batch import read_values, scan_paths
+
+from benchmarks import synthetic
+
+
+FIELDS = ('make', 'model', 'x_resolution', 'exposure_time')
+
+
+@pytest.fixture
+def jpeg_paths(tmp_path):
+    spec = synthetic.JpegSpec(app_count=1, field_count=20, scan_size=256)
+    paths = []
+    for i, data in enumerate(synthetic.generate_corpus(8, spec)):
+        paths.append(str(tmp_path / f'{i}.jpg'))
+        with open(paths[-1], 'wb') as f:
+            f.write(data)
+    return paths
+
+
+def parse(path: str):
+    with JpegMetaParser.from_path(path, mmap=False) as parser:
+        parser.exif_info.to_dict()
+
+
+def counters(stats: dict) -> dict:
+    return { name: stats[name] for name in instrument.COUNTERS }
+
+
+def test_collection_is_per_thread(jpeg_paths):
+    other = {}
+
+    def run():
+        assert not instrument.is_enabled()
+        with instrument.collect() as stats:
+            parse(jpeg_paths[0])
+        other.update(stats.to_dict())
+
+    with instrument.collect() as stats:
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        assert stats.to_dict()['parsers'] == 0
+        parse(jpeg_paths[0])
+
+    assert not instrument.is_enabled()
+    assert other['parsers'] == 1
+    assert counters(stats.to_dict()) == counters(other)
+
+
+def test_shared_stats(jpeg_paths):
+    stats = instrument.Stats()
+
+    def run(path: str):
+        with instrument.collect(stats):
+            parse(path)
+
+    threads = [ threading.Thread(target=run, args=(path,)) for path in jpeg_paths ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.to_dict()['parsers'] == len(jpeg_paths)
+
+
+@pytest.mark.parametrize('pool, workers', [ ('thread', 1), ('thread', 4), ('process', 2) ])
+def test_batch_stats(jpeg_paths, pool, workers):
+    options = { 'mmap': False, 'buffered': False }
+
+    expected = instrument.Stats()
+    for path in jpeg_paths:
+        with instrument.collect() as stats:
+            read_values(path, tags=(), exif_fields=FIELDS, parser_options=options)
+        expected.merge(stats.to_dict())
+
+    total = instrument.Stats()
+    for result in scan_paths(jpeg_paths, exif_fields=FIELDS, workers=workers, chunk_size=2, pool=pool,
+                             collect_stats=True, **options):
+        assert result.ok
+        assert result.stats['parsers'] == 1
+        total.merge(result.stats)
+
+    assert counters(total.to_dict()) == counters(expected.to_dict())
+    assert total.to_dict()['parsers'] == len(jpeg_paths)
+    assert total.to_dict()['app_header_calls'] > 0
+
+
+def test_batch_without_stats(jpeg_paths):
+    for result in scan_paths(jpeg_paths[:2], exif_fields=FIELDS, workers=1):
+        assert result.ok
+        assert result.stats is None
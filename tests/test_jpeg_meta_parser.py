@@ -0,0 +1,66 @@
+import pytest
+
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+
+from benchmarks import synthetic
+
+
+MAKE = TagPath('APP1', 0, 0x010F)
+
+
+@pytest.fixture
+def jpeg_path(tmp_path):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(synthetic.generate_jpeg(synthetic.JpegSpec(field_count=10, scan_size=256)))
+    return str(path)
+
+
+@pytest.mark.parametrize('options', [ { 'mmap': True }, { 'mmap': False }, { 'mmap': False, 'buffered': True },
+                                      { 'mmap': False, 'thread_safe': True }, { 'page_cache': True } ])
+def test_closed_parser(jpeg_path, options):
+    with JpegMetaParser.from_path(jpeg_path, **options) as parser:
+        assert not parser.closed
+        assert parser.get_tag_value(MAKE) == 'Synthetic'
+
+    assert parser.closed
+
+    accesses = [
+        lambda: parser.get_tag_value(MAKE),
+        lambda: parser.get_tag_values([ MAKE ]),
+        lambda: parser.exif_info,
+        lambda: parser.structure,
+        lambda: parser['APP1'],
+        lambda: parser.get_segment('APP1'),
+        lambda: list(parser),
+    ]
+    for access in accesses:
+        with pytest.raises(ValueError, match='I/O operation on closed parser'):
+            access()
+
+    # close() is idempotent
+    parser.close()
+
+
+def test_segment_of_closed_parser(jpeg_path):
+    with JpegMetaParser.from_path(jpeg_path, mmap=True) as parser:
+        segment = parser['APP1']
+        payload = segment.payload
+
+    # the memoryview returned before close() keeps the mapping alive
+    assert bytes(payload[:4]) == b'Exif'
+    payload.release()
+
+    # lazy loading through the closed memory-mapped stream
+    with pytest.raises(ValueError, match='closed'):
+        segment.ifd(1)
+
+
+def test_stream_passed_to_constructor(jpeg_path):
+    with open(jpeg_path, 'rb') as f:
+        with JpegMetaParser(f) as parser:
+            assert parser.get_tag_value(MAKE) == 'Synthetic'
+
+        assert not f.closed
+        with pytest.raises(ValueError, match='I/O operation on closed parser'):
+            parser.get_tag_value(MAKE)
@@ -0,0 +1,155 @@
+import io
+import random
+
+import pytest
+
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.PageCacheStream import PageCacheStream
+
+from benchmarks import synthetic
+
+
+DATA = bytes(range(256))*4  # 1 KB
+
+
+def cached(page_size: int=16, capacity: int=4, data: bytes=DATA) -> PageCacheStream:
+    return PageCacheStream(io.BytesIO(data), page_size=page_size, capacity=capacity)
+
+
+def pages(stream: PageCacheStream) -> list:
+    """
+    Cached page numbers, the least recently used first.
+    """
+    return list(stream._pages)
+
+
+@pytest.mark.parametrize('page_size, capacity', [ (1, 1), (3, 2), (16, 4), (64, 64), (4096, 1) ])
+def test_reads(page_size, capacity):
+    stream = cached(page_size, capacity)
+    rng = random.Random(page_size)
+
+    for _ in range(200):
+        offset = rng.randrange(len(DATA) + 8)
+        count = rng.randrange(64)
+        assert stream.read_at(offset, count) == DATA[offset:offset + count]
+
+    stream.seek(10)
+    assert stream.read(5) == DATA[10:15] and stream.tell() == 15
+    assert stream.read() == DATA[15:] and stream.tell() == len(DATA)
+    assert stream.seek(-4, io.SEEK_END) == len(DATA) - 4
+    assert stream.read(100) == DATA[-4:]
+
+
+def test_redundancy_ratio():
+    stream = cached()
+
+    stream.read_at(0, 100)
+    stream.read_at(50, 100)   # 50 bytes again
+    stream.read_at(0, 10)     # 10 bytes again
+    stream.read_at(150, 50)   # adjacent: nothing again
+    stream.read_at(300, 0)
+
+    assert stream.requested_bytes == 260
+    assert stream.redundant_bytes == 60
+    assert stream.redundancy_ratio == pytest.approx(60/260)
+
+    # a read over many requested ranges and the gaps between them
+    stream.read_at(250, 10)
+    stream.read_at(280, 10)
+    stream.read_at(190, 120)  # [190, 200), [250, 260) and [280, 290) again
+    assert stream.redundant_bytes == 60 + 30
+    assert stream.stats()['redundancy_ratio'] == stream.redundant_bytes / stream.requested_bytes
+
+    # only the returned bytes are accounted at the end of the stream
+    stream.read_at(len(DATA) - 10, 100)
+    assert stream.requested_bytes == 260 + 140 + 10
+
+
+def test_no_reads():
+    stream = cached()
+    assert stream.redundancy_ratio == 0.0
+    assert stream.stats()['requested_bytes'] == 0
+
+
+def test_lru_eviction():
+    stream = cached(page_size=16, capacity=2)
+
+    stream.read_at(0, 1)    # page 0
+    stream.read_at(16, 1)   # page 1
+    assert pages(stream) == [ 0, 1 ]
+
+    stream.read_at(0, 1)    # page 0 is the most recently used now
+    assert pages(stream) == [ 1, 0 ]
+
+    stream.read_at(32, 1)   # page 2 evicts page 1
+    assert pages(stream) == [ 0, 2 ]
+    assert stream.stats()['fetch_calls'] == 3
+
+    stream.read_at(5, 1)
+    assert stream.stats()['fetch_calls'] == 3
+    stream.read_at(20, 1)   # page 1 is fetched again and evicts page 2
+    assert pages(stream) == [ 0, 1 ]
+
+    stats = stream.stats()
+    assert (stats['page_hits'], stats['page_misses'], stats['fetch_calls'], stats['pages']) == (2, 4, 4, 2)
+    assert stats['fetched_bytes'] == 4*16
+
+
+def test_adjacent_missing_pages():
+    stream = cached(page_size=16, capacity=8)
+
+    # pages 0-3 with one fetch
+    assert stream.read_at(0, 64) == DATA[:64]
+    assert stream.stats()['fetch_calls'] == 1
+
+    # pages 4, 5 and 7 are missing, page 6 is cached in between: two fetches
+    stream.read_at(96, 1)
+    stream.read_at(64, 16*4)
+    stats = stream.stats()
+    assert stats['fetch_calls'] == 1 + 1 + 2
+    assert stats['page_misses'] == 4 + 1 + 3
+    assert stats['fetched_bytes'] == 8*16
+
+
+def test_read_larger_than_cache():
+    stream = cached(page_size=16, capacity=2)
+    stream.read_at(0, 1)
+
+    # the image data scan doesn't evict the metadata pages
+    assert stream.read_at(0, 100) == DATA[:100]
+    assert pages(stream) == [ 0 ]
+    assert stream.fetched_bytes == 16 + 100
+
+
+def test_short_last_page():
+    stream = cached(page_size=100, capacity=4, data=DATA[:250])
+
+    assert stream.read_at(240, 20) == DATA[240:250]
+    assert stream.read_at(250, 10) == b''
+    assert stream.fetched_bytes == 50
+    assert pages(stream) == [ 2 ]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        PageCacheStream(io.BytesIO(DATA), page_size=0)
+    with pytest.raises(ValueError):
+        PageCacheStream(io.BytesIO(DATA), capacity=0)
+
+
+def test_parser(tmp_path):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(synthetic.generate_jpeg(synthetic.JpegSpec(app_count=2, field_count=32, scan_size=64*1024)))
+
+    with open(path, 'rb') as f:
+        expected = JpegMetaParser(f).exif_info.to_dict()
+
+    with open(path, 'rb') as f:
+        parser = JpegMetaParser(f, page_cache=True)
+        assert parser.exif_info.to_dict() == expected
+
+        stats = parser.stream.stats()
+        assert 0.0 < stats['redundancy_ratio'] < 1.0
+        assert stats['fetch_calls'] < stats['read_calls']
+        # the metadata is at the file start: the image data isn't fetched
+        assert stats['fetched_bytes'] < path.stat().st_size
@@ -0,0 +1,109 @@
+import io
+import random
+
+import pytest
+
+from jparse import parser
+from jparse.parser import scan_for_eoi
+
+
+CHUNK_SIZES = [ 1, 2, 3, 4, 5, 7, 8 ]
+
+
+def entropy_coded_data(size: int, seed: int=0) -> bytes:
+    """
+    Random scan data: each 0xFF is byte-stuffed (0xFF00), a restart marker every 64 bytes.
+    """
+    rng = random.Random(seed)
+    data = bytearray()
+    while len(data) < size:
+        byte = rng.choice([ 0xFF, 0xD9, rng.randrange(256) ])
+        data.append(byte)
+        if byte == 0xFF:
+            data.append(0x00)
+        if len(data) % 64 == 0:
+            data += bytes([ 0xFF, 0xD0 + len(data)//64 % 8 ])
+    return bytes(data)
+
+
+def scan(data: bytes, start: int=0, **kwargs) -> int:
+    stream = io.BytesIO(data)
+    stream.seek(start)
+    return scan_for_eoi(stream, **kwargs)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('from_end', [ False, True ])
+def test_eoi_after_stuffed_data(chunk_size, from_end):
+    image = entropy_coded_data(100)
+    assert b'\xFF\xD9' not in image
+
+    assert scan(image + b'\xFF\xD9', chunk_size=chunk_size, from_end=from_end) == len(image)
+    assert scan(image, chunk_size=chunk_size, from_end=from_end) == 0
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('from_end', [ False, True ])
+def test_eoi_at_every_chunk_boundary(chunk_size, from_end):
+    # the marker starts at each position inside a chunk, including the last byte
+    for size in range(3*chunk_size + 1):
+        image = b'\xFF\x00' * (size//2) + b'\x00' * (size % 2)
+        assert scan(image + b'\xFF\xD9', chunk_size=chunk_size, from_end=from_end) == len(image), size
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('from_end', [ False, True ])
+def test_fill_bytes(chunk_size, from_end):
+    # any number of 0xFF fill bytes may precede a marker
+    for fill in range(1, 2*chunk_size + 2):
+        image = b'\x12\xFF\x00\x34' + b'\xFF' * fill
+        assert scan(image + b'\xD9', chunk_size=chunk_size, from_end=from_end) == len(image) - 1, fill
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_stuffed_byte_at_chunk_boundary(chunk_size):
+    # 0xFF at the end of a chunk followed by a stuffed 0x00 or a restart marker isn't EOI
+    for size in range(2*chunk_size):
+        image = b'\x00' * size + b'\xFF\x00\xD9\xFF\xD3\xD9'
+        assert scan(image, chunk_size=chunk_size) == 0, size
+        assert scan(image + b'\xFF\xD9', chunk_size=chunk_size) == len(image), size
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_start_position(chunk_size):
+    # the offset is relative to the current position, EOI before it isn't found
+    data = b'\xFF\xD9' + entropy_coded_data(50) + b'\xFF\xD9'
+    assert scan(data, start=2, chunk_size=chunk_size) == len(data) - 4
+    assert scan(data, start=2, chunk_size=chunk_size, from_end=True) == len(data) - 4
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('trailer', [ b'\x00' * 5, b'\x00' * (parser.EOI_TAIL_SIZE + 10) ], ids=[ 'short', 'long' ])
+def test_from_end_zero_padding(chunk_size, trailer):
+    image = entropy_coded_data(100)
+    assert scan(image + b'\xFF\xD9' + trailer, chunk_size=chunk_size, from_end=True) == len(image)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('trailer', [ b'\x01\x02\x03', b'\xFF', b'\xFF\xD8' + entropy_coded_data(200, seed=1) ],
+                         ids=[ 'bytes', 'marker_start', 'image' ])
+def test_from_end_data_after_eoi(chunk_size, trailer):
+    # the tail check fails: the forward scan finds the first EOI
+    image = entropy_coded_data(100)
+    data = image + b'\xFF\xD9' + trailer
+
+    assert parser._scan_tail_for_eoi(io.BytesIO(data), 0, None) == 0
+    assert scan(data, chunk_size=chunk_size, from_end=True) == len(image)
+    assert scan(data, chunk_size=chunk_size, from_end=True) == scan(data, chunk_size=chunk_size)
+
+
+def test_scan_tail_for_eoi():
+    image = entropy_coded_data(100)
+
+    assert parser._scan_tail_for_eoi(io.BytesIO(image + b'\xFF\xD9'), 0, None) == len(image)
+    assert parser._scan_tail_for_eoi(io.BytesIO(image + b'\xFF\xD9\x00\x00'), 10, None) == len(image) - 10
+    # EOI before the start position isn't found
+    assert parser._scan_tail_for_eoi(io.BytesIO(b'\xFF\xD9\x00\x00'), 2, None) == 0
+    # EOI further than EOI_TAIL_SIZE from the end
+    data = image + b'\xFF\xD9' + b'\x00' * parser.EOI_TAIL_SIZE
+    assert parser._scan_tail_for_eoi(io.BytesIO(data), 0, None) == 0
@@ -0,0 +1,85 @@
+import pytest
+
+from jparse.BufferStream import BufferStream
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+from jparse.endianess import ByteOrder
+
+from benchmarks import synthetic
+
+
+TAGS = [
+    TagPath('APP1', 0, 0x010F),
+    TagPath('APP1', 0, 0x011A),
+    TagPath('APP1', 'Exif', 0x829A),
+    TagPath('APP1', 'Exif', 0x927C),
+    TagPath('APP1', 1, 0x0103),
+]
+
+
+@pytest.fixture(params=[ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ], ids=[ 'le', 'be' ])
+def jpeg_data(request) -> bytes:
+    # APP1 is followed by other APP segments, tables and the image data
+    return synthetic.generate_jpeg(synthetic.JpegSpec(byte_order=request.param, app_count=3, field_count=16,
+                                                      scan_size=1024))
+
+
+def layout(parser: JpegMetaParser) -> list:
+    return [ (segment.marker.name, segment.offset, segment.size) for segment in parser.structure ]
+
+
+@pytest.mark.parametrize('options', [ {}, { 'buffered': True }, { 'columnar': True } ],
+                         ids=[ 'default', 'buffered', 'columnar' ])
+def test_reparse_prefix(jpeg_data, options):
+    full = JpegMetaParser(BufferStream(jpeg_data), **options)
+    parser = JpegMetaParser(BufferStream(jpeg_data), only={'APP1'}, **options)
+    assert parser.segments == ('APP1',)
+    assert parser.prefix_size == parser['APP1'].offset + parser['APP1'].size < full.prefix_size
+
+    prefix = JpegMetaParser(BufferStream(jpeg_data[:parser.prefix_size]), only={'APP1'}, **options)
+
+    assert prefix.segments == ('APP1',)
+    assert prefix.prefix_size == parser.prefix_size
+    assert prefix.exif_info.to_dict() == parser.exif_info.to_dict() == full.exif_info.to_dict()
+    assert prefix.get_tag_values(TAGS) == full.get_tag_values(TAGS)
+    assert None not in prefix.get_tag_values(TAGS)
+
+
+def test_reparse_prefix_from_file(jpeg_data, tmp_path):
+    full = JpegMetaParser(BufferStream(jpeg_data))
+    prefix_size = JpegMetaParser(BufferStream(jpeg_data), only={'APP1'}).prefix_size
+
+    path = tmp_path / 'head.jpg'
+    path.write_bytes(jpeg_data[:prefix_size])
+    for mmap in (True, False):
+        with JpegMetaParser.from_path(str(path), mmap=mmap, only={'APP1'}) as prefix:
+            assert prefix.exif_info.to_dict() == full.exif_info.to_dict()
+            assert prefix.get_tag_values(TAGS) == full.get_tag_values(TAGS)
+
+
+def test_prefix_of_all_segments(jpeg_data):
+    full = JpegMetaParser(BufferStream(jpeg_data))
+    # up to the end of SOS header: the image data isn't needed
+    assert full.prefix_size == full.structure[-1].offset + full.structure[-1].size < len(jpeg_data)
+
+    prefix = JpegMetaParser(BufferStream(jpeg_data[:full.prefix_size]))
+    assert layout(prefix) == layout(full)
+    assert prefix.segments == full.segments
+    assert prefix.exif_info.to_dict() == full.exif_info.to_dict()
+
+
+def test_max_prefix(jpeg_data):
+    full = JpegMetaParser(BufferStream(jpeg_data))
+    prefix_size = JpegMetaParser(BufferStream(jpeg_data), only={'APP1'}).prefix_size
+
+    # the budget of prefix_size is enough for the same Exif
+    parser = JpegMetaParser(BufferStream(jpeg_data), max_prefix=prefix_size)
+    assert 'APP1' in parser.segments
+    assert parser.prefix_size == prefix_size
+    assert parser.exif_info.to_dict() == full.exif_info.to_dict()
+    assert parser.get_tag_values(TAGS) == full.get_tag_values(TAGS)
+
+    # one byte less and APP1 doesn't fit
+    parser = JpegMetaParser(BufferStream(jpeg_data), max_prefix=prefix_size - 1)
+    assert 'APP1' not in parser.segments
+    assert parser.get_tag_values(TAGS) == (None,)*len(TAGS)
@@ -0,0 +1,107 @@
+import logging
+
+import pytest
+
+from jparse.AppSegment import AppSegment
+from jparse.BufferStream import BufferStream
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+from benchmarks import synthetic
+
+
+MAKE = TagPath('APP1', 0, 0x010F)
+ICC_SIZE = 4000
+
+
+class ShortReadStream:
+    """
+    Forward-only source: no seek() and tell(), read() returns at most `max_read` bytes as a pipe or a socket.
+    """
+
+    def __init__(self, data: bytes, max_read: int):
+        self._data = data
+        self._position = 0
+        self._max_read = max_read
+        self.bytes_read = 0
+
+    def read(self, count: int=-1) -> bytes:
+        if count < 0:
+            count = len(self._data)
+        data = self._data[self._position:self._position + min(count, self._max_read)]
+        self._position += len(data)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.fixture
+def jpeg_data() -> bytes:
+    tiff = synthetic.encode_tiff([ [ (0x010F, FieldType.ASCII, 'Synthetic') ] ], ByteOrder.LITTLE_ENDIAN)
+
+    data = b'\xFF\xD8'
+    data += synthetic.encode_segment(0xFFE1, b'Exif\x00\x00' + tiff)
+    data += synthetic.encode_segment(0xFFE2, b'ICC_PROFILE\x00' + bytes(ICC_SIZE))
+    data += synthetic.encode_segment(0xFFDA, b'\x01\x01\x00\x00\x3F\x00')
+    return data + b'\x00'*256 + b'\xFF\xD9'
+
+
+def layout(parser: JpegMetaParser) -> list:
+    return [ (segment.marker.name, segment.offset, segment.size) for segment in parser.structure ]
+
+
+@pytest.mark.parametrize('max_read', [ 1, 3, 64, 1 << 20 ])
+def test_without_cap(jpeg_data, max_read):
+    stream = ShortReadStream(jpeg_data, max_read)
+    parser = JpegMetaParser(stream, streaming=True)
+
+    assert layout(parser) == layout(JpegMetaParser(BufferStream(jpeg_data)))
+    assert parser.segments == ('APP1', 'APP2')
+    assert len(parser['APP2'].payload) == len('ICC_PROFILE') + 1 + ICC_SIZE
+    assert parser.skipped_segments == ()
+    assert parser.get_tag_value(MAKE) == 'Synthetic'
+
+    # the scan stops at the SOS header, the image data is not read
+    assert stream.bytes_read == parser.structure[-1].offset + 4
+
+
+@pytest.mark.parametrize('max_read', [ 1, 3, 64, 1 << 20 ])
+def test_with_cap(jpeg_data, max_read, caplog):
+    stream = ShortReadStream(jpeg_data, max_read)
+    with caplog.at_level(logging.INFO):
+        parser = JpegMetaParser(stream, streaming=True, max_segment_size=1024)
+
+    # the skipped segment is listed, but not parsed
+    assert layout(parser) == layout(JpegMetaParser(BufferStream(jpeg_data)))
+    assert parser.segments == ('APP1',)
+    assert parser.get_segment('APP2') is None
+    assert [ segment.marker.name for segment in parser.skipped_segments ] == [ 'APP2' ]
+    assert not isinstance(parser.skipped_segments[0], AppSegment)
+    assert parser.get_tag_value(MAKE) == 'Synthetic'
+    assert stream.bytes_read == parser.structure[-1].offset + 4
+
+    messages = [ record.getMessage() for record in caplog.records if record.levelno == logging.INFO ]
+    assert len(messages) == 1
+    assert 'APP2' in messages[0] and 'max_segment_size=1024' in messages[0]
+
+
+def test_cap_of_wanted_segment(jpeg_data):
+    parser = JpegMetaParser(ShortReadStream(jpeg_data, 5), streaming=True, only={'APP1'}, max_segment_size=16)
+
+    # APP1 isn't parsed: its tags are missing, the scan goes on up to SOS
+    assert [ segment.marker.name for segment in parser.skipped_segments ] == [ 'APP1' ]
+    assert parser.segments == ()
+    assert parser.get_tag_value(MAKE, default='-') == '-'
+    assert parser.exif_info.make is None
+    assert parser.structure[-1].marker.name == 'SOS'
+
+
+def test_cap_is_inclusive(jpeg_data):
+    payload_size = len('ICC_PROFILE') + 1 + ICC_SIZE
+
+    parser = JpegMetaParser(ShortReadStream(jpeg_data, 64), streaming=True, max_segment_size=payload_size)
+    assert parser.segments == ('APP1', 'APP2')
+
+    parser = JpegMetaParser(ShortReadStream(jpeg_data, 64), streaming=True, max_segment_size=payload_size - 1)
+    assert parser.segments == ('APP1',)
@@ -0,0 +1,171 @@
+from fractions import Fraction
+
+import pytest
+
+from jparse.BufferStream import BufferStream
+from jparse.IFD import IFD
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+from jparse.TiffHeader import TiffHeader
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+from benchmarks import synthetic
+
+
+EXIF, GPS, INTEROP = 0x8769, 0x8825, 0xA005
+
+MAKE = (0x010F, FieldType.ASCII, 'Synthetic')
+GPS_ENTRIES = [
+    (0x0000, FieldType.Byte, (2, 3, 0, 0)),
+    (0x0001, FieldType.ASCII, 'N'),
+    (0x0002, FieldType.Rational, ((35, 1), (40, 1), (1234, 100))),
+]
+EXIF_ENTRIES = [
+    (0x829A, FieldType.Rational, ((1, 250),)),
+]
+
+
+def pointer(tag: int, target) -> tuple:
+    """
+    Pointer entry: `target` is the index of the IFD in the list (see encode_tiff) or a raw offset.
+    """
+    return (tag, FieldType.Long, target)
+
+
+def encode_tiff(ifds: list, byte_order: ByteOrder=ByteOrder.LITTLE_ENDIAN) -> bytes:
+    """
+    TIFF header and IFDs one after another, IFD0 first, there is no IFD1.
+    Pointer values given as ('ifd', index) are replaced by the offset of the IFD.
+    """
+    def resolve(entries, offsets):
+        return [ (tag, field_type, (offsets[values[1]],) if isinstance(values, tuple) and values[0] == 'ifd' else values)
+                 for tag, field_type, values in entries ]
+
+    # the IFD sizes don't depend on the pointer values
+    offsets = []
+    offset = TiffHeader.SIZE
+    for entries in ifds:
+        offsets.append(offset)
+        offset += len(synthetic.encode_ifd(resolve(entries, [0]*len(ifds)), byte_order, offset))
+
+    data = synthetic.encode_tiff_header(byte_order)
+    for entries, offset in zip(ifds, offsets):
+        data += synthetic.encode_ifd(resolve(entries, offsets), byte_order, offset)
+    return data
+
+
+def open_parser(ifds: list, byte_order: ByteOrder=ByteOrder.LITTLE_ENDIAN) -> JpegMetaParser:
+    return JpegMetaParser(BufferStream(synthetic.encode_jpeg(encode_tiff(ifds, byte_order))))
+
+
+@pytest.fixture
+def parsed_offsets(monkeypatch):
+    """
+    Offsets of all parsed IFDs, in the parsing order.
+    """
+    offsets = []
+    parse = IFD.parse.__func__
+
+    def counting_parse(cls, *args, **kwargs):
+        offsets.append(kwargs['offset'])
+        return parse(cls, *args, **kwargs)
+
+    monkeypatch.setattr(IFD, 'parse', classmethod(counting_parse))
+    return offsets
+
+
+@pytest.mark.parametrize('byte_order', [ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ])
+def test_gps(byte_order):
+    parser = open_parser([ [ MAKE, pointer(EXIF, ('ifd', 1)), pointer(GPS, ('ifd', 2)) ], EXIF_ENTRIES, GPS_ENTRIES ],
+                         byte_order)
+
+    latitude = TagPath('APP1', 'GPS', 0x0002)
+    assert parser.get_tag_value(latitude) == (Fraction(35), Fraction(40), Fraction(1234, 100))
+    assert parser.get_tag_value(TagPath('APP1', 'gps', 0x0001)) == 'N'
+    assert parser.get_tag_values([ TagPath('APP1', 'GPS', 0x0000), latitude, TagPath('APP1', 'Exif', 0x829A) ]) == \
+           ((2, 3, 0, 0), parser.get_tag_value(latitude), Fraction(1, 250))
+
+    # the GPS IFD is not the Exif IFD
+    assert parser.get_tag_value(TagPath('APP1', 'GPS', 0x829A)) is None
+    assert parser.get_tag_value(TagPath('APP1', 'Exif', 0x0002)) is None
+
+    app1 = parser['APP1']
+    assert app1.resolve_ifd('GPS').index == GPS
+    assert [ ifd.index for ifd in app1.walk_ifds() ] == [ 0, EXIF, GPS ]
+
+
+def test_missing_gps():
+    parser = open_parser([ [ MAKE, pointer(EXIF, ('ifd', 1)) ], EXIF_ENTRIES ])
+
+    assert parser['APP1'].resolve_ifd('GPS') is None
+    assert parser.get_tag_value(TagPath('APP1', 'GPS', 0x0002), default=0) == 0
+    assert parser.get_tag_value(TagPath('APP1', 'Exif', 0x829A)) == Fraction(1, 250)
+
+
+def test_shared_pointer(parsed_offsets):
+    # Exif and GPS pointers reference the same IFD
+    parser = open_parser([ [ MAKE, pointer(EXIF, ('ifd', 1)), pointer(GPS, ('ifd', 1)) ], EXIF_ENTRIES + GPS_ENTRIES ])
+    app1 = parser['APP1']
+
+    assert app1.resolve_ifd('Exif') is app1.resolve_ifd('GPS')
+    assert parser.get_tag_value(TagPath('APP1', 'GPS', 0x829A)) == Fraction(1, 250)
+    assert len(list(app1.walk_ifds())) == 2
+    assert len(parsed_offsets) == len(set(parsed_offsets)) == 2
+
+
+@pytest.mark.parametrize('ifds, interop_make', [
+    # the Exif pointer of IFD0 references IFD0
+    ([ [ MAKE, pointer(EXIF, ('ifd', 0)) ] ], None),
+    # IFD0 -> Exif IFD -> (Interop pointer) IFD0
+    ([ [ MAKE, pointer(EXIF, ('ifd', 1)) ], EXIF_ENTRIES + [ pointer(INTEROP, ('ifd', 0)) ] ], 'Synthetic'),
+    # the Interop pointer of the Exif IFD references the Exif IFD, GPS -> Exif IFD
+    ([ [ MAKE, pointer(EXIF, ('ifd', 1)), pointer(GPS, ('ifd', 1)) ], EXIF_ENTRIES + [ pointer(INTEROP, ('ifd', 1)) ] ],
+     None),
+], ids=[ 'self', 'cycle', 'shared_self' ])
+def test_looped_pointers(ifds, interop_make, parsed_offsets):
+    parser = open_parser(ifds)
+    app1 = parser['APP1']
+
+    walked = list(app1.walk_ifds())
+    assert len(walked) == len(ifds)
+    assert len({ ifd.offset for ifd in walked }) == len(ifds)
+
+    for name in ('Exif', 'GPS', 'Interop'):
+        app1.resolve_ifd(name)
+    assert parser.get_tag_value(TagPath('APP1', 'Interop', 0x010F)) == interop_make
+
+    # each IFD is parsed once
+    assert len(parsed_offsets) == len(set(parsed_offsets)) == len(ifds)
+
+
+@pytest.mark.parametrize('target', [ None, 0x10000, 0xFFFFFFF0, 0, TiffHeader.SIZE - 1 ],
+                         ids=[ 'segment_end', 'beyond_file', 'huge', 'zero', 'inside_header' ])
+def test_invalid_pointer(target, parsed_offsets):
+    if target is None:
+        # the image data follows the segment: it must not be parsed as an IFD
+        target = len(encode_tiff([ [ MAKE, pointer(GPS, (0,)) ] ]))
+
+    parser = open_parser([ [ MAKE, pointer(GPS, (target,)) ] ])
+    app1 = parser['APP1']
+
+    assert app1.resolve_ifd('GPS') is None
+    assert parser.get_tag_value(TagPath('APP1', 'GPS', 0x0002)) is None
+    assert parser.get_tag_value(TagPath('APP1', 'GPS', 0x0002), default='-') == '-'
+    assert [ ifd.index for ifd in app1.walk_ifds() ] == [ 0 ]
+    assert len(parsed_offsets) == 1
+
+
+def test_invalid_pointer_type():
+    parser = open_parser([ [ MAKE, (GPS, FieldType.Short, (TiffHeader.SIZE,)) ] ])
+
+    assert parser['APP1'].resolve_ifd('GPS') is None
+    assert parser.get_tag_value(TagPath('APP1', 'GPS', 0x0002)) is None
+
+
+def test_unknown_sub_ifd():
+    parser = open_parser([ [ MAKE ] ])
+
+    with pytest.raises(ValueError, match='unknown sub-IFD'):
+        parser['APP1'].resolve_ifd('MakerNote')
+    assert parser.get_tag_value(TagPath('APP1', 'MakerNote', 0x0001), default=0) == 0
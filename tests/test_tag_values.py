@@ -0,0 +1,191 @@
+from fractions import Fraction
+
+import pytest
+
+from jparse import instrument
+from jparse import parser as parser_module
+from jparse.BufferStream import BufferStream
+from jparse.IfdField import VALUE_READ_GAP, load_values
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.TagPath import TagPath
+from jparse.ValueCache import ValueCache
+from jparse.endianess import ByteOrder
+from jparse.FieldType import FieldType
+
+from benchmarks import synthetic
+
+
+TAGS = [
+    TagPath('APP1', 0, 0x010F),       # make
+    TagPath('APP1', 0, 0x011A),       # x_resolution
+    TagPath('APP1', 'Exif', 0x829A),  # exposure_time
+    TagPath('APP1', 'Exif', 0x9204),
+    TagPath('APP1', 'Exif', 0x927C),  # MakerNote
+    TagPath('APP1', 0, 0xC003),       # numeric entries of IFD0
+    TagPath('APP1', 0, 0xC00F),
+    TagPath('APP1', 1, 0x0103),       # IFD1
+    TagPath('APP3', 0, 0x0105),       # generic Exif-like segment
+    TagPath('APP3', 1, 0x010A),
+    TagPath('app1', 0, 0x010F),       # the segment name is case-insensitive, the tag is repeated
+    # missing: tag, IFD, sub-IFD, unknown sub-IFD name, segment
+    TagPath('APP1', 0, 0x9999),
+    TagPath('APP1', 5, 0x010F),
+    TagPath('APP1', 'GPS', 0x0002),
+    TagPath('APP1', 'MakerNote', 0x0001),
+    TagPath('APP7', 0, 0x010F),
+]
+MISSING = TAGS.index(TagPath('APP1', 0, 0x9999))
+
+
+@pytest.fixture(params=[ ByteOrder.LITTLE_ENDIAN, ByteOrder.BIG_ENDIAN ], ids=[ 'le', 'be' ])
+def jpeg_path(request, tmp_path):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(synthetic.generate_jpeg(synthetic.JpegSpec(byte_order=request.param, field_count=16,
+                                                                scan_size=256)))
+    return str(path)
+
+
+@pytest.mark.parametrize('options', [ {}, { 'columnar': True }, { 'buffered': True }, { 'rational_mode': 'tuple' } ],
+                         ids=[ 'default', 'columnar', 'buffered', 'tuple' ])
+@pytest.mark.parametrize('default', [ None, '-' ])
+def test_equal_to_get_tag_value(jpeg_path, options, default):
+    with JpegMetaParser.from_path(jpeg_path, mmap=False, **options) as parser:
+        expected = tuple(parser.get_tag_value(tag_path, default=default) for tag_path in TAGS)
+
+    # a fresh parser: nothing is loaded yet
+    with JpegMetaParser.from_path(jpeg_path, mmap=False, **options) as parser:
+        values = parser.get_tag_values(TAGS, default=default)
+
+    assert values == expected
+    assert values[MISSING:] == (default,)*(len(TAGS) - MISSING)
+    assert all(value is not default for value in values[:MISSING])
+    assert values[0] == values[TAGS.index(TagPath('app1', 0, 0x010F))] == 'Synthetic'
+
+
+def test_value_cache(jpeg_path):
+    value_cache = ValueCache()
+    with JpegMetaParser.from_path(jpeg_path, value_cache=value_cache) as parser:
+        expected = tuple(parser.get_tag_value(tag_path, default='-') for tag_path in TAGS)
+
+    # values and missing tags are served from the cache
+    with JpegMetaParser.from_path(jpeg_path, value_cache=value_cache) as parser:
+        hits = value_cache.hits
+        assert parser.get_tag_values(TAGS, default='-') == expected
+        assert value_cache.hits - hits == len(TAGS) - 1  # the unknown segment isn't looked up
+
+    # and the other way around
+    value_cache = ValueCache()
+    with JpegMetaParser.from_path(jpeg_path, value_cache=value_cache) as parser:
+        assert parser.get_tag_values(TAGS, default='-') == expected
+    with JpegMetaParser.from_path(jpeg_path, value_cache=value_cache) as parser:
+        assert tuple(parser.get_tag_value(tag_path, default='-') for tag_path in TAGS) == expected
+
+
+def test_empty(jpeg_path):
+    with JpegMetaParser.from_path(jpeg_path) as parser:
+        assert parser.get_tag_values([]) == ()
+        assert parser.get_tag_values(iter(TAGS[:2])) == parser.get_tag_values(TAGS[:2])
+
+
+def test_fewer_reads(jpeg_path):
+    def read_calls(function) -> int:
+        with JpegMetaParser.from_path(jpeg_path, mmap=False) as parser:
+            with instrument.collect() as stats:
+                function(parser)
+        return stats.to_dict()['read_calls']
+
+    single = read_calls(lambda parser: [ parser.get_tag_value(tag_path) for tag_path in TAGS ])
+    batch = read_calls(lambda parser: parser.get_tag_values(TAGS))
+    assert batch < single
+
+
+# merged reads of IfdField.load_values()
+
+def ifd0_fields(entries):
+    tiff = synthetic.encode_tiff([ entries ], ByteOrder.LITTLE_ENDIAN)
+    parser = JpegMetaParser(BufferStream(synthetic.encode_jpeg(tiff)))
+    ifd = parser['APP1'].ifd(0)
+    ifd.load_all()
+    return { field.tag_id: field for field in ifd }
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """
+    (offset, size) of the value reads, recorded once the IFD headers are loaded.
+    """
+    reads = []
+    read_at = parser_module.read_at
+
+    def recording_read_at(stream, offset, count):
+        reads.append((offset, count))
+        return read_at(stream, offset, count)
+
+    def start():
+        monkeypatch.setattr(parser_module, 'read_at', recording_read_at)
+        return reads
+
+    return start
+
+
+def gap_entries(gap: int) -> list:
+    # values are laid out in the tag order: the Undefined value is a gap between two rationals
+    return [
+        (0x0100, FieldType.Rational, ((1, 2),)),
+        (0x0101, FieldType.Rational, ((3, 4),)),
+        (0x0102, FieldType.Undefined, bytes(gap)),
+        (0x0103, FieldType.Rational, ((5, 6),)),
+        (0x0104, FieldType.ASCII, 'Synthetic camera'),
+        (0x0105, FieldType.Short, (7,)),  # inside the field header
+    ]
+
+
+@pytest.mark.parametrize('gap, max_gap, read_count', [
+    (VALUE_READ_GAP, VALUE_READ_GAP, 1),
+    (VALUE_READ_GAP + 4, VALUE_READ_GAP, 2),
+    (1024, VALUE_READ_GAP, 2),
+    (1024, 1024, 1),
+    (8, 0, 2),
+])
+def test_load_values_merges_reads(reads, gap, max_gap, read_count):
+    fields = ifd0_fields(gap_entries(gap))
+    wanted = [ fields[tag] for tag in (0x0104, 0x0100, 0x0103, 0x0101, 0x0105) ]
+
+    recorded = reads()
+    load_values(wanted, max_gap=max_gap)
+
+    assert len(recorded) == read_count
+    assert [ field.value for field in wanted ] == [ 'Synthetic camera', Fraction(1, 2), Fraction(5, 6), Fraction(3, 4), 7 ]
+
+    # the merged reads cover the values and don't read the gap if it's too large
+    first, last = fields[0x0100], fields[0x0104]
+    assert recorded[0][0] == first.value_offset
+    assert recorded[-1][0] + recorded[-1][1] == last.value_offset + last.value_size
+    if read_count > 1:
+        assert sum(size for _, size in recorded) < last.value_offset + last.value_size - first.value_offset
+
+
+def test_load_values_equal_to_load(reads):
+    entries = gap_entries(64) + synthetic.numeric_entries(24, first_tag=0x0200)
+    expected = { tag: field.value for tag, field in ifd0_fields(entries).items() }
+
+    fields = ifd0_fields(entries)
+    recorded = reads()
+    load_values(fields.values())
+
+    assert { tag: field.value for tag, field in fields.items() } == expected
+    assert len(recorded) == 1
+
+    # loaded fields aren't read again
+    load_values(fields.values())
+    assert len(recorded) == 1
+
+
+def test_load_values_inline_values(reads):
+    fields = ifd0_fields([ (0x0100, FieldType.Short, (1,)), (0x0101, FieldType.Long, (2,)), (0x0102, FieldType.ASCII, 'ab') ])
+
+    recorded = reads()
+    load_values(fields.values())
+
+    assert recorded == []
+    assert [ field.value for field in fields.values() ] == [ 1, 2, 'ab' ]
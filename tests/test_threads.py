@@ -0,0 +1,57 @@
+import random
+import sys
+
+import pytest
+
+from jparse.JpegMetaParser import JpegMetaParser
+
+from benchmarks import synthetic
+from benchmarks.threads import MODES, hammer, walk
+
+
+THREADS = 16
+ROUNDS = 5
+
+
+@pytest.fixture
+def jpeg_path(tmp_path):
+    spec = synthetic.JpegSpec(app_count=2, field_count=100, scan_size=1024)
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(synthetic.generate_jpeg(spec))
+    return str(path)
+
+
+@pytest.fixture
+def switch_interval():
+    # frequent thread switches to provoke races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize('mode', sorted(MODES))
+def test_shared_parser(jpeg_path, switch_interval, mode):
+    with JpegMetaParser.from_path(jpeg_path, mmap=False) as parser:
+        expected = walk(parser, random.Random(0))
+
+    for round_index in range(ROUNDS):
+        results = hammer(lambda: JpegMetaParser.from_path(jpeg_path, **MODES[mode]),
+                         threads=THREADS, seed=round_index*THREADS)
+
+        assert len(results) == THREADS
+        for result in results:
+            assert result == expected
+
+
+def test_thread_safe_parser_of_file_object(jpeg_path, switch_interval):
+    with JpegMetaParser.from_path(jpeg_path, mmap=False) as parser:
+        expected = walk(parser, random.Random(0))
+
+    for round_index in range(ROUNDS):
+        # streams passed to the constructor are not closed by the parser
+        with open(jpeg_path, 'rb') as f:
+            results = hammer(lambda: JpegMetaParser(f, thread_safe=True), threads=THREADS, seed=round_index*THREADS)
+
+        for result in results:
+            assert result == expected
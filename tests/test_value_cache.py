@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from jparse.JpegMetaParser import JpegMetaParser
+from jparse.ValueCache import ValueCache
+
+from benchmarks import synthetic
+
+
+@pytest.fixture
+def jpeg_paths(tmp_path):
+    spec = synthetic.JpegSpec(field_count=10, scan_size=256)
+    paths = []
+    for i, data in enumerate(synthetic.generate_corpus(2, spec)):
+        paths.append(str(tmp_path / f'{i}.jpg'))
+        with open(paths[-1], 'wb') as f:
+            f.write(data)
+    return paths
+
+
+def fill(value_cache: ValueCache, path: str) -> int:
+    """
+    Number of values the file adds to the cache.
+    """
+    size = len(value_cache)
+    with JpegMetaParser.from_path(path, value_cache=value_cache) as parser:
+        parser.exif_info.to_dict()
+    return len(value_cache) - size
+
+
+@pytest.mark.parametrize('remove', [ os.remove, lambda path: os.rename(path, path + '.old') ])
+def test_invalidate_missing_file(jpeg_paths, remove):
+    value_cache = ValueCache()
+    first = fill(value_cache, jpeg_paths[0])
+    second = fill(value_cache, jpeg_paths[1])
+    assert first > 0 and second > 0
+
+    remove(jpeg_paths[0])
+    value_cache.invalidate(jpeg_paths[0])
+
+    assert len(value_cache) == second
+    assert fill(value_cache, jpeg_paths[1]) == 0
+
+
+def test_invalidate_stream_and_relative_path(jpeg_paths, monkeypatch):
+    value_cache = ValueCache()
+    with open(jpeg_paths[0], 'rb') as f:
+        JpegMetaParser(f, value_cache=value_cache).exif_info.to_dict()
+    assert len(value_cache) > 0
+
+    monkeypatch.chdir(os.path.dirname(jpeg_paths[0]))
+    os.remove(jpeg_paths[0])
+    value_cache.invalidate(os.path.basename(jpeg_paths[0]))
+
+    assert len(value_cache) == 0
+
+
+def test_invalidate_unknown_path(jpeg_paths, tmp_path):
+    value_cache = ValueCache()
+    size = fill(value_cache, jpeg_paths[0])
+
+    value_cache.invalidate(str(tmp_path / 'missing.jpg'))
+    assert len(value_cache) == size
+
+    # a file which was not bound by the path is found by stat()
+    os.link(jpeg_paths[0], str(tmp_path / 'link.jpg'))
+    value_cache.invalidate(str(tmp_path / 'link.jpg'))
+    assert len(value_cache) == 0